@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """量子時空統一理論快速入門腳本"""
 
-import numpy as np
-import matplotlib.pyplot as plt
-
 def main():
     """主函數"""
+    # 繪圖依賴只在真正需要時導入，保持腳本啟動迅速
+    import numpy as np
+    import matplotlib.pyplot as plt
+
     print("=" * 60)
     print("量子時空統一理論 (QST) v4.5 - 快速開始")
     print("=" * 60)
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""等價於 `qst galaxy` 的腳本入口"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["galaxy", *sys.argv[1:]]))
@@ -0,0 +1,37 @@
+"""
+量子时空统一理论 (QST) - 包入口
+
+导入本包不会加载NumPy/SciPy/Matplotlib；下列名称在首次访问时才导入对应模块。
+"""
+
+import importlib
+
+# 名称 -> (模块, 属性)
+_LAZY_ATTRS = {
+    'QSTCalculator': ('.core.qst_calculator', 'QSTCalculator'),
+    'QSTCalculator_v41': ('.core.qst_calculator_v41', 'QSTCalculator_v41'),
+    'QSTCalculator_v45': ('.core.qst_calculator', 'QSTCalculator'),
+    'get_calculator': ('.core.registry', 'get_calculator'),
+    'PhysicalConstants': ('.core.physics_constants', 'PhysicalConstants'),
+    'QSTConstants': ('.core.physics_constants', 'QSTConstants'),
+}
+
+_LAZY_SUBMODULES = ('core', 'analysis', 'simulation', 'utils')
+
+__all__ = sorted(_LAZY_ATTRS) + list(_LAZY_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module_name, __name__), attr)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
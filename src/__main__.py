@@ -0,0 +1,7 @@
+"""python -m src 等价于 qst 命令"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
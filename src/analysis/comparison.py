@@ -0,0 +1,168 @@
+"""
+量子时空统一理论 - 多版本模型对比
+
+在同一组输入上一次性计算多个模型版本 (v4.1、v4.5、兼容 a_eff 曲线)，
+输入只读取、换算一次，各版本共享 σ、x = M/M_th 的分段查找与 a_eff/a₀ 曲线，
+输出为 (版本数 × 输入数) 数组。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core import kernels
+from ..core.physics_constants import get_constants
+from ..core.qst_calculator_v41 import QSTCalculator_v41, QSTConstants_v41
+from ..core.registry import get_calculator
+
+
+# 可对比的量
+QUANTITIES = ('beta_eff', 'a_ratio', 'v_rot')
+
+DEFAULT_VERSIONS = ('v4.1', 'v4.5', 'v4.5-compat')
+
+# v4.1 在 x < 1e-6 时 β_eff = 0
+V41_ZERO_BELOW = 1e-6
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """
+    一个模型版本的向量化描述
+
+    a0_curve 为 ('sparc', A_low, σ_crit, σ_transition, α) 或 ('compatible',)
+    """
+    name: str
+    beta0: float
+    M_th: float
+    a0_curve: Tuple
+    a0_standard: float = 1.2e-10
+    zero_below: float = 0.0
+    mars_delay: float = 0.0
+
+
+def model_from_calculator(calc, name: Optional[str] = None) -> ModelVersion:
+    """
+    由计算器实例构建模型版本 (QSTCalculator 的 local/sparc_optimized 参数集或 QSTCalculator_v41)
+
+    v4.1 没有σ依赖的 a_eff 拟合，使用兼容曲线。
+    """
+    params = calc.params
+    if 'beta0' not in params:
+        raise ValueError(f"参数集 {calc.param_set} 不含第五力参数，无法对比")
+    if isinstance(calc, QSTCalculator_v41):
+        return ModelVersion(name or 'v4.1', params['beta0'], params['M_th'], ('compatible',),
+                            a0_standard=QSTConstants_v41.A0_STANDARD,
+                            zero_below=V41_ZERO_BELOW, mars_delay=calc.mars_time_delay())
+    if calc.param_set == 'sparc_optimized':
+        curve = ('sparc', params['A_low'], params['sigma_crit'], params['sigma_transition'],
+                 params.get('alpha', 1.0))
+    else:
+        curve = ('compatible',)
+    return ModelVersion(name or f'v4.5-{calc.param_set}', params['beta0'], params['M_th'],
+                        curve, a0_standard=params.get('a0_standard', 1.2e-10),
+                        mars_delay=calc.mars_time_delay())
+
+
+# 版本名 -> 计算器构造
+MODEL_VERSIONS = {
+    'v4.1': lambda: get_calculator('v4.1', 'local'),
+    'v4.5': lambda: get_calculator('v4.5', 'sparc_optimized'),
+    'v4.5-compat': lambda: get_calculator('v4.5', 'local'),
+}
+
+
+def get_model(version: Union[str, ModelVersion]) -> ModelVersion:
+    """按名称取模型版本；已是 ModelVersion 时原样返回"""
+    if isinstance(version, ModelVersion):
+        return version
+    if version not in MODEL_VERSIONS:
+        raise ValueError(f"未知模型版本: {version} (可选: {', '.join(MODEL_VERSIONS)})")
+    return model_from_calculator(MODEL_VERSIONS[version](), version)
+
+
+def _a0_ratio(curve: Tuple, sigma, dtype):
+    if curve[0] == 'sparc':
+        return kernels.a0_ratio_sparc(sigma, *curve[1:], dtype=dtype)
+    return kernels.a0_ratio_compatible(sigma, dtype=dtype)
+
+
+def compare_models(M_baryon, R_disk=None, sigma=None,
+                   versions: Sequence[Union[str, ModelVersion]] = DEFAULT_VERSIONS,
+                   quantities: Sequence[str] = QUANTITIES, dtype=None, constants=None) -> Dict:
+    """
+    在同一组星系上计算多个模型版本
+
+    参数:
+        M_baryon: 重子质量数组 [M_sun]
+        R_disk: 盘半径数组 [kpc]；给出sigma时可省略
+        sigma: 表面密度数组 [10⁹ M_sun/kpc²]，为None时由M/(πR²)计算
+        versions: 版本名 (见 MODEL_VERSIONS) 或 ModelVersion
+        quantities: QUANTITIES 的子集
+        dtype: 计算精度 'float64' (默认) 或 'float32'
+        constants: 常数集名或 PhysicalConstants，缺省为默认常数集
+
+    返回:
+        {'versions': 版本名列表, 'sigma': (n,), 'mars_delay': (V,),
+         以及各量的 (V, n) 数组}
+    """
+    unknown = [q for q in quantities if q not in QUANTITIES]
+    if unknown:
+        raise ValueError(f"未知对比量: {unknown} (可选: {', '.join(QUANTITIES)})")
+    models = [get_model(v) for v in versions]
+    dtype = kernels.resolve_dtype(dtype)
+    constants = get_constants(constants)
+
+    # 输入只换算一次
+    M_baryon = np.asarray(M_baryon, dtype=dtype)
+    if sigma is None:
+        if R_disk is None:
+            raise ValueError("需要 R_disk 或 sigma")
+        sigma = kernels.surface_density(M_baryon, R_disk, constants.SURFACE_DENSITY_SCALE,
+                                        dtype=dtype)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=dtype), M_baryon.shape)
+
+    need_beta = 'beta_eff' in quantities or 'v_rot' in quantities
+    need_ratio = 'a_ratio' in quantities or 'v_rot' in quantities
+    shape = (len(models),) + M_baryon.shape
+    out = {q: np.empty(shape, dtype=dtype) for q in quantities}
+    if 'v_rot' in quantities:
+        beta_rows = out.get('beta_eff', np.empty(shape, dtype=dtype))
+        ratio_rows = out.get('a_ratio', np.empty(shape, dtype=dtype))
+    else:
+        beta_rows, ratio_rows = out.get('beta_eff'), out.get('a_ratio')
+
+    # 相同 (M_th, zero_below) 或相同 a_eff 曲线的版本共享计算结果
+    scale_cache: Dict = {}
+    ratio_cache: Dict = {}
+    for i, model in enumerate(models):
+        if need_beta:
+            key = (model.M_th, model.zero_below)
+            if key not in scale_cache:
+                x = M_baryon * dtype(constants.M_SUN / model.M_th)
+                scale_cache[key] = kernels.beta_scale_factor(x, model.zero_below, dtype)
+            np.multiply(scale_cache[key], dtype(model.beta0), out=beta_rows[i])
+        if need_ratio:
+            if model.a0_curve not in ratio_cache:
+                ratio_cache[model.a0_curve] = _a0_ratio(model.a0_curve, sigma, dtype)
+            ratio_rows[i] = ratio_cache[model.a0_curve]
+        if 'v_rot' in quantities:
+            out['v_rot'][i] = kernels.rotation_velocity(
+                M_baryon, ratio_rows[i], beta_rows[i], model.a0_standard,
+                constants.V4_COEFF, dtype=dtype)
+
+    out['versions'] = [m.name for m in models]
+    out['sigma'] = sigma
+    out['mars_delay'] = np.array([m.mars_delay for m in models])
+    return out
+
+
+def to_columns(result: Dict) -> Dict[str, np.ndarray]:
+    """把对比结果展开为表格列 '量:版本'，便于 write_table 写出"""
+    columns = {'sigma': result['sigma']}
+    for quantity in QUANTITIES:
+        if quantity in result:
+            for name, row in zip(result['versions'], result[quantity]):
+                columns[f"{quantity}:{name}"] = row
+    return columns
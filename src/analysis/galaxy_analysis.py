@@ -0,0 +1,129 @@
+"""
+量子时空统一理论 - 星系样本批量分析
+
+通过 QSTCalculator 的批量接口一次计算整个星系表，并与观测速度比较。
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..core.qst_calculator import QSTCalculator
+
+
+# SPARC结果文档中的表面密度分类边界 [10⁹ M_sun/kpc²]
+SIGMA_DWARF = 0.1
+SIGMA_NORMAL = 10.0
+
+
+def classify_sigma(sigma) -> np.ndarray:
+    """按表面密度分类: 0=矮星系 (σ<0.1), 1=过渡 (0.1≤σ<10), 2=正常 (σ≥10)"""
+    return np.searchsorted([SIGMA_DWARF, SIGMA_NORMAL], np.asarray(sigma), side='right')
+
+
+def analyze_galaxies(calc: QSTCalculator, M_baryon, R_disk, sigma=None,
+                     v_obs=None, v_err=None) -> Dict[str, np.ndarray]:
+    """
+    批量计算星系旋转速度，可选地与观测比较
+
+    参数:
+        calc: sparc_optimized 或 local 参数集的计算器
+        M_baryon: 重子质量 [M_sun]
+        R_disk: 盘半径 [kpc]
+        sigma: 表面密度 [10⁹ M_sun/kpc²]，为None时由M/(πR²)计算
+        v_obs: 观测速度 [km/s]
+        v_err: 观测误差 [km/s]
+
+    返回:
+        列字典: sigma, a_ratio, beta_eff, v_rot, category；
+        有v_obs时另含 residual (V_QST−V_obs) 与 pct_error，有v_err时含 chi2
+    """
+    result = calc.evaluate_galaxies_batch(M_baryon, R_disk, sigma)
+    result['category'] = classify_sigma(result['sigma'])
+    if v_obs is not None:
+        v_obs = np.asarray(v_obs, dtype=float)
+        result['residual'] = result['v_rot'] - v_obs
+        result['pct_error'] = 100.0 * np.abs(result['residual']) / v_obs
+        if v_err is not None:
+            result['chi2'] = (result['residual'] / np.asarray(v_err, dtype=float))**2
+    return result
+
+
+def summarize(result: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """汇总 analyze_galaxies 的结果 (整体及按类别)"""
+    summary = {'n_galaxies': int(result['v_rot'].size)}
+    if 'residual' not in result:
+        summary['mean_v_rot'] = float(np.mean(result['v_rot']))
+        return summary
+
+    names = ('dwarf', 'transition', 'normal')
+    summary['mean_abs_residual'] = float(np.mean(np.abs(result['residual'])))
+    summary['mean_pct_error'] = float(np.mean(result['pct_error']))
+    summary['median_pct_error'] = float(np.median(result['pct_error']))
+    if 'chi2' in result:
+        summary['median_chi2'] = float(np.median(result['chi2']))
+    for code, name in enumerate(names):
+        mask = result['category'] == code
+        summary[f'n_{name}'] = int(mask.sum())
+        if mask.any():
+            summary[f'mean_abs_residual_{name}'] = float(np.mean(np.abs(result['residual'][mask])))
+    return summary
+
+
+def chi2_with_gradient(calc: QSTCalculator, M_baryon, R_disk, v_obs, v_err,
+                       names, sigma=None):
+    """
+    χ² = Σ((V_QST−V_obs)/v_err)² 及其对所选参数的解析梯度
+
+    参数:
+        calc: 当前参数下的计算器
+        names: 求梯度的参数名
+
+    返回:
+        (χ², {参数名: ∂χ²/∂θ})
+    """
+    v, gradient = calc.galaxy_rotation_velocity_gradient(M_baryon, R_disk, sigma)
+    weight = 1.0 / np.asarray(v_err, dtype=float)**2
+    residual = v - np.asarray(v_obs, dtype=float)
+    chi2 = float(np.sum(weight * residual**2))
+    return chi2, {name: float(2.0 * np.sum(weight * residual * gradient[name])) for name in names}
+
+
+def fit_parameters(M_baryon, R_disk, v_obs, v_err, names=('beta0', 'A_low', 'sigma_crit',
+                                                          'sigma_transition'),
+                   param_set: str = 'sparc_optimized', sigma=None, bounds=None,
+                   initial: Optional[Dict] = None, **options) -> Dict:
+    """
+    用 L-BFGS-B 与解析梯度拟合参数
+
+    参数:
+        names: 拟合的参数名，其余参数保持参数集默认值
+        bounds: {参数名: (下限, 上限)}，缺省时要求参数为正
+        initial: 初始值覆盖
+        options: 传给 scipy.optimize.minimize 的 options
+
+    返回:
+        {'params': 拟合值, 'chi2', 'n_evaluations', 'success', 'message'}
+    """
+    from scipy.optimize import minimize
+
+    base = QSTCalculator(param_set, overrides=initial).params
+    x0 = np.array([base[name] for name in names], dtype=float)
+    # 按初值缩放，使各参数量级相近
+    scale = np.where(x0 != 0.0, np.abs(x0), 1.0)
+    bounds = bounds or {}
+    scaled_bounds = [tuple(None if b is None else b / s
+                           for b in bounds.get(name, (1e-12 * s, None)))
+                     for name, s in zip(names, scale)]
+
+    def objective(z):
+        calc = QSTCalculator(param_set, overrides=dict(zip(names, z * scale)))
+        chi2, gradient = chi2_with_gradient(calc, M_baryon, R_disk, v_obs, v_err, names, sigma)
+        return chi2, np.array([gradient[name] for name in names]) * scale
+
+    result = minimize(objective, x0 / scale, jac=True, method='L-BFGS-B',
+                      bounds=scaled_bounds, options=options or None)
+    fitted = {name: float(value) for name, value in zip(names, result.x * scale)}
+    return {'params': fitted, 'chi2': float(result.fun),
+            'n_evaluations': int(result.nfev), 'success': bool(result.success),
+            'message': str(result.message)}
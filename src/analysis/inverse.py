@@ -0,0 +1,167 @@
+"""
+量子时空统一理论 - 由观测速度反解重子质量
+
+galaxy_rotation_velocity 的逆: 给定 v_flat [km/s] 与 R_disk [kpc]，求 M_baryon [M_sun]。
+
+V⁴ = V4_COEFF · a₀ · M · (a_eff/a₀)(σ(M)) · (1 + β₀ f(M/M_th))，σ = M/(πR²)。
+f 与 a_eff/a₀ 都随自变量单调不减且分段光滑，因此 v(M) 单调不减，但不能解析求逆。
+每个星系的断点为 f 的区间边界 (对应固定的 M) 与 a_eff/a₀ 的节点 (对应 M ∝ R²):
+
+1. 在全部断点上批量求 v，按 v_flat 找到所在区间 (每个星系一个括号)；
+2. 两端区间内 f 与 a_eff/a₀ 均为常数，v ∝ M^(1/4)，直接解出；
+3. 中间区间在 (ln M, ln v) 上用向量化的 Anderson-Björck 试位法迭代，
+   每次迭代只对未收敛的星系调用一次批量核心函数；区间内函数光滑，
+   大多数星系 1-6 次迭代收敛，远快于逐个星系的 brentq 循环。
+
+v_flat 落在间断处的跳跃之内 (如 f 由 0.5 跳到 0.7) 时方程无解，
+返回满足 v(M) ≥ v_flat 的最小质量，即该断点 (full_output 的 'exact' 为 False)。
+"""
+
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from ..core import kernels
+
+
+# f(x) 的全部区间边界 x = M/M_th (阶跃边界与线性段端点)
+BETA_SEGMENT_EDGES = np.concatenate([kernels.BETA_STEP_EDGES, [1.0, 2.0]])
+
+DEFAULT_RTOL = 1e-12
+DEFAULT_MAX_ITER = 50
+
+
+def _sigma_knots(calc) -> np.ndarray:
+    """a_eff/a₀(σ) 的断点 [10⁹ M_sun/kpc²]"""
+    if calc.param_set == 'sparc_optimized':
+        return np.array([calc.params['sigma_crit'], calc.params['sigma_transition']])
+    return kernels.COMPAT_SIGMA_KNOTS
+
+
+def _velocity(calc, M, R):
+    v, _ = calc.galaxy_rotation_velocity_batch(M, R, backend='numpy')
+    return v
+
+
+def _at_or_above(M, edge, forward):
+    """把断点质量上调若干 ulp，使核心函数由 M 算出的 x (或 σ) 不小于边界，即落入右侧区间"""
+    for _ in range(4):
+        M = np.where(forward(M) < edge, np.nextafter(M, np.inf), M)
+    return M
+
+
+def segment_breakpoints(calc, R_disk) -> np.ndarray:
+    """
+    各星系 v(M) 的断点
+
+    参数:
+        calc: local 或 sparc_optimized 参数集的计算器
+        R_disk: 盘半径 [kpc]，形状 (G,)
+
+    返回:
+        升序的断点质量 [M_sun]，形状 (G, K)
+    """
+    R_disk = np.asarray(R_disk, dtype=float)
+    # 与 kernels.beta_effective、kernels.surface_density 的运算顺序一致
+    x_scale = calc.constants.M_SUN / np.asarray(calc.params['M_th'], dtype=float)
+    M_beta = _at_or_above(BETA_SEGMENT_EDGES / x_scale, BETA_SEGMENT_EDGES,
+                          lambda M: M * x_scale)
+    R2, sigma_scale = R_disk[:, None]**2, calc.constants.SURFACE_DENSITY_SCALE
+    knots = _sigma_knots(calc)
+    M_sigma = _at_or_above(knots * R2 / sigma_scale, knots, lambda M: M / R2 * sigma_scale)
+    breakpoints = np.concatenate([np.broadcast_to(M_beta, (len(R_disk), len(M_beta))), M_sigma],
+                                 axis=1)
+    return np.sort(breakpoints, axis=1)
+
+
+def solve_baryonic_mass(calc, v_flat, R_disk, rtol: float = DEFAULT_RTOL,
+                        max_iter: int = DEFAULT_MAX_ITER,
+                        full_output: bool = False) -> Union[np.ndarray, Tuple[np.ndarray, Dict]]:
+    """
+    由 v_flat 与 R_disk 批量反解重子质量
+
+    参数:
+        calc: local 或 sparc_optimized 参数集的计算器
+        v_flat: 观测平坦速度 [km/s]
+        R_disk: 盘半径 [kpc]，与 v_flat 可广播
+        rtol: 质量的相对精度
+        max_iter: 最大迭代次数
+        full_output: 是否同时返回求解信息
+
+    返回:
+        M_baryon [M_sun] (广播后的形状)；v_flat 或 R_disk 非正或非有限时为 nan。
+        full_output 时返回 (M_baryon, {'iterations': 迭代次数,
+                                      'exact': 是否为方程的根 (否则为间断点)})
+    """
+    if calc.param_set not in ('local', 'sparc_optimized'):
+        raise ValueError("此计算需要局部参数集")
+    if not rtol > 0.0 or max_iter < 1:
+        raise ValueError("rtol 须为正数，max_iter 须为正整数")
+    v_flat, R_disk = np.broadcast_arrays(np.asarray(v_flat, dtype=float),
+                                         np.asarray(R_disk, dtype=float))
+    shape = v_flat.shape
+    v_flat, R_disk = v_flat.ravel(), R_disk.ravel()
+    M = np.full(v_flat.shape, np.nan)
+    exact = np.zeros(v_flat.shape, dtype=bool)
+    valid = np.isfinite(v_flat) & np.isfinite(R_disk) & (v_flat > 0.0) & (R_disk > 0.0)
+    idx = np.flatnonzero(valid)
+    v, R = v_flat[idx], R_disk[idx]
+    iterations = 0
+
+    breakpoints = segment_breakpoints(calc, R)
+    v_break = _velocity(calc, breakpoints, R[:, None])
+    # v(M) 单调不减: 区间号 = v(断点) ≤ v_flat 的断点个数
+    k = np.sum(v_break <= v[:, None], axis=1)
+    n_break = breakpoints.shape[1]
+
+    # 两端区间: v ∝ M^(1/4)
+    below, above = k == 0, k == n_break
+    M_ref = 0.5 * breakpoints[below, 0]
+    M[idx[below]] = M_ref * (v[below] / _velocity(calc, M_ref, R[below]))**4
+    M[idx[above]] = breakpoints[above, -1] * (v[above] / v_break[above, -1])**4
+    exact[idx[below | above]] = True
+
+    inner = np.flatnonzero(~(below | above))
+    j = k[inner]
+    lo, hi = breakpoints[inner, j - 1], breakpoints[inner, j]
+    h_lo = np.log(v_break[inner, j - 1] / v[inner])
+    # 右端取区间内的左极限
+    hi = np.maximum(lo, hi * (1.0 - 1e-12))
+    h_hi = np.log(_velocity(calc, hi, R[inner]) / v[inner])
+
+    at_lo, gap = h_lo == 0.0, h_hi < 0.0
+    M[idx[inner[at_lo]]] = lo[at_lo]
+    exact[idx[inner[at_lo]]] = True
+    M[idx[inner[gap & ~at_lo]]] = breakpoints[inner[gap & ~at_lo], j[gap & ~at_lo]]
+
+    active = ~(at_lo | gap)
+    a, b = np.log(lo[active]), np.log(hi[active])
+    fa, fb = h_lo[active], h_hi[active]
+    target, radius, out = v[inner[active]], R[inner[active]], idx[inner[active]]
+    while len(out) and iterations < max_iter:
+        iterations += 1
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = np.log(_velocity(calc, np.exp(c), radius) / target)
+        done = (np.abs(fc) <= 0.25 * rtol) | (b - a <= rtol)
+        right = fc > 0.0
+        # Anderson-Björck: 保留的一端函数值乘以 m = 1 − fc/f_替换端 (m ≤ 0 时取 ½)
+        m = 1.0 - fc / np.where(right, fb, fa)
+        m = np.where(m > 0.0, m, 0.5)
+        fa = np.where(right, m * fa, fa)
+        fb = np.where(right, fb, m * fb)
+        b, fb = np.where(right, c, b), np.where(right, fc, fb)
+        a, fa = np.where(right, a, c), np.where(right, fa, fc)
+
+        M[out[done]] = np.exp(c[done])
+        exact[out[done]] = True
+        keep = ~done
+        a, b, fa, fb = a[keep], b[keep], fa[keep], fb[keep]
+        target, radius, out = target[keep], radius[keep], out[keep]
+    if len(out):
+        # 未在 max_iter 内收敛: 取括号中点
+        M[out] = np.exp(0.5 * (a + b))
+
+    M = M.reshape(shape)
+    if full_output:
+        return M, {'iterations': iterations, 'exact': exact.reshape(shape)}
+    return M
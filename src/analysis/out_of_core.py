@@ -0,0 +1,156 @@
+"""
+量子时空统一理论 - 内存映射数组的分块计算
+
+输入为 .npy 文件 (以 mmap 打开) 或 np.memmap，输出写入内存映射的 .npy。
+数组按页对齐的块划分，由线程池并行计算 (NumPy 在逐元素运算中释放GIL)；
+同时处理的块数有上限，内存占用由块大小与线程数决定，与数组总长度无关。
+"""
+
+import mmap
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core import kernels
+
+QUANTITIES = ('sigma', 'a_ratio', 'beta_eff', 'v_rot')
+
+# 默认块长 (元素数)，float64 下为 8 MiB
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def open_array(source) -> np.ndarray:
+    """路径 (.npy) 以只读内存映射打开；数组原样返回"""
+    if isinstance(source, (str, Path)):
+        return np.load(source, mmap_mode='r')
+    return source
+
+
+def chunk_bounds(n: int, itemsize: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 offset: int = 0) -> List[Tuple[int, int]]:
+    """
+    按页对齐划分 [0, n)
+
+    参数:
+        itemsize: 元素字节数
+        chunk_size: 目标块长 (元素数)，向下取整到整页
+        offset: 数组数据在文件中的字节偏移 (np.memmap.offset)；
+                块边界落在文件的页边界上，首块包含页边界之前的零头
+
+    返回:
+        [(start, stop), ...]
+    """
+    page = mmap.PAGESIZE
+    per_page = max(1, page // itemsize)
+    step = max(per_page, chunk_size // per_page * per_page)
+    first = (-offset % page) // itemsize if offset % itemsize == 0 else 0
+    edges = [0] + list(range(first + step, n, step)) + [n]
+    return [(lo, hi) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+
+
+def _open_outputs(output, quantities: Sequence[str], shape, dtype) -> Dict[str, np.ndarray]:
+    if isinstance(output, dict):
+        for q in quantities:
+            if q not in output:
+                raise ValueError(f"输出缺少 '{q}'")
+            if output[q].shape != shape:
+                raise ValueError(f"输出 '{q}' 形状 {output[q].shape} 与输入 {shape} 不一致")
+            # reshape(-1) 对非连续数组会复制，结果写不回调用方的数组
+            if not output[q].flags.c_contiguous:
+                raise ValueError(f"输出 '{q}' 须为C连续数组")
+        return {q: output[q] for q in quantities}
+    directory = Path(output)
+    directory.mkdir(parents=True, exist_ok=True)
+    return {q: np.lib.format.open_memmap(directory / f"{q}.npy", mode='w+', dtype=dtype,
+                                         shape=shape)
+            for q in quantities}
+
+
+def evaluate_memmap(calc, M_baryon, R_disk=None, sigma=None, output=None,
+                    quantities: Optional[Sequence[str]] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None,
+                    dtype=None, backend=None) -> Dict:
+    """
+    分块计算内存映射的星系数组，结果写入内存映射输出
+
+    参数:
+        calc: sparc_optimized 或 local 参数集的计算器
+        M_baryon: 重子质量 [M_sun]，.npy 路径或数组 (通常为 np.memmap)
+        R_disk: 盘半径 [kpc]，路径、数组或标量；给出 sigma 时可省略
+        sigma: 表面密度 [10⁹ M_sun/kpc²]，路径或数组
+        output: 输出目录 (每个量写为 <量>.npy) 或 {量: 预先分配的C连续数组}
+        quantities: QUANTITIES 的子集；缺省为全部 (输入已有 sigma 时不含 sigma)
+        chunk_size: 块长 (元素数)，按页对齐
+        workers: 线程数，缺省为CPU数
+        dtype: 计算与输出精度 'float64' (默认) 或 'float32'
+        backend: 计算后端 'numpy'、'numba'、'auto' (见 core.backends)
+
+    返回:
+        {'outputs': {量: 数组}, 'n_rows', 'n_chunks', 'elapsed_s'}
+    """
+    start = time.perf_counter()
+    dtype = kernels.resolve_dtype(dtype)
+    M_baryon = open_array(M_baryon)
+    shape = M_baryon.shape
+    if sigma is not None:
+        sigma = open_array(sigma)
+        if sigma.shape != shape:
+            raise ValueError(f"sigma 形状 {sigma.shape} 与 M_baryon {shape} 不一致")
+    elif R_disk is None:
+        raise ValueError("需要 R_disk 或 sigma")
+    else:
+        R_disk = open_array(R_disk)
+        if np.ndim(R_disk) and np.shape(R_disk) != shape:
+            raise ValueError(f"R_disk 形状 {np.shape(R_disk)} 与 M_baryon {shape} 不一致")
+    if quantities is None:
+        quantities = tuple(q for q in QUANTITIES if not (q == 'sigma' and sigma is not None))
+    unknown = [q for q in quantities if q not in QUANTITIES]
+    if unknown:
+        raise ValueError(f"未知输出量: {unknown} (可选: {', '.join(QUANTITIES)})")
+    if output is None:
+        raise ValueError("需要输出目录或输出数组")
+    outputs = _open_outputs(output, quantities, shape, dtype)
+
+    # 一维视图 (输入非连续时复制；输出已保证C连续，不复制)
+    flat_M = M_baryon.reshape(-1)
+    flat_sigma = sigma.reshape(-1) if sigma is not None else None
+    flat_R = R_disk.reshape(-1) if np.ndim(R_disk) else R_disk
+    flat_out = {q: array.reshape(-1) for q, array in outputs.items()}
+
+    def run(bounds):
+        lo, hi = bounds
+        result = calc.evaluate_galaxies_batch(
+            flat_M[lo:hi], flat_R[lo:hi] if np.ndim(flat_R) else flat_R,
+            flat_sigma[lo:hi] if flat_sigma is not None else None, dtype=dtype,
+            backend=backend)
+        for q in quantities:
+            flat_out[q][lo:hi] = result[q]
+
+    bounds = chunk_bounds(flat_M.size, flat_M.itemsize, chunk_size,
+                          getattr(M_baryon, 'offset', 0) or 0)
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as pool:
+        # 同时在途的块数有上限，避免一次性提交全部块
+        pending = set()
+        try:
+            for item in bounds:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(pool.submit(run, item))
+            for future in pending:
+                future.result()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    for array in outputs.values():
+        if isinstance(array, np.memmap):
+            array.flush()
+    return {'outputs': outputs, 'n_rows': int(flat_M.size), 'n_chunks': len(bounds),
+            'elapsed_s': time.perf_counter() - start}
@@ -0,0 +1,430 @@
+"""
+量子时空统一理论 - 批量并行绘图
+
+每张图由 (模板, 数据) 描述。模板直接构建 matplotlib.figure.Figure (不经过pyplot，
+保存时使用Agg渲染)，每个进程按模板缓存 Figure 与图元，后续同类图只更新数据再保存。
+每张图的输入 (模板源码 + 数据 + 样式 + 格式) 取哈希记入输出目录的清单，
+输入未变且文件仍在的图直接跳过。
+"""
+
+import abc
+import contextlib
+import hashlib
+import inspect
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..utils.lazy import lazy_import
+
+mpl_style = lazy_import('matplotlib.style')
+
+
+MANIFEST_FILE = '.plot_manifest.json'
+# 文件名中允许的字符；其余 (含路径分隔符) 替换为下划线
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9._+-]+')
+DEFAULT_FORMATS = ('png',)
+
+# 未提供配置时的样式 (与 config/plot_config.yaml 对应)
+DEFAULT_STYLE = {'style': 'default', 'figure_size': (8.0, 6.0), 'dpi': 150,
+                 'font_family': 'DejaVu Sans', 'font_size': 12.0}
+
+
+@dataclass
+class FigureJob:
+    """一张图: 模板名、数据与输出文件名 (不含扩展名，相对输出目录)"""
+    name: str
+    template: str
+    data: Dict = field(default_factory=dict)
+
+
+# ==================== 模板 ====================
+
+def _new_figure(style: Dict):
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=style['figure_size'])
+    return fig, fig.subplots()
+
+
+def _fix_layout(fig):
+    """模板布局只计算一次；去掉布局引擎，避免每次保存前额外绘制一遍"""
+    fig.tight_layout()
+    fig.set_layout_engine('none')
+
+
+class FigureTemplate(abc.ABC):
+    """图模板: create 建立 Figure 与图元，update 只替换数据"""
+
+    @abc.abstractmethod
+    def create(self, style: Dict):
+        """返回 (Figure, 图元字典)"""
+
+    @abc.abstractmethod
+    def update(self, handles, data: Dict):
+        """把 data 写入 create 返回的图元"""
+
+
+class RotationCurveTemplate(FigureTemplate):
+    """单个星系的旋转曲线: 模型曲线，可选观测点与误差棒"""
+
+    def create(self, style):
+        from matplotlib.collections import LineCollection
+
+        fig, ax = _new_figure(style)
+        model, = ax.plot([], [], '-', lw=2, label='QST')
+        obs, = ax.plot([], [], 'o', ms=4, color='k', label='observed')
+        errors = LineCollection([], colors='k', linewidths=1)
+        ax.add_collection(errors)
+        flat = ax.axhline(np.nan, ls='--', lw=1, color='gray')
+        ax.set_xlabel('R [kpc]')
+        ax.set_ylabel('V [km/s]')
+        ax.grid(True, alpha=0.3)
+        _fix_layout(fig)
+        return fig, {'ax': ax, 'model': model, 'obs': obs, 'errors': errors, 'flat': flat}
+
+    def update(self, handles, data):
+        ax = handles['ax']
+        r, v = np.asarray(data['r']), np.asarray(data['v_model'])
+        handles['model'].set_data(r, v)
+        v_max = v.max()
+        if data.get('v_obs') is not None:
+            r_obs, v_obs = np.asarray(data['r_obs']), np.asarray(data['v_obs'])
+            v_err = np.asarray(data.get('v_err', np.zeros_like(v_obs)))
+            handles['obs'].set_data(r_obs, v_obs)
+            handles['errors'].set_segments(
+                [[(x, y - e), (x, y + e)] for x, y, e in zip(r_obs, v_obs, v_err)])
+            v_max = max(v_max, np.max(v_obs + v_err))
+        else:
+            handles['obs'].set_data([], [])
+            handles['errors'].set_segments([])
+        handles['flat'].set_ydata([data.get('v_flat', np.nan)] * 2)
+        handles['obs'].set_visible(data.get('v_obs') is not None)
+        handles['model'].set_label(data.get('label', 'QST'))
+        ax.set_xlim(0.0, r.max())
+        ax.set_ylim(0.0, 1.1 * v_max)
+        ax.set_title(data.get('title', ''))
+        ax.legend(loc='lower right')
+
+
+class CurveTemplate(FigureTemplate):
+    """通用曲线图: 若干条 (x, y) 曲线，可选对数坐标"""
+
+    MAX_SERIES = 8
+
+    def create(self, style):
+        fig, ax = _new_figure(style)
+        lines = [ax.plot([], [], lw=2)[0] for _ in range(self.MAX_SERIES)]
+        ax.grid(True, alpha=0.3, which='both')
+        _fix_layout(fig)
+        return fig, {'ax': ax, 'lines': lines}
+
+    def update(self, handles, data):
+        ax = handles['ax']
+        series = list(data['series'].items())
+        if len(series) > self.MAX_SERIES:
+            raise ValueError(f"曲线数超过 {self.MAX_SERIES}")
+        x = np.asarray(data['x'])
+        for line, item in zip(handles['lines'], series + [None] * self.MAX_SERIES):
+            line.set_visible(item is not None)
+            if item is not None:
+                line.set_data(x, np.asarray(item[1]))
+                line.set_label(item[0])
+            else:
+                line.set_data([], [])
+                line.set_label('_nolegend_')
+        # 先按新数据更新范围再切换坐标类型，否则对数坐标会检查旧数据
+        ax.relim(visible_only=True)
+        ax.set_xscale(data.get('xscale', 'linear'))
+        ax.set_yscale(data.get('yscale', 'linear'))
+        ax.autoscale_view()
+        ax.set_xlabel(data.get('xlabel', ''))
+        ax.set_ylabel(data.get('ylabel', ''))
+        ax.set_title(data.get('title', ''))
+        ax.legend(loc='best')
+
+
+class HistogramTemplate(FigureTemplate):
+    """直方图 (例如残差分布)"""
+
+    def create(self, style):
+        fig, ax = _new_figure(style)
+        stairs = ax.stairs([0.0], [0.0, 1.0], fill=True, alpha=0.7)
+        ax.grid(True, alpha=0.3)
+        _fix_layout(fig)
+        return fig, {'ax': ax, 'stairs': stairs}
+
+    def update(self, handles, data):
+        ax = handles['ax']
+        counts, edges = np.histogram(np.asarray(data['values']), bins=data.get('bins', 40))
+        handles['stairs'].set_data(counts, edges)
+        ax.set_xlim(edges[0], edges[-1])
+        ax.set_ylim(0, 1.05 * max(counts.max(), 1))
+        ax.set_xlabel(data.get('xlabel', ''))
+        ax.set_ylabel(data.get('ylabel', 'N'))
+        ax.set_title(data.get('title', ''))
+
+
+TEMPLATES = {
+    'rotation_curve': RotationCurveTemplate,
+    'curve': CurveTemplate,
+    'histogram': HistogramTemplate,
+}
+
+
+# ==================== 作业哈希 ====================
+
+def _hash_value(digest, value):
+    if isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(str(key).encode())
+            _hash_value(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'[{len(value)}'.encode())
+        for item in value:
+            _hash_value(digest, item)
+    elif isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+_TEMPLATE_SOURCES: Dict[str, str] = {}
+
+
+def job_key(job: FigureJob, style: Dict, formats: Sequence[str]) -> str:
+    """作业哈希: 模板源码 + 数据 + 样式 + 输出格式"""
+    if job.template not in TEMPLATES:
+        raise ValueError(f"未知图模板: {job.template} (可选: {', '.join(TEMPLATES)})")
+    if job.template not in _TEMPLATE_SOURCES:
+        _TEMPLATE_SOURCES[job.template] = inspect.getsource(TEMPLATES[job.template])
+    digest = hashlib.sha256(_TEMPLATE_SOURCES[job.template].encode())
+    _hash_value(digest, {'data': job.data, 'style': style, 'formats': list(formats)})
+    return digest.hexdigest()[:20]
+
+
+# ==================== 工作进程 ====================
+
+_WORKER: Dict = {}
+
+
+def _style_params(style: Dict) -> list:
+    """matplotlib 样式列表 (样式名 + 字体设置)"""
+    styles = []
+    if style['style'] != 'default':
+        if style['style'] in mpl_style.available:
+            styles.append(style['style'])
+        else:
+            warnings.warn(f"未找到matplotlib样式 {style['style']}，使用默认样式")
+    styles.append({'font.family': style['font_family'], 'font.size': style['font_size']})
+    return styles
+
+
+def _init_worker(style: Dict):
+    """工作进程初始化: 全局样式与模板缓存"""
+    mpl_style.use(_style_params(style))
+    _WORKER.clear()
+    _WORKER['style'] = style
+    _WORKER['figures'] = {}
+
+
+@contextlib.contextmanager
+def _local_worker(style: Dict):
+    """在当前进程中渲染: 样式只在上下文内生效，结束后恢复调用方的设置"""
+    previous = dict(_WORKER)
+    with mpl_style.context(_style_params(style)):
+        _WORKER.clear()
+        _WORKER['style'] = style
+        _WORKER['figures'] = {}
+        try:
+            yield
+        finally:
+            _WORKER.clear()
+            _WORKER.update(previous)
+
+
+def _render(task) -> str:
+    job, output_dir, formats = task
+    style = _WORKER['style']
+    figures = _WORKER['figures']
+    template = TEMPLATES[job.template]()
+    if job.template not in figures:
+        figures[job.template] = template.create(style)
+    fig, handles = figures[job.template]
+    template.update(handles, job.data)
+
+    base = Path(output_dir) / job.name
+    base.parent.mkdir(parents=True, exist_ok=True)
+    for fmt in formats:
+        target = base.with_name(f"{base.name}.{fmt}")
+        tmp = base.with_name(f"{base.name}.{os.getpid()}.tmp.{fmt}")
+        fig.savefig(tmp, format=fmt, dpi=style['dpi'])
+        os.replace(tmp, target)
+    return job.name
+
+
+# ==================== 入口 ====================
+
+def _load_manifest(path: Path) -> Dict[str, str]:
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def style_from_config(visualization) -> Dict:
+    """由 utils.config.VisualizationConfig 得到样式字典"""
+    return {'style': visualization.style, 'figure_size': tuple(visualization.figure_size),
+            'dpi': visualization.dpi, 'font_family': visualization.font_family,
+            'font_size': visualization.font_size}
+
+
+def render_figures(jobs: Iterable[FigureJob], output_dir, formats: Sequence[str] = DEFAULT_FORMATS,
+                   workers: Optional[int] = None, style: Optional[Dict] = None,
+                   force: bool = False) -> Dict:
+    """
+    批量渲染图像
+
+    参数:
+        jobs: FigureJob 序列
+        output_dir: 输出目录 (清单文件 .plot_manifest.json 也写在这里)
+        formats: 输出格式，例如 ('png', 'pdf')
+        workers: 进程数；None或1表示在当前进程中渲染
+        style: 样式字典，缺省为 DEFAULT_STYLE
+        force: 忽略清单，全部重绘
+
+    返回:
+        {'rendered': 张数, 'skipped': 张数, 'elapsed_s': 秒}
+    """
+    start = time.perf_counter()
+    style = {**DEFAULT_STYLE, **(style or {})}
+    formats = tuple(formats)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_FILE
+    manifest = {} if force else _load_manifest(manifest_path)
+
+    todo: List[FigureJob] = []
+    keys: Dict[str, str] = {}
+    skipped = 0
+    for job in jobs:
+        key = job_key(job, style, formats)
+        keys[job.name] = key
+        outputs_exist = all((output_dir / f"{job.name}.{fmt}").exists() for fmt in formats)
+        if manifest.get(job.name) == key and outputs_exist:
+            skipped += 1
+        else:
+            todo.append(job)
+
+    tasks = [(job, str(output_dir), formats) for job in todo]
+    if workers and workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(style,)) as pool:
+            done = list(pool.map(_render, tasks, chunksize=chunksize))
+    else:
+        with _local_worker(style):
+            done = [_render(task) for task in tasks]
+
+    manifest.update({name: keys[name] for name in done})
+    tmp = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(manifest, indent=0, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, manifest_path)
+    return {'rendered': len(done), 'skipped': skipped,
+            'elapsed_s': time.perf_counter() - start}
+
+
+# ==================== 作业构建 ====================
+
+def exponential_disk_fraction(r, R_disk):
+    """指数盘 (标度长度 R_disk) 半径 r 内的质量分数 1 − (1 + r/R)e^(−r/R)"""
+    x = np.asarray(r, dtype=float) / R_disk
+    return 1.0 - (1.0 + x) * np.exp(-x)
+
+
+def _safe_name(name, index: int, used: set) -> str:
+    """把星系名转为输出目录内唯一的文件名 (不含目录层级，不以点开头)"""
+    base = _UNSAFE_NAME.sub('_', str(name)).lstrip('.') or f"{index:06d}"
+    safe = base
+    while safe.lower() in used:
+        safe = f"{base}_{index}" if safe == base else f"{safe}_{index}"
+    used.add(safe.lower())
+    return safe
+
+
+def galaxy_jobs(calc, M_baryon, R_disk, sigma=None, names=None, v_obs=None, v_err=None,
+                n_radii: int = 60, prefix: str = 'galaxy') -> List[FigureJob]:
+    """
+    每个星系一张旋转曲线图
+
+    V_QST(r) 取 V_flat·f(<r)^(1/4)，f 为把 R_disk 视为标度长度的指数盘包含质量分数；
+    a_eff/a₀ 与 β_eff 由整个星系的 M、σ 决定。
+
+    参数:
+        calc: sparc_optimized 或 local 参数集的计算器
+        names: 各星系的文件名；缺省为序号。非法字符与路径分隔符替换为下划线，
+            重名时追加行号
+        v_obs / v_err: 观测的平坦速度 [km/s]，画在 r = 3 R_disk 处
+    """
+    M_baryon = np.asarray(M_baryon, dtype=float)
+    R_disk = np.broadcast_to(np.asarray(R_disk, dtype=float), M_baryon.shape)
+    v_flat = calc.evaluate_galaxies_batch(M_baryon, R_disk, sigma)['v_rot']
+    jobs = []
+    used = set()
+    for i in range(M_baryon.size):
+        r = np.linspace(0.0, 6.0 * R_disk[i], n_radii)
+        data = {'r': r, 'v_model': v_flat[i] * exponential_disk_fraction(r, R_disk[i])**0.25,
+                'v_flat': float(v_flat[i]),
+                'title': f"M = {M_baryon[i]:.3g} Msun, R = {R_disk[i]:.3g} kpc"}
+        if v_obs is not None:
+            data.update(r_obs=[3.0 * R_disk[i]], v_obs=[float(v_obs[i])],
+                        v_err=[float(v_err[i]) if v_err is not None else 0.0])
+        name = _safe_name(names[i], i, used) if names is not None else f"{i:06d}"
+        jobs.append(FigureJob(f"{prefix}/{name}", 'rotation_curve', data))
+    return jobs
+
+
+def diagnostic_jobs(calc, result: Optional[Dict] = None) -> List[FigureJob]:
+    """β_eff(M)、a_eff/a₀(σ) 曲线，以及有观测时的残差分布"""
+    x = np.logspace(-4, 1, 400)
+    M = x * calc.params['M_th']
+    sigma = np.logspace(-3, 2, 400)
+    jobs = [
+        FigureJob('diagnostics/beta_eff', 'curve', {
+            'x': x, 'series': {calc.param_set: calc.beta_effective_batch(M)},
+            'xscale': 'log', 'xlabel': r'$M/M_{th}$', 'ylabel': r'$\beta_{eff}$'}),
+        FigureJob('diagnostics/a_ratio', 'curve', {
+            'x': sigma, 'series': {calc.param_set: calc.effective_a0_ratio_batch(sigma)},
+            'xscale': 'log', 'yscale': 'log',
+            'xlabel': r'$\sigma$ [$10^9 M_\odot$/kpc$^2$]', 'ylabel': r'$a_{eff}/a_0$'}),
+    ]
+    if result is not None and 'pct_error' in result:
+        jobs.append(FigureJob('diagnostics/residuals', 'histogram', {
+            'values': result['residual'], 'xlabel': r'$V_{QST} - V_{obs}$ [km/s]'}))
+    return jobs
+
+
+def cosmic_jobs(results: Dict[str, np.ndarray], prefix: str = 'cosmic') -> List[FigureJob]:
+    """宇宙背景演化: 密度参数、w_DE 与 H 随 z 的变化"""
+    late = results['z'] <= 10.0
+    z = results['z'][late]
+    return [
+        FigureJob(f'{prefix}/density_parameters', 'curve', {
+            'x': 1.0 + z, 'xscale': 'log', 'xlabel': '1 + z', 'ylabel': r'$\Omega$',
+            'series': {name: results[name][late] for name in ('Omega_DE', 'Omega_m', 'Omega_r')}}),
+        FigureJob(f'{prefix}/w_DE', 'curve', {
+            'x': 1.0 + z, 'xscale': 'log', 'xlabel': '1 + z', 'ylabel': r'$w_{DE}$',
+            'series': {'w_DE': results['w_DE'][late]}}),
+        FigureJob(f'{prefix}/hubble', 'curve', {
+            'x': 1.0 + z, 'xscale': 'log', 'yscale': 'log', 'xlabel': '1 + z',
+            'ylabel': r'$H/H_0$', 'series': {'H': results['H'][late]}}),
+    ]
@@ -0,0 +1,312 @@
+"""
+量子时空统一理论 - 预言汇总报告
+
+所有数值均由计算器现场计算，不再手工维护 (取代手工维护的 v4.5.1/v4.1 对照表)。
+每个章节的输出以 "输入参数 + 章节函数及其调用的辅助函数源码 + 依赖模块源码" 的哈希为键缓存，
+依赖模块由声明的入口模块按包内 import 语句递归展开，修改某个参数或公式后重新生成时
+只重建受影响的章节。
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import textwrap
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.registry import get_calculator
+
+
+DEFAULT_CACHE_DIR = Path('.cache') / 'report'
+
+# β_eff 表格使用的质量比 x = M/M_th
+BETA_TABLE_X = (0.0000001, 0.0005, 0.005, 0.05, 0.3, 0.5, 0.8, 0.9, 1.0, 1.5, 2.0, 3.0)
+
+# a_eff/a₀ 表格使用的表面密度 [10⁹ M_sun/kpc²]
+SIGMA_TABLE = (0.01, 0.1, 0.4, 0.5, 1.0, 2.0, 2.5, 5.0, 10.0, 50.0)
+
+# 宇宙演化表格的红移
+REDSHIFT_TABLE = (0.0, 0.5, 1.0, 2.0, 5.0)
+
+# 无观测星系表时使用的参考星系 (M_baryon [M_sun], R_disk [kpc])
+REFERENCE_GALAXIES = ((1e8, 1.0), (1e9, 2.0), (5e9, 3.0), (1e10, 4.0), (5e10, 6.0), (1e11, 10.0))
+
+# 依赖的入口模块 (相对包根)；它们在包内 import 的模块 (后端选择、计时装饰器等) 自动展开，
+# 其源码变化会使依赖它的章节失效。注册表按名称动态导入计算器，因此计算器模块需显式列出
+CALCULATOR_MODULES = ('.core.qst_calculator', '.core.physics_constants', '.core.units')
+V41_MODULES = ('.core.qst_calculator_v41',)
+# 每个章节都经由的模块: 版本注册表与延迟导入。本模块不在其中: 章节函数与其调用的
+# 辅助函数 (_table 等) 按各自源码计入键，修改一个章节不会使其他章节失效
+SHARED_MODULES = ('.core.registry', '.utils.lazy')
+
+
+def _table(header: Sequence[str], rows: List[Sequence]) -> List[str]:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines.extend("| " + " | ".join(str(cell) for cell in row) + " |" for row in rows)
+    return lines
+
+
+# ==================== 章节 ====================
+
+def section_parameters(inputs: Dict) -> List[str]:
+    calc = get_calculator('v4.5', inputs['param_set'])
+    lines = [f"## 参数集: {calc.param_set}", ""]
+    lines += _table(("参数", "值"), [(k, f"{v:.6g}") for k, v in calc.get_parameters().items()])
+
+    v41 = get_calculator('v4.1', 'local').get_parameters()
+    v45 = get_calculator('v4.5', 'local').get_parameters()
+    rows = [(k, f"{v41[k]:.6g}", f"{v45[k]:.6g}") for k in v41 if k in v45]
+    lines += ["", "### v4.1 与 v4.5 局部参数对照", ""]
+    lines += _table(("参数", "v4.1", "v4.5"), rows)
+    return lines
+
+
+def section_dark_energy(inputs: Dict) -> List[str]:
+    import numpy as np
+    from ..simulation.cosmic_evolution import CosmicEvolver
+
+    calc = get_calculator('v4.5', 'effective')
+    lines = ["## 暗能量", "", f"Ω_DE (解析, V/ρ_crit) = {calc.dark_energy_density():.6f}", ""]
+
+    results = CosmicEvolver('effective', N_points=inputs['n_points']).evolve()
+    # 结果按N升序，即z降序；反转后按z插值
+    z_ascending = results['z'][::-1]
+    rows = []
+    for z in inputs['redshifts']:
+        H, Omega_DE, w_DE = (np.interp(z, z_ascending, results[key][::-1])
+                             for key in ('H', 'Omega_DE', 'w_DE'))
+        rows.append((f"{z:g}", f"{H:.6f}", f"{Omega_DE:.6f}", f"{w_DE:.6f}"))
+    lines += ["### 背景演化", ""]
+    lines += _table(("z", "H/H₀", "Ω_DE", "w_DE"), rows)
+    return lines
+
+
+def section_mars_delay(inputs: Dict) -> List[str]:
+    v41 = get_calculator('v4.1', 'local')
+    v45 = get_calculator('v4.5', inputs['param_set'])
+    lines = ["## 火星时间延迟", ""]
+    lines += _table(("版本", "β₀", "延迟 [μs/日]"), [
+        ("v4.1", v41.params['beta0'], f"{v41.mars_time_delay():.1f}"),
+        ("v4.5", v45.params['beta0'], f"{v45.mars_time_delay():.1f}"),
+    ])
+    return lines
+
+
+def section_beta_eff(inputs: Dict) -> List[str]:
+    v45 = get_calculator('v4.5', inputs['param_set'])
+    v41 = get_calculator('v4.1', 'local')
+    M_th = v45.params['M_th']
+    rows = [(f"{x:g}", f"{v41.beta_effective(x * M_th):.6f}", f"{v45.beta_effective(x * M_th):.6f}")
+            for x in inputs['x']]
+    lines = ["## β_eff(M)", ""]
+    lines += _table(("x = M/M_th", "v4.1", "v4.5"), rows)
+
+    lines += ["", "## a_eff/a₀(σ)", ""]
+    lines += _table(("σ [10⁹ M_sun/kpc²]", "a_eff/a₀"),
+                    [(f"{s:g}", f"{v45.effective_a0_ratio(s):.6f}") for s in inputs['sigma']])
+    return lines
+
+
+def section_rotation_curves(inputs: Dict) -> List[str]:
+    import numpy as np
+    from ..utils.table_io import read_table
+    from .galaxy_analysis import analyze_galaxies, summarize
+
+    calc = get_calculator('v4.5', inputs['param_set'])
+    lines = ["## 星系旋转曲线", ""]
+    if inputs['catalog'] is None:
+        M, R = np.array(inputs['reference']).T
+        result = calc.evaluate_galaxies_batch(M, R)
+        rows = [(f"{m:.2e}", f"{r:g}", f"{s:.4f}", f"{a:.4f}", f"{v:.1f}")
+                for m, r, s, a, v in zip(M, R, result['sigma'], result['a_ratio'], result['v_rot'])]
+        lines += _table(("M_baryon [M_sun]", "R_disk [kpc]", "σ", "a_eff/a₀", "V_QST [km/s]"), rows)
+        return lines
+
+    table = read_table(inputs['catalog']['path'])
+    result = analyze_galaxies(calc, table['M_baryon'], table['R_disk'],
+                              sigma=table.get('sigma'), v_obs=table.get('v_obs'),
+                              v_err=table.get('v_err'))
+    summary = summarize(result)
+    lines += [f"星系表: {Path(inputs['catalog']['path']).name}", ""]
+    lines += _table(("指标", "值"), [(k, f"{v:.4g}" if isinstance(v, float) else v)
+                                    for k, v in summary.items()])
+    return lines
+
+
+# (名称, 函数, 依赖模块)
+SECTIONS: Tuple[Tuple[str, Callable, Tuple[str, ...]], ...] = (
+    ('parameters', section_parameters, SHARED_MODULES + CALCULATOR_MODULES + V41_MODULES),
+    ('dark_energy', section_dark_energy,
+     SHARED_MODULES + CALCULATOR_MODULES + ('.simulation.cosmic_evolution',)),
+    ('mars_delay', section_mars_delay, SHARED_MODULES + CALCULATOR_MODULES + V41_MODULES),
+    ('beta_eff', section_beta_eff, SHARED_MODULES + CALCULATOR_MODULES + V41_MODULES),
+    ('rotation_curves', section_rotation_curves,
+     SHARED_MODULES + CALCULATOR_MODULES + ('.analysis.galaxy_analysis', '.utils.table_io')),
+)
+
+
+# ==================== 哈希与缓存 ====================
+
+_SOURCE_HASHES: Dict[str, str] = {}
+_MODULE_IMPORTS: Dict[str, Tuple[str, ...]] = {}
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+# 本模块所在子包 (相对包根)，用于解析章节函数内的相对导入
+_THIS_PACKAGE = '.' + __package__.split('.', 1)[1]
+
+
+def _file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _module_hash(name: str) -> str:
+    """依赖模块源码哈希 (按进程缓存)"""
+    if name not in _SOURCE_HASHES:
+        _SOURCE_HASHES[name] = _file_hash(_module_file(name))
+    return _SOURCE_HASHES[name]
+
+
+def _module_file(name: str) -> Optional[Path]:
+    """包内模块名 (如 '.core.kernels') 对应的源文件；不是包内模块时返回 None"""
+    base = _PACKAGE_DIR.joinpath(*name.lstrip('.').split('.'))
+    for path in (base.with_suffix('.py'), base / '__init__.py'):
+        if path.is_file():
+            return path
+    return None
+
+
+def _package_imports(tree: ast.AST, package: str) -> List[str]:
+    """语法树中的包内相对导入 (含函数体内的延迟导入)，返回相对包根的模块名"""
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom) or node.level == 0:
+            continue
+        parts = package.lstrip('.').split('.') if package else []
+        parts = parts[:len(parts) - (node.level - 1)]
+        base = '.' + '.'.join(parts + (node.module.split('.') if node.module else []))
+        if _module_file(base) is not None:
+            found.append(base)
+        for alias in node.names:
+            # from . import kernels: 导入的名字本身是子模块
+            sub = f"{base.rstrip('.')}.{alias.name}"
+            if _module_file(sub) is not None:
+                found.append(sub)
+    return found
+
+
+def _module_imports(name: str) -> Tuple[str, ...]:
+    """模块在包内直接导入的模块 (按进程缓存，不导入模块本身)"""
+    if name not in _MODULE_IMPORTS:
+        path = _module_file(name)
+        package = name if path.name == '__init__.py' else name.rsplit('.', 1)[0]
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+        _MODULE_IMPORTS[name] = tuple(_package_imports(tree, package))
+    return _MODULE_IMPORTS[name]
+
+
+def module_closure(roots: Sequence[str]) -> List[str]:
+    """入口模块及其递归导入的全部包内模块"""
+    seen = set()
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen or _module_file(name) is None:
+            continue
+        seen.add(name)
+        stack.extend(_module_imports(name))
+    return sorted(seen)
+
+
+def _section_sources(func: Callable) -> List[str]:
+    """章节函数及其 (递归) 调用的本模块函数的源码"""
+    sources, seen, stack = [], set(), [func]
+    while stack:
+        f = stack.pop()
+        if f.__name__ in seen:
+            continue
+        seen.add(f.__name__)
+        sources.append(inspect.getsource(f))
+        stack.extend(obj for obj in (globals().get(n) for n in f.__code__.co_names)
+                     if inspect.isfunction(obj) and obj.__module__ == __name__)
+    return sources
+
+
+def section_key(name: str, func: Callable, depends: Sequence[str], inputs: Dict) -> str:
+    """章节缓存键: sha256(名称, 输入, 章节及辅助函数源码, 依赖模块闭包源码)"""
+    digest = hashlib.sha256()
+    digest.update(name.encode())
+    digest.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+    for source in _section_sources(func):
+        digest.update(source.encode())
+    # 章节函数体内的延迟导入也计入依赖
+    local = _package_imports(ast.parse(textwrap.dedent(inspect.getsource(func))), _THIS_PACKAGE)
+    for module in module_closure(list(depends) + local):
+        digest.update(module.encode())
+        digest.update(_module_hash(module).encode())
+    return digest.hexdigest()[:20]
+
+
+def section_inputs(name: str, param_set: str, catalog: Optional[str], n_points: int) -> Dict:
+    """各章节的输入；星系表以内容哈希表示，文件改动即失效"""
+    inputs: Dict = {'param_set': param_set}
+    if name == 'dark_energy':
+        inputs = {'n_points': n_points, 'redshifts': list(REDSHIFT_TABLE)}
+    elif name == 'beta_eff':
+        inputs.update(x=list(BETA_TABLE_X), sigma=list(SIGMA_TABLE))
+    elif name == 'rotation_curves':
+        inputs['reference'] = [list(g) for g in REFERENCE_GALAXIES]
+        inputs['catalog'] = None
+        if catalog is not None:
+            inputs['catalog'] = {'path': str(catalog), 'sha256': _file_hash(catalog)}
+    return inputs
+
+
+def build_report(param_set: str = 'sparc_optimized', cache_dir=DEFAULT_CACHE_DIR,
+                 catalog: Optional[str] = None, n_points: int = 2000,
+                 force: bool = False) -> Tuple[str, Dict]:
+    """
+    生成Markdown格式的预言汇总报告
+
+    参数:
+        param_set: 局部/星系章节使用的参数集
+        cache_dir: 章节缓存目录；None表示不使用缓存
+        catalog: 可选的观测星系表 (M_baryon, R_disk, v_obs[, v_err, sigma])
+        n_points: 宇宙演化输出点数
+        force: 忽略缓存，全部重建
+
+    返回:
+        (报告文本, {'built': [...], 'cached': [...], 'elapsed_s': 秒})
+    """
+    start = time.perf_counter()
+    cache = Path(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        cache.mkdir(parents=True, exist_ok=True)
+
+    stats: Dict = {'built': [], 'cached': []}
+    parts = ["# QST 预言汇总", ""]
+    for name, func, depends in SECTIONS:
+        inputs = section_inputs(name, param_set, catalog, n_points)
+        path = None
+        if cache is not None:
+            path = cache / f"{name}-{section_key(name, func, depends, inputs)}.md"
+        if path is not None and path.exists() and not force:
+            text = path.read_text(encoding='utf-8')
+            stats['cached'].append(name)
+        else:
+            text = "\n".join(func(inputs)) + "\n"
+            if path is not None:
+                # 先写临时文件再原子替换，并发生成时不会读到半个章节
+                tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+                tmp.write_text(text, encoding='utf-8')
+                os.replace(tmp, path)
+            stats['built'].append(name)
+        parts.append(text)
+
+    stats['elapsed_s'] = time.perf_counter() - start
+    return "\n".join(parts), stats
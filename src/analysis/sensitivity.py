@@ -0,0 +1,230 @@
+"""
+量子时空统一理论 - Sobol 全局敏感性分析
+
+在参数区间上用加扰 Sobol 序列构造 Saltelli 样本矩阵 A、B 与 AB_i
+(A 的第 i 列换成 B 的第 i 列)，共 N(d+2) 组参数，经 kernels 的批量函数
+分块求值 (可跨进程)，估计每个参数的一阶指数 S1 与总效应指数 ST:
+
+    S1_i = mean(f_B (f_ABi − f_A)) / Var(f)          (Saltelli 2010)
+    ST_i = mean((f_A − f_ABi)²) / (2 Var(f))          (Jansen 1999)
+
+置信区间由对 N 行的 bootstrap 重抽样的分位数给出。
+与逐个参数扫描不同，ST − S1 反映参数间的交互作用。
+
+可分析的量:
+    mars_delay  火星钟速率差
+    v_rot       各星系旋转速度 (指数形状为 (d, G))
+    residual    旋转曲线残差 χ² = Σ((v − v_obs)/v_err)²；
+                未给 v_err 时为 Σ ln²(v/v_obs)
+
+可复现性: SeedSequence(seed) 的两个子序列分别用于 Sobol 加扰与 bootstrap，
+样本矩阵与 workers、chunk_size 无关。
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.physics_constants import PhysicalConstants
+from ..utils.lazy import lazy_import
+from .uncertainty import DEFAULT_CHUNK_SIZE, _base_parameters, evaluate_samples
+
+qmc = lazy_import('scipy.stats.qmc')
+
+
+SENSITIVITY_PARAMS = ('beta0', 'M_th', 'A_low', 'sigma_crit', 'sigma_transition', 'alpha')
+QUANTITIES = ('mars_delay', 'v_rot', 'residual')
+DEFAULT_RELATIVE_RANGE = 0.2
+DEFAULT_N_BOOTSTRAP = 200
+
+
+def _evaluate_chunk(task) -> Dict[str, np.ndarray]:
+    """一块参数样本 X (n, d) 经批量核心函数求值"""
+    param_set, constants, params, names, X, galaxies, quantities = task
+    size = len(X)
+    p = {name: np.full(size, float(value)) for name, value in params.items()
+         if isinstance(value, (int, float))}
+    for i, name in enumerate(names):
+        p[name] = X[:, i]
+    g = {name: np.broadcast_to(galaxies[name], (size,) + galaxies[name].shape)
+         for name in ('M_baryon', 'R_disk') if name in galaxies}
+    needed = [q for q in quantities if q != 'residual']
+    if 'residual' in quantities and 'v_rot' not in needed:
+        needed.append('v_rot')
+    out = evaluate_samples(param_set, PhysicalConstants(constants), p, g, needed)
+    if 'residual' in quantities:
+        if 'v_err' in galaxies:
+            r = (out['v_rot'] - galaxies['v_obs']) / galaxies['v_err']
+        else:
+            r = np.log(out['v_rot'] / galaxies['v_obs'])
+        out['residual'] = np.sum(r * r, axis=1)
+    return {q: out[q] for q in quantities}
+
+
+def _indices(f_A, f_B, f_AB) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    由三组函数值估计 S1、ST
+
+    参数:
+        f_A, f_B: (N, ...)
+        f_AB: (d, N, ...)
+
+    返回:
+        (S1, ST)，形状 (d, ...)；方差为零处为 nan
+    """
+    variance = np.var(np.concatenate([f_A, f_B]), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S1 = np.mean(f_B * (f_AB - f_A), axis=1) / variance
+        ST = 0.5 * np.mean((f_A - f_AB)**2, axis=1) / variance
+    return S1, ST
+
+
+def _check_bounds(calc, params, bounds) -> Dict[str, Tuple[float, float]]:
+    """参数区间: 缺省为 calc 中心值 ±DEFAULT_RELATIVE_RANGE"""
+    if params is None:
+        params = list(bounds) if bounds else [name for name in SENSITIVITY_PARAMS
+                                              if name in calc.params]
+    if not params:
+        raise ValueError(f"参数集 {calc.param_set} 中没有可分析的参数")
+    unknown = [name for name in params if name not in calc.params]
+    if unknown:
+        raise ValueError(f"参数集 {calc.param_set} 中不存在参数: {unknown}")
+    out = {}
+    for name in params:
+        if bounds and name in bounds:
+            lo, hi = (float(v) for v in bounds[name])
+        else:
+            center = float(calc.params[name])
+            lo, hi = sorted((center * (1.0 - DEFAULT_RELATIVE_RANGE),
+                             center * (1.0 + DEFAULT_RELATIVE_RANGE)))
+        if not lo < hi:
+            raise ValueError(f"{name} 的区间无效: ({lo}, {hi})")
+        out[name] = (lo, hi)
+    extra = [name for name in (bounds or {}) if name not in out]
+    if extra:
+        raise ValueError(f"区间中的参数未在 params 中: {extra}")
+    return out
+
+
+def saltelli_samples(bounds: Dict[str, Tuple[float, float]], n_base: int,
+                     seed=0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Saltelli 样本矩阵
+
+    参数:
+        bounds: {参数名: (下限, 上限)}，顺序即列顺序
+        n_base: 基样本数 N (须为 2 的幂)
+        seed: 整数或 SeedSequence (Sobol 加扰)
+
+    返回:
+        (A, B, AB)，形状 (N, d)、(N, d)、(d, N, d)
+    """
+    if n_base < 2 or n_base & (n_base - 1):
+        raise ValueError(f"n_base 须为不小于2的2的幂: {n_base}")
+    d = len(bounds)
+    lo, hi = np.array(list(bounds.values()), dtype=float).T
+    sobol = qmc.Sobol(2 * d, scramble=True, seed=np.random.default_rng(seed))
+    u = sobol.random_base2(int(n_base).bit_length() - 1)
+    A = lo + (hi - lo) * u[:, :d]
+    B = lo + (hi - lo) * u[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+    return A, B, AB
+
+
+def sobol_indices(calc, n_base: int = 1024, bounds: Optional[Dict] = None,
+                  params: Optional[Sequence[str]] = None, M_baryon=None, R_disk=None,
+                  v_obs=None, v_err=None, quantities: Optional[Sequence[str]] = None,
+                  n_bootstrap: int = DEFAULT_N_BOOTSTRAP, confidence: float = 0.95,
+                  seed: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  workers: Optional[int] = None) -> Dict:
+    """
+    Sobol 一阶与总效应指数
+
+    参数:
+        calc: 计算器 (未分析的参数取 calc.params 中的值)
+        n_base: 基样本数 N，向上取为 2 的幂；共求值 N(d+2) 次
+        bounds: {参数名: (下限, 上限)}，缺省为中心值 ±20%
+        params: 分析的参数，缺省为 bounds 的键或 SENSITIVITY_PARAMS 中 calc 具有的参数
+        M_baryon: 星系重子质量 [M_sun]，形状 (G,)；v_rot、residual 需要
+        R_disk: 盘半径 [kpc]，与 M_baryon 同形状
+        v_obs: 观测速度 [km/s]；residual 需要
+        v_err: 观测误差 [km/s]，标量或与 v_obs 同形状，可选
+        quantities: QUANTITIES 的子集，缺省为参数集与输入可算的全部量
+        n_bootstrap: bootstrap 次数；0 表示不估计置信区间
+        confidence: 置信水平
+        seed: 根种子
+        chunk_size: 每块求值的参数组数
+        workers: 进程数；None或1表示在当前进程中计算
+
+    返回:
+        {'params', 'bounds', 'n_base', 'n_evaluations', 'confidence',
+         量: {'S1', 'ST': (d, ...), 'S1_interval', 'ST_interval': (2, d, ...), 'variance'}}
+    """
+    if n_base < 2 or chunk_size < 1 or n_bootstrap < 0:
+        raise ValueError("n_base 须不小于2，chunk_size 须为正整数，n_bootstrap 不能为负")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError(f"置信水平须在 (0, 1) 内: {confidence}")
+    bounds = _check_bounds(calc, params, bounds)
+    names = tuple(bounds)
+
+    galaxies = {}
+    for name, value in (('M_baryon', M_baryon), ('R_disk', R_disk), ('v_obs', v_obs)):
+        if value is not None:
+            galaxies[name] = np.atleast_1d(np.asarray(value, dtype=float))
+    if len({v.shape for v in galaxies.values()}) > 1:
+        raise ValueError("M_baryon、R_disk、v_obs 形状须相同")
+    if v_err is not None and 'v_obs' in galaxies:
+        galaxies['v_err'] = np.broadcast_to(np.asarray(v_err, dtype=float),
+                                             galaxies['v_obs'].shape)
+
+    available = []
+    if calc.param_set in ('local', 'sparc_optimized'):
+        available.append('mars_delay')
+        if 'M_baryon' in galaxies and 'R_disk' in galaxies:
+            available.append('v_rot')
+            if 'v_obs' in galaxies:
+                available.append('residual')
+    quantities = tuple(quantities) if quantities is not None else tuple(available)
+    missing = [q for q in quantities if q not in available]
+    if missing or not quantities:
+        raise ValueError(f"无法计算 {missing or list(quantities)}: 参数集 {calc.param_set} "
+                         f"与给定输入可算 {', '.join(available) or '无'}")
+
+    n_base = 1 << (int(n_base) - 1).bit_length()
+    sobol_seed, bootstrap_seed = np.random.SeedSequence(seed).spawn(2)
+    A, B, AB = saltelli_samples(bounds, n_base, sobol_seed)
+    d = len(names)
+    X = np.concatenate([A, B, AB.reshape(d * n_base, d)])
+
+    base = _base_parameters(calc)
+    rows = [(lo, min(len(X), lo + chunk_size)) for lo in range(0, len(X), chunk_size)]
+    tasks = [(calc.param_set, calc.constants.name, base, names, X[lo:hi], galaxies, quantities)
+             for lo, hi in rows]
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_evaluate_chunk, tasks))
+    else:
+        results = list(map(_evaluate_chunk, tasks))
+    f = {q: np.concatenate([chunk[q] for chunk in results]) for q in quantities}
+
+    rng = np.random.default_rng(bootstrap_seed)
+    resamples = [rng.integers(0, n_base, n_base) for _ in range(n_bootstrap)]
+    tail = 0.5 * (1.0 - confidence)
+    result = {'params': names, 'bounds': bounds, 'n_base': n_base, 'n_evaluations': len(X),
+              'confidence': confidence}
+    for q in quantities:
+        values = f[q]
+        f_A, f_B = values[:n_base], values[n_base:2 * n_base]
+        f_AB = values[2 * n_base:].reshape((d, n_base) + values.shape[1:])
+        S1, ST = _indices(f_A, f_B, f_AB)
+        entry = {'S1': S1, 'ST': ST, 'variance': np.var(values[:2 * n_base], axis=0)}
+        if resamples:
+            draws = [_indices(f_A[idx], f_B[idx], f_AB[:, idx]) for idx in resamples]
+            for k, name in enumerate(('S1', 'ST')):
+                samples = np.stack([draw[k] for draw in draws])
+                entry[f'{name}_interval'] = np.quantile(samples, [tail, 1.0 - tail], axis=0)
+        result[q] = entry
+    return result
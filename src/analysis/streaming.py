@@ -0,0 +1,253 @@
+"""
+量子时空统一理论 - 大型星系表的分块流式计算
+
+读取、计算、写出分别在读线程、主线程、写线程中进行，经有界队列衔接；
+同一时刻内存中最多存在约 (2×queue_depth + 2) 个数据块，峰值内存由块大小决定，与表格总大小无关。
+"""
+
+import itertools
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from ..core.qst_calculator import QSTCalculator
+from ..utils.table_io import csv_rows, parse_csv, read_csv_header
+
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# 流式 .npy 头部中为行数预留的位数 (int64 的最大值为19位)
+NPY_MAX_ROWS_DIGITS = 19
+
+_END = object()
+
+
+# ==================== 分块读取 ====================
+
+def iter_csv_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """逐块读取CSV (首行为列名)，每块最多 chunk_size 行；非数值列读为字符串"""
+    header = read_csv_header(path)
+    with open(path, 'r', encoding='utf-8') as fh:
+        fh.readline()
+        empty = True
+        while True:
+            lines = list(itertools.islice(fh, chunk_size))
+            if not lines:
+                break
+            empty = False
+            yield parse_csv(lines, header)
+    if empty:
+        # 只有表头: 给出一个空块，使输出也带有列名
+        yield {name: np.zeros(0) for name in header}
+
+
+def iter_npy_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """以内存映射方式逐块读取结构化 .npy，每块复制为独立数组"""
+    array = np.load(path, mmap_mode='r')
+    if not array.dtype.names:
+        raise ValueError("流式读取 .npy 需要结构化数组 (带列名)")
+    for start in range(0, max(array.shape[0], 1), chunk_size):
+        block = array[start:start + chunk_size]
+        yield {name: np.array(block[name]) for name in array.dtype.names}
+
+
+def iter_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """按扩展名选择分块读取器"""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return iter_csv_chunks(path, chunk_size)
+    if suffix == '.npy':
+        return iter_npy_chunks(path, chunk_size)
+    raise ValueError(f"流式读取不支持的格式: {suffix} (支持 .csv, .npy)")
+
+
+# ==================== 增量写出 ====================
+
+class ChunkWriter:
+    """
+    增量写出表格 (.csv 或结构化 .npy)
+
+    .npy 在首次写入时按列的 dtype 确定头部长度 (行数按最大位数预留，补齐到64字节)，
+    关闭时回填实际行数，因此无需预先知道总行数。没有写入任何块时关闭，
+    .npy 输出为合法的空数组。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.suffix = self.path.suffix.lower()
+        if self.suffix not in ('.csv', '.npy'):
+            raise ValueError(f"流式写出不支持的格式: {self.suffix} (支持 .csv, .npy)")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, 'wb')
+        self._names = None
+        self._dtype = None
+        self._header_len = None
+        self.n_rows = 0
+
+    def _npy_header(self) -> bytes:
+        """
+        .npy 头部；首次调用时确定总长度，之后 (回填行数时) 保持不变
+        """
+        descr = np.lib.format.dtype_to_descr(self._dtype)
+        text = f"{{'descr': {descr!r}, 'fortran_order': False, 'shape': ({self.n_rows},), }}"
+        if self._header_len is None:
+            longest = len(text) + NPY_MAX_ROWS_DIGITS - len(str(self.n_rows))
+            # 版本1.0的头部长度字段为2字节，列很多时改用4字节的2.0
+            self._version, size_len = ((1, 2) if longest + 11 < 65536 else (2, 4))
+            self._header_len = -(-(8 + size_len + longest + 1) // 64) * 64
+        size_len = 2 if self._version == 1 else 4
+        body_len = self._header_len - 8 - size_len
+        prefix = b'\x93NUMPY' + bytes([self._version, 0])
+        body = text.ljust(body_len - 1).encode('latin1') + b'\n'
+        return prefix + body_len.to_bytes(size_len, 'little') + body
+
+    def write(self, columns: Dict[str, np.ndarray]):
+        if self._names is None:
+            self._names = list(columns)
+            if self.suffix == '.csv':
+                self._fh.write((','.join(self._names) + '\n').encode('utf-8'))
+            else:
+                self._dtype = np.dtype([(name, np.asarray(columns[name]).dtype)
+                                        for name in self._names])
+                self._fh.write(self._npy_header())
+        n = len(next(iter(columns.values())))
+        if self.suffix == '.csv':
+            data, fmt = csv_rows({name: columns[name] for name in self._names})
+            np.savetxt(self._fh, data, delimiter=',', fmt=fmt)
+        else:
+            block = np.empty(n, dtype=self._dtype)
+            for name in self._names:
+                column = np.asarray(columns[name])
+                if column.dtype.kind in 'US' and column.itemsize > self._dtype[name].itemsize:
+                    # 定长字符串字段由首块决定，后续更长的值会被截断
+                    raise ValueError(f"列 '{name}' 的字符串长于首块，无法流式写入 .npy；"
+                                     f"请改用 .csv 输出")
+                block[name] = columns[name]
+            self._fh.write(block.tobytes())
+        self.n_rows += n
+
+    def close(self):
+        if self._fh.closed:
+            return
+        if self.suffix == '.npy':
+            if self._dtype is None:
+                self._dtype = np.dtype(float)
+            self._fh.seek(0)
+            self._fh.write(self._npy_header())
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== 流水线 ====================
+
+def _producer(iterator, out_queue: queue.Queue, errors: list, stop: threading.Event):
+    try:
+        for item in iterator:
+            while not stop.is_set():
+                try:
+                    out_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if stop.is_set():
+                return
+    except BaseException as exc:  # 交给主线程重新抛出
+        errors.append(exc)
+    finally:
+        out_queue.put(_END)
+
+
+def _consumer(writer: ChunkWriter, in_queue: queue.Queue, errors: list, stop: threading.Event):
+    try:
+        while True:
+            item = in_queue.get()
+            if item is _END:
+                return
+            writer.write(item)
+    except BaseException as exc:
+        errors.append(exc)
+        stop.set()
+        # 排空队列，避免主线程阻塞
+        while in_queue.get() is not _END:
+            pass
+
+
+def stream_evaluate(input_path, output_path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    param_set: str = 'sparc_optimized', mass_col: str = 'M_baryon',
+                    radius_col: str = 'R_disk', sigma_col: Optional[str] = None,
+                    keep_input: bool = False, queue_depth: int = 2, dtype=None,
+                    backend=None) -> Dict:
+    """
+    分块流式计算星系表的 σ, a_eff/a₀, β_eff, V_rot 并增量写出
+
+    参数:
+        input_path: 输入 .csv / 结构化 .npy
+        output_path: 输出 .csv / .npy
+        chunk_size: 每块行数，决定峰值内存
+        queue_depth: 读/写队列的最大块数
+        keep_input: 输出中保留输入列
+        dtype: 计算与输出精度 'float64' (默认) 或 'float32'
+        backend: 计算后端 'numpy'、'numba'、'auto' (见 core.backends)
+
+    返回:
+        {'n_rows', 'n_chunks', 'elapsed_s'}
+    """
+    calc = QSTCalculator(param_set)
+    start = time.perf_counter()
+    errors: list = []
+    stop = threading.Event()
+    read_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+    write_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+    n_chunks = 0
+
+    with ChunkWriter(output_path) as writer:
+        reader = threading.Thread(target=_producer, daemon=True,
+                                  args=(iter_chunks(input_path, chunk_size), read_queue,
+                                        errors, stop))
+        consumer = threading.Thread(target=_consumer, daemon=True,
+                                    args=(writer, write_queue, errors, stop))
+        reader.start()
+        consumer.start()
+        try:
+            while True:
+                chunk = read_queue.get()
+                if chunk is _END or stop.is_set():
+                    break
+                for name in (mass_col, radius_col):
+                    if name not in chunk:
+                        raise ValueError(f"输入缺少列 '{name}'，现有列: {', '.join(chunk)}")
+                sigma = chunk.get(sigma_col) if sigma_col else None
+                result = calc.evaluate_galaxies_batch(chunk[mass_col], chunk[radius_col], sigma,
+                                                     dtype=dtype, backend=backend)
+                columns = dict(chunk) if keep_input else {}
+                columns.update(result)
+                write_queue.put(columns)
+                n_chunks += 1
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            if errors:
+                stop.set()
+            # 让读线程退出并排空读队列
+            while reader.is_alive():
+                try:
+                    read_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            write_queue.put(_END)
+            consumer.join()
+        if errors:
+            raise errors[0]
+
+    return {'n_rows': writer.n_rows, 'n_chunks': n_chunks,
+            'elapsed_s': time.perf_counter() - start}
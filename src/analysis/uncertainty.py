@@ -0,0 +1,220 @@
+"""
+量子时空统一理论 - 蒙特卡罗不确定度传播
+
+对参数与输入 (星系质量、半径) 抽取 N 个样本，经 kernels 的批量函数分块求值，
+返回 Ω_DE、火星钟速率差、β_eff 与旋转速度的分位数。
+
+可复现性: 样本按固定长度 chunk_size 分块，第 i 块使用 SeedSequence(seed).spawn 的
+第 i 个子序列。分块只取决于 n_samples 与 chunk_size，与进程数无关，因此任意
+workers 下结果逐位相同。
+
+误差的写法:
+    0.01                      正态分布，标准差 0.01
+    ('normal', std)           同上
+    ('lognormal', s)          中心值乘以 e^(s·N(0,1))
+    ('uniform', lo, hi)       [lo, hi] 上均匀分布 (忽略中心值)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core import kernels
+from ..core.physics_constants import PhysicalConstants
+
+
+QUANTITIES = ('Omega_DE', 'mars_delay', 'beta_eff', 'v_rot')
+INPUTS = ('M_baryon', 'R_disk')
+DEFAULT_LEVELS = (0.025, 0.16, 0.5, 0.84, 0.975)
+DEFAULT_CHUNK_SIZE = 8192
+
+# Ω_DE 的参数 (QSTCalculator.dark_energy_density 对缺失参数使用 QSTConstants 的值)
+_DE_PARAMS = ('phi_plus', 'phi_minus', 'omega', 'm_phi', 'm_omega', 'mu', 'V_const')
+_DE_DEFAULTS = {'m_phi': 'M_PHI_EFF', 'm_omega': 'M_OMEGA_EFF', 'mu': 'MU', 'V_const': 'V_CONST'}
+
+
+def _parse_error(name: str, spec) -> Tuple:
+    """误差写法 → (分布名, 参数...)"""
+    if isinstance(spec, (int, float)):
+        spec = ('normal', float(spec))
+    kind = spec[0] if isinstance(spec, (tuple, list)) and spec else None
+    sizes = {'normal': 2, 'lognormal': 2, 'uniform': 3}
+    if kind not in sizes or len(spec) != sizes[kind]:
+        raise ValueError(f"{name} 的误差写法无效: {spec!r} "
+                         "(可用 std、('normal', std)、('lognormal', s)、('uniform', lo, hi))")
+    return tuple(spec)
+
+
+def _draw(rng, center, spec, size):
+    """按误差写法抽样，形状为 size (+ center 的形状)"""
+    center = np.asarray(center, dtype=float)
+    shape = (size,) + center.shape
+    kind = spec[0]
+    if kind == 'normal':
+        return center + spec[1] * rng.standard_normal(shape)
+    if kind == 'lognormal':
+        return center * np.exp(spec[1] * rng.standard_normal(shape))
+    return rng.uniform(spec[1], spec[2], shape)
+
+
+def _base_parameters(calc) -> Dict[str, float]:
+    params = dict(calc.params)
+    params.setdefault('a0_standard', 1.2e-10)
+    for name, attr in _DE_DEFAULTS.items():
+        params.setdefault(name, getattr(calc.qst_constants, attr))
+    return params
+
+
+def available_quantities(calc, has_galaxies: bool) -> Tuple[str, ...]:
+    """参数集与输入可以计算的量"""
+    available = []
+    if calc.param_set in ('effective', 'sparc_optimized'):
+        available.append('Omega_DE')
+    if calc.param_set in ('local', 'sparc_optimized'):
+        available.append('mars_delay')
+        if has_galaxies:
+            available += ['beta_eff', 'v_rot']
+    return tuple(available)
+
+
+def evaluate_samples(param_set: str, c: PhysicalConstants, p: Dict[str, np.ndarray],
+                     g: Dict[str, np.ndarray], quantities: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    经批量核心函数计算一组参数样本
+
+    参数:
+        param_set: 参数集名 (决定 a_eff/a₀ 曲线)
+        c: PhysicalConstants
+        p: {参数名: (n,) 数组}，含全部数值参数
+        g: {'M_baryon' / 'R_disk': (n, G) 数组}
+        quantities: QUANTITIES 的子集
+
+    返回:
+        {量: (n,) 或 (n, G) 数组}
+    """
+    out = {}
+    if 'Omega_DE' in quantities:
+        out['Omega_DE'] = kernels.dark_energy_density(*(p[k] for k in _DE_PARAMS))
+    if 'mars_delay' in quantities:
+        out['mars_delay'] = kernels.mars_time_delay(p['beta0'])
+    if 'beta_eff' in quantities or 'v_rot' in quantities:
+        column = (slice(None),) + (None,) * (g['M_baryon'].ndim - 1)
+        beta_eff = kernels.beta_effective(g['M_baryon'], p['beta0'][column], p['M_th'][column],
+                                          mass_unit=c.M_SUN)
+        out['beta_eff'] = beta_eff
+        if 'v_rot' in quantities:
+            sigma = kernels.surface_density(g['M_baryon'], g['R_disk'], c.SURFACE_DENSITY_SCALE)
+            if param_set == 'sparc_optimized':
+                a_ratio = kernels.a0_ratio_sparc(sigma, p['A_low'][column],
+                                                 p['sigma_crit'][column],
+                                                 p['sigma_transition'][column],
+                                                 p['alpha'][column])
+            else:
+                a_ratio = kernels.a0_ratio_compatible(sigma)
+            out['v_rot'] = kernels.rotation_velocity(g['M_baryon'], a_ratio, beta_eff,
+                                                     p['a0_standard'][column], c.V4_COEFF)
+    return {q: out[q] for q in quantities}
+
+
+def _evaluate_chunk(task) -> Dict[str, np.ndarray]:
+    """一块样本: 抽样并经批量核心函数求值"""
+    (param_set, constants, params, param_errors, galaxies, input_errors, quantities,
+     seed_seq, size) = task
+    rng = np.random.default_rng(seed_seq)
+    # 抽样顺序固定: 参数按名称排序，然后是输入
+    p = {name: np.full(size, float(value)) for name, value in params.items()
+         if isinstance(value, (int, float))}
+    for name in sorted(param_errors):
+        p[name] = _draw(rng, params[name], param_errors[name], size)
+    g = {}
+    for name in INPUTS:
+        if name in galaxies:
+            g[name] = (_draw(rng, galaxies[name], input_errors[name], size)
+                       if name in input_errors else
+                       np.broadcast_to(galaxies[name], (size,) + galaxies[name].shape))
+    return evaluate_samples(param_set, PhysicalConstants(constants), p, g, quantities)
+
+
+def propagate(calc, n_samples: int = 10000, param_errors: Optional[Dict] = None,
+              M_baryon=None, R_disk=None, input_errors: Optional[Dict] = None,
+              quantities: Optional[Sequence[str]] = None,
+              levels: Sequence[float] = DEFAULT_LEVELS, seed: int = 0,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None,
+              return_samples: bool = False) -> Dict:
+    """
+    蒙特卡罗传播参数与输入的不确定度
+
+    参数:
+        calc: 计算器 (参数中心值取自 calc.params)
+        n_samples: 样本数
+        param_errors: {参数名: 误差写法}
+        M_baryon: 星系重子质量 [M_sun]，形状 (G,)；计算 beta_eff、v_rot 时需要
+        R_disk: 盘半径 [kpc]，与 M_baryon 同形状；计算 v_rot 时需要
+        input_errors: {'M_baryon' / 'R_disk': 误差写法}
+        quantities: QUANTITIES 的子集，缺省为参数集与输入可算的全部量
+        levels: 分位点
+        seed: 根种子
+        chunk_size: 每块样本数 (决定随机流的划分)
+        workers: 进程数；None或1表示在当前进程中计算
+        return_samples: 是否同时返回全部样本
+
+    返回:
+        {'levels', 'n_samples', 量: {'quantiles': (len(levels), ...), 'mean', 'std'}}；
+        return_samples 时每个量另含 'samples': (n_samples, ...)
+    """
+    if n_samples < 1 or chunk_size < 1:
+        raise ValueError("n_samples 与 chunk_size 须为正整数")
+    params = _base_parameters(calc)
+    param_errors = {name: _parse_error(name, spec) for name, spec in (param_errors or {}).items()}
+    unknown = [name for name in param_errors if name not in params]
+    if unknown:
+        raise ValueError(f"参数集 {calc.param_set} 中不存在参数: {unknown}")
+
+    galaxies = {}
+    for name, value in (('M_baryon', M_baryon), ('R_disk', R_disk)):
+        if value is not None:
+            galaxies[name] = np.atleast_1d(np.asarray(value, dtype=float))
+    input_errors = {name: _parse_error(name, spec) for name, spec in (input_errors or {}).items()}
+    unknown = [name for name in input_errors if name not in galaxies]
+    if unknown:
+        raise ValueError(f"未给出输入: {unknown}")
+    if len({v.shape for v in galaxies.values()}) > 1:
+        raise ValueError("M_baryon 与 R_disk 形状须相同")
+
+    available = available_quantities(calc, 'M_baryon' in galaxies)
+    if 'R_disk' not in galaxies:
+        available = tuple(q for q in available if q != 'v_rot')
+    quantities = tuple(quantities) if quantities is not None else available
+    missing = [q for q in quantities if q not in available]
+    if missing:
+        raise ValueError(f"无法计算 {missing}: 参数集 {calc.param_set} 与给定输入可算 "
+                         f"{', '.join(available) or '无'}")
+
+    bounds = [(lo, min(n_samples, lo + chunk_size)) for lo in range(0, n_samples, chunk_size)]
+    streams = np.random.SeedSequence(seed).spawn(len(bounds))
+    tasks = [(calc.param_set, calc.constants.name, params, param_errors, galaxies, input_errors,
+              quantities, stream, hi - lo) for (lo, hi), stream in zip(bounds, streams)]
+
+    samples = {}
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_evaluate_chunk, tasks))
+    else:
+        results = map(_evaluate_chunk, tasks)
+    for (lo, hi), chunk in zip(bounds, results):
+        for q, values in chunk.items():
+            if q not in samples:
+                samples[q] = np.empty((n_samples,) + values.shape[1:])
+            samples[q][lo:hi] = values
+
+    levels = np.asarray(levels, dtype=float)
+    summary = {'levels': levels, 'n_samples': n_samples}
+    for q in quantities:
+        entry = {'quantiles': np.quantile(samples[q], levels, axis=0),
+                 'mean': samples[q].mean(axis=0), 'std': samples[q].std(axis=0, ddof=1)
+                 if n_samples > 1 else np.zeros(samples[q].shape[1:])}
+        if return_samples:
+            entry['samples'] = samples[q]
+        summary[q] = entry
+    return summary
@@ -0,0 +1,416 @@
+"""
+量子时空统一理论 - 命令行入口 `qst`
+
+子命令:
+    evaluate  从CSV/NPY批量计算星系量 (σ, a_eff/a₀, β_eff, V_rot)
+    evaluate-npy
+              对内存映射的 .npy 数组分块并行计算 (数组可大于内存)
+    cosmic    宇宙背景演化模拟
+    galaxy    星系样本分析 (与观测速度比较)
+    mass      由观测平坦速度与盘半径反解重子质量
+    compare   多个模型版本在同一星系表上的对比
+    emulator  预计算宇宙背景观测量插值表
+    clocks    开普勒轨道上行星钟的时间分辨QST钟差
+    plots     批量并行绘制旋转曲线与诊断图
+    serve     本地微批处理HTTP/JSON计算服务
+    report    生成预言汇总报告
+
+各子命令的计算模块在执行时才导入，`qst --help` 不加载NumPy。
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def _read_galaxy_columns(args):
+    """读取星系表并取出质量、半径及可选的σ列"""
+    from .utils.table_io import read_table
+
+    table = read_table(args.input)
+    for name in (args.mass_col, args.radius_col):
+        if name not in table:
+            raise SystemExit(f"输入缺少列 '{name}'，现有列: {', '.join(table)}")
+    sigma = table.get(args.sigma_col) if args.sigma_col else None
+    return table, table[args.mass_col], table[args.radius_col], sigma
+
+
+def _backend(args) -> Optional[str]:
+    """检查 --backend 可用 (不可用时退出而不是在计算中途报错)"""
+    from .core.backends import resolve_backend
+
+    try:
+        resolve_backend(args.backend)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    return args.backend
+
+
+def _store(args):
+    """--store 给出时返回 ResultStore，否则None"""
+    if not args.store:
+        return None
+    from .utils.result_store import ResultStore
+
+    return ResultStore(args.store)
+
+
+def cmd_evaluate(args) -> int:
+    backend = _backend(args)
+    if args.chunk_size and args.store:
+        raise SystemExit("--store 不能与 --chunk-size 流式模式同时使用")
+    if args.chunk_size:
+        from .analysis.streaming import stream_evaluate
+
+        stats = stream_evaluate(args.input, args.output, chunk_size=args.chunk_size,
+                                param_set=args.param_set, mass_col=args.mass_col,
+                                radius_col=args.radius_col, sigma_col=args.sigma_col,
+                                keep_input=args.keep_input, dtype=args.dtype,
+                                backend=backend)
+        print(f"已流式计算 {stats['n_rows']} 个星系 ({stats['n_chunks']} 块) → {args.output}")
+        return 0
+
+    from .core.qst_calculator import QSTCalculator
+    from .utils.table_io import write_table
+
+    table, M_baryon, R_disk, sigma = _read_galaxy_columns(args)
+    calc = QSTCalculator(args.param_set)
+    store = _store(args)
+    if store is None:
+        result = calc.evaluate_galaxies_batch(M_baryon, R_disk, sigma, dtype=args.dtype,
+                                              backend=backend)
+    else:
+        from .utils.result_store import result_key
+
+        key = result_key('galaxies', calc.param_set,
+                         {'params': calc.params, 'dtype': args.dtype, 'M_baryon': M_baryon,
+                          'R_disk': R_disk, 'sigma': sigma},
+                         ('.core.qst_calculator', '.core.kernels', '.core.physics_constants'))
+        result = store.cached(key, lambda: calc.evaluate_galaxies_batch(
+            M_baryon, R_disk, sigma, dtype=args.dtype, backend=backend)).arrays
+
+    columns = dict(table) if args.keep_input else {}
+    columns.update(result)
+    write_table(args.output, columns)
+    print(f"已计算 {M_baryon.size} 个星系 → {args.output}")
+    return 0
+
+
+def cmd_evaluate_npy(args) -> int:
+    from .analysis.out_of_core import evaluate_memmap
+    from .core.qst_calculator import QSTCalculator
+
+    if args.radius is None and args.sigma is None:
+        raise SystemExit("需要 --radius 或 --sigma")
+    backend = _backend(args)
+    stats = evaluate_memmap(QSTCalculator(args.param_set), args.mass, R_disk=args.radius,
+                            sigma=args.sigma, output=args.output, chunk_size=args.chunk_size,
+                            workers=args.workers, dtype=args.dtype, backend=backend)
+    print(f"已计算 {stats['n_rows']} 个星系 ({stats['n_chunks']} 块, "
+          f"{stats['elapsed_s']:.2f} s) → {args.output}/{{{','.join(stats['outputs'])}}}.npy")
+    return 0
+
+
+def cmd_cosmic(args) -> int:
+    from .simulation.cosmic_evolution import CosmicEvolver
+    from .utils.table_io import write_table
+
+    evolver = CosmicEvolver(args.param_set, N_points=args.n_points,
+                            N_range=(args.n_start, 0.0), solver=args.solver,
+                            dtype=args.dtype)
+    results = evolver.evolve(store=_store(args))
+    ok = evolver.check_results(results)
+    if args.output:
+        write_table(args.output, results)
+        print(f"结果已保存到: {args.output}")
+    return 0 if ok else 1
+
+
+def cmd_galaxy(args) -> int:
+    from .analysis.galaxy_analysis import analyze_galaxies, summarize
+    from .core.qst_calculator import QSTCalculator
+    from .utils.table_io import write_table
+
+    table, M_baryon, R_disk, sigma = _read_galaxy_columns(args)
+    v_obs = table.get(args.vobs_col)
+    v_err = table.get(args.verr_col) if args.verr_col else None
+    result = analyze_galaxies(QSTCalculator(args.param_set), M_baryon, R_disk,
+                              sigma=sigma, v_obs=v_obs, v_err=v_err)
+    summary = summarize(result)
+    if args.output:
+        write_table(args.output, result)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_mass(args) -> int:
+    from .analysis.inverse import solve_baryonic_mass
+    from .core.qst_calculator import QSTCalculator
+    from .utils.table_io import read_table, write_table
+
+    table = read_table(args.input)
+    for name in (args.vflat_col, args.radius_col):
+        if name not in table:
+            raise SystemExit(f"输入缺少列 '{name}'，现有列: {', '.join(table)}")
+    M_baryon, info = solve_baryonic_mass(QSTCalculator(args.param_set), table[args.vflat_col],
+                                         table[args.radius_col], full_output=True)
+    columns = dict(table) if args.keep_input else {}
+    columns.update({'M_baryon': M_baryon, 'exact': info['exact']})
+    write_table(args.output, columns)
+    print(f"已反解 {M_baryon.size} 个星系 ({info['iterations']} 次迭代, "
+          f"{int((~info['exact']).sum())} 个落在间断处) → {args.output}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    from .analysis.comparison import compare_models, to_columns
+    from .utils.table_io import write_table
+
+    table, M_baryon, R_disk, sigma = _read_galaxy_columns(args)
+    result = compare_models(M_baryon, R_disk, sigma, versions=args.versions.split(','),
+                            dtype=args.dtype)
+    columns = dict(table) if args.keep_input else {}
+    columns.update(to_columns(result))
+    write_table(args.output, columns)
+    print(f"已对比 {len(result['versions'])} 个版本 × {M_baryon.size} 个星系 → {args.output}")
+    return 0
+
+
+def cmd_emulator(args) -> int:
+    from .simulation.emulator import build_emulator
+
+    meta = build_emulator(args.output, z_max=args.z_max, n_z=args.n_z, tol=args.tol,
+                          max_nodes=args.max_nodes, workers=args.workers)
+    sizes = ' × '.join(f"{name}:{len(nodes)}" for name, nodes in meta['axes'].items())
+    print(f"网格 {sizes} × z:{len(meta['N'])} → {args.output}")
+    print(json.dumps(meta['error_bounds'], indent=2))
+    return 0
+
+
+def cmd_clocks(args) -> int:
+    import numpy as np
+
+    from .core.qst_calculator import QSTCalculator
+    from .simulation.clock_offsets import clock_offset_series
+    from .utils.table_io import write_table
+
+    n = int(round(args.days / args.step)) + 1
+    t = args.start + args.step * np.arange(n)
+    series = clock_offset_series(QSTCalculator(args.param_set), t,
+                                 bodies=args.bodies.split(','), reference=args.reference)
+    columns = {'t': series['t']}
+    for i, body in enumerate(series['bodies']):
+        columns[f'rate:{body}'] = series['rate'][i]
+        if body != args.reference:
+            columns[f'offset:{body}'] = series['offset'][i]
+    write_table(args.output, columns)
+    for i, body in enumerate(series['bodies']):
+        if body != args.reference:
+            print(f"{body} 相对 {args.reference}: 累积钟差 {series['offset'][i, -1]:.6g} μs "
+                  f"({args.days:g} 天)")
+    return 0
+
+
+def cmd_plots(args) -> int:
+    from .analysis.galaxy_analysis import analyze_galaxies
+    from .analysis.plotting import diagnostic_jobs, galaxy_jobs, render_figures
+    from .core.qst_calculator import QSTCalculator
+
+    table, M_baryon, R_disk, sigma = _read_galaxy_columns(args)
+    v_obs = table.get(args.vobs_col)
+    v_err = table.get(args.verr_col) if args.verr_col else None
+    names = table.get(args.name_col) if args.name_col else None
+    calc = QSTCalculator(args.param_set)
+    jobs = galaxy_jobs(calc, M_baryon, R_disk, sigma, names=names, v_obs=v_obs, v_err=v_err)
+    result = analyze_galaxies(calc, M_baryon, R_disk, sigma=sigma, v_obs=v_obs, v_err=v_err)
+    jobs += diagnostic_jobs(calc, result)
+    stats = render_figures(jobs, args.output, formats=args.formats.split(','),
+                           workers=args.workers, force=args.force)
+    print(f"绘制 {stats['rendered']} 张，跳过 {stats['skipped']} 张未变化的图 "
+          f"({stats['elapsed_s']:.2f} s) → {args.output}")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from .service import QSTService
+
+    service = QSTService(args.param_set, max_delay=args.max_delay_ms / 1000.0,
+                         max_batch=args.max_batch)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"QST服务 ({args.param_set}) 监听 {where}", file=sys.stderr)
+    try:
+        service.run(args.host, args.port, unix_path=args.unix)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_report(args) -> int:
+    from .analysis.report import build_report
+
+    text, stats = build_report(args.param_set, cache_dir=args.cache_dir,
+                               catalog=args.catalog, n_points=args.n_points,
+                               force=args.force)
+    print(f"重建章节: {', '.join(stats['built']) or '无'}；"
+          f"缓存命中: {', '.join(stats['cached']) or '无'} ({stats['elapsed_s']:.2f} s)",
+          file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(text)
+        print(f"报告已保存到: {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+def _add_galaxy_columns(parser):
+    parser.add_argument('input', help='输入表格 (.csv/.npy/.npz)')
+    parser.add_argument('--mass-col', default='M_baryon', help='重子质量列 [M_sun]')
+    parser.add_argument('--radius-col', default='R_disk', help='盘半径列 [kpc]')
+    parser.add_argument('--sigma-col', default=None,
+                        help='表面密度列 [10⁹ M_sun/kpc²]；缺省由M/(πR²)计算')
+    parser.add_argument('--param-set', default='sparc_optimized')
+
+
+def _add_dtype(parser):
+    parser.add_argument('--dtype', choices=('float64', 'float32'), default='float64',
+                        help='计算与输出精度；float32 内存减半。星系量相对float64的误差界见 '
+                             'kernels.FLOAT32_ERROR_BOUNDS: σ、V_rot 相对误差 ≤ 1e-6，'
+                             'a_eff/a₀、β_eff 绝对误差 ≤ 1e-6 (a_eff/a₀ 较小时相对误差可达数倍)')
+
+
+def _add_store(parser):
+    parser.add_argument('--store', default=None,
+                        help='结果存储目录 (如 .cache/results)；相同参数与代码的重复运行直接读取')
+
+
+def _add_backend(parser):
+    parser.add_argument('--backend', choices=('numpy', 'numba', 'auto'), default=None,
+                        help='计算后端；numba 为融合的多线程核心函数 (需安装numba)，'
+                             'auto 在不可用时回退到 numpy；缺省取环境变量 QST_BACKEND')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='qst', description='量子时空统一理论计算工具')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('evaluate', help='批量计算星系量')
+    _add_galaxy_columns(p)
+    p.add_argument('-o', '--output', required=True, help='输出表格 (.csv/.npy/.npz)')
+    p.add_argument('--keep-input', action='store_true', help='输出中保留输入列')
+    p.add_argument('--chunk-size', type=int, default=None,
+                   help='按块流式处理 (.csv/.npy)，峰值内存由块大小决定')
+    _add_dtype(p)
+    _add_backend(p)
+    _add_store(p)
+    p.set_defaults(func=cmd_evaluate)
+
+    p = sub.add_parser('evaluate-npy', help='对内存映射的 .npy 数组分块并行计算')
+    p.add_argument('mass', help='重子质量数组 .npy [M_sun]')
+    p.add_argument('--radius', default=None, help='盘半径数组 .npy [kpc]')
+    p.add_argument('--sigma', default=None, help='表面密度数组 .npy [10⁹ M_sun/kpc²]')
+    p.add_argument('--param-set', default='sparc_optimized')
+    p.add_argument('-o', '--output', required=True, help='输出目录 (每个量一个 .npy)')
+    p.add_argument('--chunk-size', type=int, default=1 << 20, help='块长 (元素数)，按页对齐')
+    p.add_argument('--workers', type=int, default=None, help='线程数')
+    _add_dtype(p)
+    _add_backend(p)
+    p.set_defaults(func=cmd_evaluate_npy)
+
+    p = sub.add_parser('cosmic', help='宇宙背景演化模拟')
+    p.add_argument('--param-set', default='effective')
+    p.add_argument('--n-points', type=int, default=10000)
+    p.add_argument('--n-start', type=float, default=-30.0, help='起始 N = ln(a)')
+    p.add_argument('--solver', default='DOP853')
+    _add_dtype(p)
+    _add_store(p)
+    p.add_argument('-o', '--output', default=None, help='输出表格 (.csv/.npy/.npz)')
+    p.set_defaults(func=cmd_cosmic)
+
+    p = sub.add_parser('galaxy', help='星系样本分析')
+    _add_galaxy_columns(p)
+    p.add_argument('--vobs-col', default='v_obs', help='观测速度列 [km/s]')
+    p.add_argument('--verr-col', default=None, help='观测误差列 [km/s]')
+    p.add_argument('-o', '--output', default=None, help='逐星系结果输出')
+    p.set_defaults(func=cmd_galaxy)
+
+    p = sub.add_parser('mass', help='由观测速度反解重子质量')
+    p.add_argument('input', help='输入表格 (.csv/.npy/.npz)')
+    p.add_argument('--vflat-col', default='v_flat', help='平坦速度列 [km/s]')
+    p.add_argument('--radius-col', default='R_disk', help='盘半径列 [kpc]')
+    p.add_argument('--param-set', default='sparc_optimized')
+    p.add_argument('-o', '--output', required=True, help='输出表格 (.csv/.npy/.npz)')
+    p.add_argument('--keep-input', action='store_true', help='输出中保留输入列')
+    p.set_defaults(func=cmd_mass)
+
+    p = sub.add_parser('compare', help='多版本模型对比')
+    p.add_argument('input', help='输入表格 (.csv/.npy/.npz)')
+    p.add_argument('--mass-col', default='M_baryon', help='重子质量列 [M_sun]')
+    p.add_argument('--radius-col', default='R_disk', help='盘半径列 [kpc]')
+    p.add_argument('--sigma-col', default=None,
+                   help='表面密度列 [10⁹ M_sun/kpc²]；缺省由M/(πR²)计算')
+    p.add_argument('--versions', default='v4.1,v4.5,v4.5-compat', help='逗号分隔的版本名')
+    p.add_argument('-o', '--output', required=True, help='输出表格 (.csv/.npy/.npz)')
+    p.add_argument('--keep-input', action='store_true', help='输出中保留输入列')
+    _add_dtype(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser('emulator', help='预计算宇宙背景观测量插值表')
+    p.add_argument('-o', '--output', required=True, help='输出目录')
+    p.add_argument('--z-max', type=float, default=5.0)
+    p.add_argument('--n-z', type=int, default=128, help='红移轴点数')
+    p.add_argument('--tol', type=float, default=1e-4, help='每轴插值目标误差')
+    p.add_argument('--max-nodes', type=int, default=17, help='每轴最多节点数')
+    p.add_argument('--workers', type=int, default=None, help='并行进程数')
+    p.set_defaults(func=cmd_emulator)
+
+    p = sub.add_parser('clocks', help='开普勒轨道上行星钟的时间分辨QST钟差')
+    p.add_argument('--param-set', default='sparc_optimized')
+    p.add_argument('--start', type=float, default=0.0, help='起始时刻 [J2000 起算天数]')
+    p.add_argument('--days', type=float, default=687.0, help='时长 [天]')
+    p.add_argument('--step', type=float, default=1.0 / 24.0, help='采样间隔 [天]')
+    p.add_argument('--bodies', default='earth,mars', help='逗号分隔的天体名')
+    p.add_argument('--reference', default='earth', help='参考钟所在天体')
+    p.add_argument('-o', '--output', required=True, help='输出表格 (.csv/.npy/.npz)')
+    p.set_defaults(func=cmd_clocks)
+
+    p = sub.add_parser('plots', help='批量并行绘制旋转曲线与诊断图')
+    _add_galaxy_columns(p)
+    p.add_argument('--vobs-col', default='v_obs', help='观测速度列 [km/s]；缺失时只画模型')
+    p.add_argument('--verr-col', default=None, help='观测误差列 [km/s]')
+    p.add_argument('--name-col', default=None, help='星系名列 (CSV中可为字符串)，用作文件名')
+    p.add_argument('-o', '--output', required=True, help='输出目录')
+    p.add_argument('--formats', default='png', help='逗号分隔的输出格式，例如 png,pdf')
+    p.add_argument('--workers', type=int, default=None, help='并行进程数')
+    p.add_argument('--force', action='store_true', help='忽略清单，全部重绘')
+    p.set_defaults(func=cmd_plots)
+
+    p = sub.add_parser('serve', help='本地微批处理HTTP/JSON计算服务')
+    p.add_argument('--param-set', default='sparc_optimized')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--unix', default=None, help='Unix套接字路径 (给出时不监听TCP)')
+    p.add_argument('--max-delay-ms', type=float, default=2.0, help='合批最长等待 [ms]')
+    p.add_argument('--max-batch', type=int, default=4096, help='每批最多点数')
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('report', help='生成预言汇总报告')
+    p.add_argument('--param-set', default='sparc_optimized')
+    p.add_argument('-o', '--output', default=None, help='输出Markdown文件')
+    p.add_argument('--catalog', default=None, help='观测星系表 (M_baryon, R_disk, v_obs)')
+    p.add_argument('--cache-dir', default='.cache/report', help='章节缓存目录')
+    p.add_argument('--n-points', type=int, default=2000, help='宇宙演化输出点数')
+    p.add_argument('--force', action='store_true', help='忽略缓存，全部重建')
+    p.set_defaults(func=cmd_report)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
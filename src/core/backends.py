@@ -0,0 +1,67 @@
+"""
+量子时空统一理论 - 计算后端选择
+
+    numpy  参考实现 (kernels)，始终可用
+    numba  每个核心函数融合为单个循环 (无中间数组)，并用 prange 在多核上并行；
+           仅当 numba 可导入时可用，线程数由 NUMBA_NUM_THREADS 控制
+    auto   numba 可用时选 numba，否则回退到 numpy
+
+缺省后端取环境变量 QST_BACKEND (默认 numpy)，可用 set_backend 修改；
+各批量接口的 backend 参数优先。numba 后端与 numpy 参考结果的差别在
+kernels.FLOAT32_ERROR_BOUNDS 量级以内 (float64 下为舍入误差)。
+
+本模块不导入NumPy或numba。
+"""
+
+import importlib.util
+import os
+from typing import Optional, Tuple
+
+
+BACKENDS = ('numpy', 'numba')
+CHOICES = BACKENDS + ('auto',)
+
+_default = os.environ.get('QST_BACKEND', 'numpy')
+
+
+def numba_available() -> bool:
+    """numba 是否可导入 (不实际导入)"""
+    return importlib.util.find_spec('numba') is not None
+
+
+def available_backends() -> Tuple[str, ...]:
+    """当前环境可用的后端"""
+    return BACKENDS if numba_available() else ('numpy',)
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    解析后端名
+
+    参数:
+        name: 'numpy'、'numba'、'auto' 或 None (使用缺省后端)
+
+    返回:
+        'numpy' 或 'numba'
+    """
+    name = name or _default
+    if name not in CHOICES:
+        raise ValueError(f"未知后端: {name} (可选: {', '.join(CHOICES)})")
+    if name == 'auto':
+        return 'numba' if numba_available() else 'numpy'
+    if name == 'numba' and not numba_available():
+        raise ValueError("numba 后端不可用: 未安装 numba (可改用 'auto' 自动回退到 numpy)")
+    return name
+
+
+def set_backend(name: str) -> str:
+    """设置缺省后端，返回之前的设置"""
+    global _default
+    resolve_backend(name)
+    previous, _default = _default, name
+    return previous
+
+
+def get_backend() -> str:
+    """缺省后端的设置值 (可能为 'auto')"""
+    return _default
@@ -0,0 +1,175 @@
+"""
+量子时空统一理论 - 计算器方法调用计数与计时 (可选启用)
+
+默认关闭；关闭时被装饰的方法只多一次布尔判断，可在长期运行的服务中常驻。
+"""
+
+import random
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+
+# 每个方法的延迟蓄水池容量 (Algorithm R 均匀抽样，用于全程分位数估计)
+RESERVOIR_SIZE = 4096
+PERCENTILES = (50.0, 90.0, 99.0)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """线性插值分位数 (sorted_values须已排序且非空)"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    frac = pos - lo
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac
+
+
+def _batch_size(args: tuple) -> int:
+    """由第一个位置参数推断批量大小：数组取size，序列取len，标量为1"""
+    if not args:
+        return 1
+    first = args[0]
+    size = getattr(first, 'size', None)
+    if isinstance(size, int):
+        return size
+    if isinstance(first, (list, tuple)):
+        return len(first)
+    return 1
+
+
+class MethodStats:
+    """单个方法的累计统计"""
+
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE):
+        self.count = 0
+        self.total_time = 0.0
+        self.min_time = float('inf')
+        self.max_time = 0.0
+        self.batch_total = 0
+        self.batch_max = 0
+        self.reservoir_size = reservoir_size
+        self.samples: List[float] = []
+        self._rng = random.Random()
+
+    def record(self, elapsed: float, batch: int):
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed < self.min_time:
+            self.min_time = elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.batch_total += batch
+        if batch > self.batch_max:
+            self.batch_max = batch
+        # Algorithm R: 第 n 次调用以 k/n 的概率替换蓄水池中的随机一项，
+        # 蓄水池始终是全部调用的均匀样本
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(elapsed)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < self.reservoir_size:
+                self.samples[j] = elapsed
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+        result = {
+            'count': self.count,
+            'total_s': self.total_time,
+            'mean_s': self.total_time / self.count if self.count else 0.0,
+            'min_s': self.min_time if self.count else 0.0,
+            'max_s': self.max_time,
+            'batch_total': self.batch_total,
+            'batch_mean': self.batch_total / self.count if self.count else 0.0,
+            'batch_max': self.batch_max,
+        }
+        for q in PERCENTILES:
+            result[f'p{q:g}_s'] = _percentile(ordered, q) if ordered else 0.0
+        return result
+
+
+class Instrumentation:
+    """方法级调用计数器与计时器"""
+
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE):
+        self.enabled = False
+        self.reservoir_size = reservoir_size
+        self._stats: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def record(self, name: str, elapsed: float, batch: int = 1):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = MethodStats(self.reservoir_size)
+            stats.record(elapsed, batch)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """导出当前统计为字典 {方法名: 统计}"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """导出当前统计为JSON字符串"""
+        import json
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+
+# 全局实例，所有计算器共用
+INSTRUMENTATION = Instrumentation()
+
+
+def instrumented(func: Callable) -> Callable:
+    """装饰计算器方法；统计键为 模块名.类名.方法名"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+    state = INSTRUMENTATION
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not state.enabled:
+            return func(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            state.record(name, time.perf_counter() - start, _batch_size(args))
+
+    wrapper.__instrumented_name__ = name
+    return wrapper
+
+
+def enable_instrumentation():
+    """启用全局计数与计时"""
+    INSTRUMENTATION.enable()
+
+
+def disable_instrumentation():
+    """关闭全局计数与计时 (已收集的数据保留)"""
+    INSTRUMENTATION.disable()
+
+
+def reset_instrumentation():
+    """清空已收集的数据"""
+    INSTRUMENTATION.reset()
+
+
+def instrumentation_snapshot() -> Dict[str, Dict]:
+    """导出统计字典"""
+    return INSTRUMENTATION.snapshot()
+
+
+def instrumentation_json(indent: Optional[int] = 2) -> str:
+    """导出统计JSON"""
+    return INSTRUMENTATION.to_json(indent)
@@ -0,0 +1,212 @@
+"""
+量子时空统一理论 - 向量化计算核心
+
+与 QSTCalculator 的标量公式逐点一致，输入可为任意形状的数组。
+本模块导入NumPy，计算器仅在调用批量接口时才导入它。
+
+精度策略: 各核心函数接受 dtype ('float64' 默认, 或 'float32')，整个计算链在该精度下进行，
+内存与带宽减半。物理常数组合成的标量系数始终以float64预先算好，
+因此float32下不会出现 M[kg] ~ 1e41 之类的上溢。相对float64的误差界见 FLOAT32_ERROR_BOUNDS；
+恰好落在分段边界 float32 舍入距离 (相对 ~6e-8) 内的输入可能被归入相邻区间，不在此界内。
+"""
+
+import numpy as np
+
+from .physics_constants import QSTConstants
+
+
+# β_eff(M) 分段函数的区间边界 x = M/M_th 与各区间的 f 值
+# 常数段: [0, 0.001) → 0.001, [0.001, 0.01) → 0.01, [0.01, 0.1) → 0.1,
+#         [0.1, 0.5) → 0.5, [0.5, 0.8) → 0.7, [2.0, ∞) → 0.9
+# 线性段: [0.8, 1.0) 0.7→0.8, [1.0, 2.0) 0.8→0.9
+BETA_STEP_EDGES = np.array([0.001, 0.01, 0.1, 0.5, 0.8])
+BETA_STEP_VALUES = np.array([0.001, 0.01, 0.1, 0.5, 0.7])
+
+# 兼容版 a_eff/a₀(σ) 的分段线性节点 (QSTCalculator 非sparc参数集)
+COMPAT_SIGMA_KNOTS = np.array([0.001, 0.01, 0.1, 0.3, 0.5, 1.0, 5.0, 10.0, 50.0])
+COMPAT_RATIO_KNOTS = np.array([0.0005, 0.001, 0.002, 0.005, 0.01, 0.05, 0.5, 0.8, 1.0])
+
+DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+# float32 结果相对float64的误差界: (相对误差, 绝对误差)
+FLOAT32_ERROR_BOUNDS = {
+    'sigma': (1e-6, 0.0),
+    'a_ratio': (0.0, 1e-6),
+    'beta_eff': (0.0, 1e-6),
+    'v_rot': (1e-6, 0.0),
+}
+
+
+def resolve_dtype(dtype=None):
+    """
+    解析精度设置
+
+    参数:
+        dtype: None、'float64'/'float32' 或对应的NumPy类型
+
+    返回:
+        np.float64 或 np.float32
+    """
+    if dtype is None:
+        return np.float64
+    name = np.dtype(dtype).name if not isinstance(dtype, str) else dtype
+    if name not in DTYPES:
+        raise ValueError(f"不支持的精度: {dtype} (支持 {', '.join(DTYPES)})")
+    return DTYPES[name]
+
+
+def beta_scale_factor(x, zero_below: float = 0.0, dtype=None):
+    """
+    计算 β_eff/β₀ = f(x)
+
+    参数:
+        x: 质量比 M/M_th (数组)
+        zero_below: x 低于此值时 f=0 (v4.1的 x<1e-6 区间)；0表示不启用
+        dtype: 计算精度
+
+    返回:
+        f(x)，与x同形状
+    """
+    dtype = resolve_dtype(dtype)
+    x = np.asarray(x, dtype=dtype)
+    values = BETA_STEP_VALUES.astype(dtype)
+    idx = np.searchsorted(BETA_STEP_EDGES.astype(dtype), x, side='right')
+    f = np.where(idx < len(values), values[np.minimum(idx, len(values) - 1)], dtype(0.9))
+    f = np.where((x >= 0.8) & (x < 1.0), 0.7 + 0.1 * (x - 0.8) / 0.2, f)
+    f = np.where((x >= 1.0) & (x < 2.0), 0.8 + 0.1 * (x - 1.0) / 1.0, f)
+    if zero_below > 0.0:
+        f = np.where(x < zero_below, dtype(0.0), f)
+    return f.astype(dtype, copy=False)
+
+
+def beta_effective(M, beta0: float, M_th: float, zero_below: float = 0.0,
+                   dtype=None, mass_unit: float = 1.0):
+    """β_eff(M) = β₀ f(M/M_th)；M以mass_unit [kg]为单位 (默认kg)；β₀、M_th 可为可广播数组"""
+    dtype = resolve_dtype(dtype)
+    scale = np.asarray(mass_unit / np.asarray(M_th, dtype=float), dtype=dtype)
+    x = np.asarray(M, dtype=dtype) * scale
+    return np.asarray(beta0, dtype=dtype) * beta_scale_factor(x, zero_below, dtype)
+
+
+def a0_ratio_sparc(sigma, A_low: float, sigma_crit: float,
+                   sigma_transition: float, alpha: float = 1.0, dtype=None):
+    """
+    v4.5 a_eff/a₀(σ)：σ<σ_crit 为A_low，过渡区按 frac^α 插值，之后为1
+
+    参数:
+        sigma: 表面密度 [10⁹ M_sun/kpc²] (数组)
+        dtype: 计算精度
+        其余参数为标量或可与 sigma 广播的数组 (逐样本参数)
+    """
+    dtype = resolve_dtype(dtype)
+    sigma = np.asarray(sigma, dtype=dtype)
+    A_low, sigma_crit, sigma_transition = (np.asarray(v, dtype=dtype)
+                                           for v in (A_low, sigma_crit, sigma_transition))
+    frac = np.clip((sigma - sigma_crit) / (sigma_transition - sigma_crit), 0.0, 1.0)
+    if np.any(np.asarray(alpha) != 1.0):
+        frac = frac ** np.asarray(alpha, dtype=dtype)
+    ratio = A_low + (1.0 - A_low) * frac
+    return np.where(sigma < sigma_crit, A_low,
+                    np.where(sigma < sigma_transition, ratio, dtype(1.0))).astype(dtype, copy=False)
+
+
+def a0_ratio_compatible(sigma, dtype=None):
+    """兼容版 a_eff/a₀(σ)，节点间线性插值，两端取常数"""
+    dtype = resolve_dtype(dtype)
+    ratio = np.interp(np.asarray(sigma, dtype=dtype), COMPAT_SIGMA_KNOTS, COMPAT_RATIO_KNOTS)
+    return ratio.astype(dtype, copy=False)
+
+
+def surface_density(M_baryon, R_disk, scale: float, dtype=None):
+    """
+    平均表面密度 σ = M/(πR²)
+
+    参数:
+        M_baryon: 重子质量 [M_sun]
+        R_disk: 盘半径 [kpc]
+        scale: PhysicalConstants.SURFACE_DENSITY_SCALE (含 1/π 与单位换算)
+        dtype: 计算精度
+
+    返回:
+        σ [10⁹ M_sun/kpc²]
+    """
+    dtype = resolve_dtype(dtype)
+    M_baryon = np.asarray(M_baryon, dtype=dtype)
+    R_disk = np.asarray(R_disk, dtype=dtype)
+    return M_baryon / R_disk**2 * dtype(scale)
+
+
+def rotation_velocity(M_baryon, a_ratio, beta_eff, a0_standard: float, v4_coeff: float,
+                      dtype=None):
+    """
+    V⁴ = 2 G M a₀ (a_eff/a₀) (1+β_eff)，M单位 [M_sun]，返回 km/s
+
+    参数:
+        a0_standard: a₀ [m/s²]，可为数组
+        v4_coeff: PhysicalConstants.V4_COEFF (2 G M_sun / (1000 m/s)⁴)
+    """
+    dtype = resolve_dtype(dtype)
+    coeff = np.asarray(v4_coeff * np.asarray(a0_standard, dtype=float), dtype=dtype)
+    v4 = coeff * np.asarray(M_baryon, dtype=dtype) * a_ratio * (1.0 + beta_eff)
+    return np.sqrt(np.sqrt(v4)).astype(dtype, copy=False)
+
+
+def dark_energy_density(phi_plus, phi_minus, omega, m_phi, m_omega, mu, V_const):
+    """Ω_DE = V/ρ_crit (ρ_crit = 3)，与 QSTCalculator.dark_energy_density 相同；参数可为数组"""
+    V_phi = 0.5 * m_phi**2 * (phi_plus**2 + phi_minus**2)
+    V_mix = -mu**2 * phi_plus * phi_minus
+    V_omega = 0.5 * m_omega**2 * omega**2
+    return (V_phi + V_mix + V_omega + V_const) / 3.0
+
+
+# 平均轨道上的太阳势差及 β₀ → μs/天 的换算 (QSTCalculator.mars_time_delay)
+MARS_DELTA_PHI = QSTConstants.MARS_DELTA_PHI
+MARS_DELAY_SCALE = QSTConstants.MARS_DELAY_SCALE
+
+
+def mars_time_delay(beta0):
+    """火星钟速率差 β₀ Δφ [μs/天]；β₀ 可为数组"""
+    return np.asarray(beta0, dtype=float) * MARS_DELAY_SCALE
+
+
+# ==================== 参数梯度 ====================
+# f(x) 与 a_eff/a₀(σ) 的分段常数部分对参数的导数为0；
+# 区间边界处函数不连续，导数取右侧区间的值 (边界上的δ函数不计)。
+
+def beta_scale_factor_derivative(x, dtype=None):
+    """df/dx：[0.8, 1.0) 上为 0.5，[1.0, 2.0) 上为 0.1，其余为0"""
+    dtype = resolve_dtype(dtype)
+    x = np.asarray(x, dtype=dtype)
+    slope = np.where((x >= 0.8) & (x < 1.0), dtype(0.5), dtype(0.0))
+    return np.where((x >= 1.0) & (x < 2.0), dtype(0.1), slope).astype(dtype, copy=False)
+
+
+def a0_ratio_sparc_gradient(sigma, A_low: float, sigma_crit: float,
+                            sigma_transition: float, alpha: float = 1.0, dtype=None):
+    """
+    a_eff/a₀(σ) 对 (A_low, sigma_crit, sigma_transition, alpha) 的偏导数
+
+    过渡区 r = A_low + (1−A_low)·frac^α，frac = (σ−σ_crit)/(σ_transition−σ_crit)；
+    σ<σ_crit 时 r = A_low，σ≥σ_transition 时 r = 1。
+
+    返回:
+        {参数名: ∂r/∂θ 数组}
+    """
+    dtype = resolve_dtype(dtype)
+    sigma = np.asarray(sigma, dtype=dtype)
+    width = dtype(sigma_transition - sigma_crit)
+    inside = (sigma >= sigma_crit) & (sigma < sigma_transition)
+    frac = np.where(inside, (sigma - dtype(sigma_crit)) / width, dtype(0.0))
+    g = frac ** dtype(alpha)
+    # dg/dfrac = α frac^(α−1)；frac=0 处取 α=1 时的极限1，α>1时为0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dg = np.where(frac > 0, dtype(alpha) * g / frac, dtype(1.0 if alpha == 1.0 else 0.0))
+        log_frac = np.where(frac > 0, np.log(frac), dtype(0.0))
+    scale = dtype(1.0 - A_low) * dg
+    zero = np.zeros_like(sigma)
+    return {
+        'A_low': np.where(sigma < sigma_crit, dtype(1.0), np.where(inside, 1.0 - g, zero)),
+        'sigma_crit': np.where(inside, scale * (frac - 1.0) / width, zero),
+        'sigma_transition': np.where(inside, -scale * frac / width, zero),
+        'alpha': np.where(inside, dtype(1.0 - A_low) * g * log_frac, zero),
+    }
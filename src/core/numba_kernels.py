@@ -0,0 +1,174 @@
+"""
+量子时空统一理论 - numba 融合核心函数
+
+与 kernels 中的NumPy参考实现逐点对应。NumPy 版本的分段函数每次调用要生成
+searchsorted 下标、多个 np.where 结果等中间数组；这里每个元素只读一次输入、
+写一次输出，全部分支在寄存器中完成，外层循环用 prange 在多核上并行。
+
+元素内部以float64计算，输出按 dtype 存储；系数取 PhysicalConstants 的导出量，与 kernels 相同。
+仅在 backends.resolve_backend 返回 'numba' 时由计算器导入。
+"""
+
+import numba
+import numpy as np
+
+from . import kernels
+
+
+@numba.njit(inline='always')
+def _scale_factor(x, zero_below):
+    if zero_below > 0.0 and x < zero_below:
+        return 0.0
+    if x < 0.001:
+        return 0.001
+    if x < 0.01:
+        return 0.01
+    if x < 0.1:
+        return 0.1
+    if x < 0.5:
+        return 0.5
+    if x < 0.8:
+        return 0.7
+    if x < 1.0:
+        return 0.7 + 0.1 * (x - 0.8) / 0.2
+    if x < 2.0:
+        return 0.8 + 0.1 * (x - 1.0) / 1.0
+    return 0.9
+
+
+@numba.njit(inline='always')
+def _ratio_sparc(sigma, A_low, sigma_crit, sigma_transition, alpha):
+    if sigma < sigma_crit:
+        return A_low
+    if sigma < sigma_transition:
+        frac = (sigma - sigma_crit) / (sigma_transition - sigma_crit)
+        if alpha != 1.0:
+            frac = frac ** alpha
+        return A_low + (1.0 - A_low) * frac
+    return 1.0
+
+
+@numba.njit(inline='always')
+def _ratio_compatible(sigma, knots, values):
+    n = knots.size
+    if sigma <= knots[0]:
+        return values[0]
+    if sigma >= knots[n - 1]:
+        return values[n - 1]
+    i = 1
+    while knots[i] < sigma:
+        i += 1
+    t = (sigma - knots[i - 1]) / (knots[i] - knots[i - 1])
+    return values[i - 1] + t * (values[i] - values[i - 1])
+
+
+@numba.njit(parallel=True, cache=True)
+def _beta_loop(M, scale, beta0, zero_below, out):
+    for i in numba.prange(M.size):
+        out[i] = beta0 * _scale_factor(M[i] * scale, zero_below)
+
+
+@numba.njit(parallel=True, cache=True)
+def _ratio_sparc_loop(sigma, A_low, sigma_crit, sigma_transition, alpha, out):
+    for i in numba.prange(sigma.size):
+        out[i] = _ratio_sparc(sigma[i], A_low, sigma_crit, sigma_transition, alpha)
+
+
+@numba.njit(parallel=True, cache=True)
+def _ratio_compatible_loop(sigma, knots, values, out):
+    for i in numba.prange(sigma.size):
+        out[i] = _ratio_compatible(sigma[i], knots, values)
+
+
+@numba.njit(parallel=True, cache=True)
+def _galaxy_loop(M, R, sigma_in, has_sigma, sigma_scale, sparc, A_low, sigma_crit,
+                 sigma_transition, alpha, knots, values, mass_scale, beta0, coeff,
+                 sigma_out, ratio_out, beta_out, v_out):
+    for i in numba.prange(M.size):
+        m = M[i]
+        if has_sigma:
+            s = sigma_in[i]
+        else:
+            s = m / (R[i] * R[i]) * sigma_scale
+        if sparc:
+            ratio = _ratio_sparc(s, A_low, sigma_crit, sigma_transition, alpha)
+        else:
+            ratio = _ratio_compatible(s, knots, values)
+        beta = beta0 * _scale_factor(m * mass_scale, 0.0)
+        sigma_out[i] = s
+        ratio_out[i] = ratio
+        beta_out[i] = beta
+        v_out[i] = np.sqrt(np.sqrt(coeff * m * ratio * (1.0 + beta)))
+
+
+def _flat(x, dtype, shape=None):
+    x = np.asarray(x, dtype=dtype)
+    if shape is not None:
+        x = np.broadcast_to(x, shape)
+    return np.ascontiguousarray(x).reshape(-1)
+
+
+def beta_effective(M, beta0: float, M_th: float, zero_below: float = 0.0,
+                   dtype=None, mass_unit: float = 1.0):
+    """kernels.beta_effective 的融合版本 (参数为标量)"""
+    dtype = kernels.resolve_dtype(dtype)
+    M = np.asarray(M, dtype=dtype)
+    out = np.empty(M.shape, dtype=dtype)
+    _beta_loop(_flat(M, dtype), float(mass_unit / M_th), float(beta0), float(zero_below),
+               out.reshape(-1))
+    return out
+
+
+def a0_ratio_sparc(sigma, A_low: float, sigma_crit: float, sigma_transition: float,
+                   alpha: float = 1.0, dtype=None):
+    """kernels.a0_ratio_sparc 的融合版本 (参数为标量)"""
+    dtype = kernels.resolve_dtype(dtype)
+    sigma = np.asarray(sigma, dtype=dtype)
+    out = np.empty(sigma.shape, dtype=dtype)
+    _ratio_sparc_loop(_flat(sigma, dtype), float(A_low), float(sigma_crit),
+                      float(sigma_transition), float(alpha), out.reshape(-1))
+    return out
+
+
+def a0_ratio_compatible(sigma, dtype=None):
+    """kernels.a0_ratio_compatible 的融合版本"""
+    dtype = kernels.resolve_dtype(dtype)
+    sigma = np.asarray(sigma, dtype=dtype)
+    out = np.empty(sigma.shape, dtype=dtype)
+    _ratio_compatible_loop(_flat(sigma, dtype), kernels.COMPAT_SIGMA_KNOTS,
+                           kernels.COMPAT_RATIO_KNOTS, out.reshape(-1))
+    return out
+
+
+def evaluate_galaxies(M_baryon, R_disk, sigma, params, constants, sparc: bool, dtype=None):
+    """
+    σ、a_eff/a₀、β_eff 与 V_rot 在同一循环中计算
+
+    参数:
+        M_baryon: 重子质量 [M_sun]
+        R_disk: 盘半径 [kpc] (给出 sigma 时不使用)
+        sigma: 表面密度 [10⁹ M_sun/kpc²] 或 None
+        params: 计算器参数字典
+        constants: PhysicalConstants
+        sparc: True 用 v4.5 的 a_eff/a₀，False 用兼容版
+
+    返回:
+        {'sigma', 'a_ratio', 'beta_eff', 'v_rot'}，与 evaluate_galaxies_batch 相同
+    """
+    dtype = kernels.resolve_dtype(dtype)
+    M = np.asarray(M_baryon, dtype=dtype)
+    shape = M.shape
+    has_sigma = sigma is not None
+    # 未使用的输入只传长度1的占位数组，循环中对应分支不会读取
+    unused = np.zeros(1, dtype=dtype)
+    sigma_in = _flat(sigma, dtype, shape) if has_sigma else unused
+    R = unused if has_sigma else _flat(R_disk, dtype, shape)
+    coeff = constants.V4_COEFF * params.get('a0_standard', 1.2e-10)
+    out = {name: np.empty(shape, dtype=dtype) for name in ('sigma', 'a_ratio', 'beta_eff', 'v_rot')}
+    _galaxy_loop(_flat(M, dtype), R, sigma_in, has_sigma, constants.SURFACE_DENSITY_SCALE, sparc,
+                 float(params.get('A_low', 0.0)), float(params.get('sigma_crit', 0.0)),
+                 float(params.get('sigma_transition', 1.0)), float(params.get('alpha', 1.0)),
+                 kernels.COMPAT_SIGMA_KNOTS, kernels.COMPAT_RATIO_KNOTS,
+                 float(constants.M_SUN / params['M_th']), float(params['beta0']), coeff,
+                 *(out[name].reshape(-1) for name in ('sigma', 'a_ratio', 'beta_eff', 'v_rot')))
+    return out
@@ -1,17 +1,49 @@
 """
 量子时空统一理论 - 物理常数定义
 v4.5版本 - 基于SPARC优化
+
+常数集:
+    iau2015  CODATA 2018 / IAU 2015 (默认，即 PhysicalConstants 的类属性)
+    legacy   早期 v4.5 脚本使用的取整值 (M_SUN = 1.989e30 kg, KPC = 3.086e19 m)，
+             仅用于复现旧结果
+
+各常数集的导出量 (GM_SUN、σ 单位换算系数等) 在导入时算好，
+计算中只取用，不再组合常数。单位换算见 units。
 """
 
+import math
+from typing import Dict
+
+
+DEFAULT_CONSTANT_SET = 'iau2015'
+
+
+def _derived(G: float, C: float, M_SUN: float, KPC: float, **_) -> Dict[str, float]:
+    """由基本常数算出的换算系数"""
+    sigma_unit = 1e9 * M_SUN / KPC**2
+    return {
+        'GM_SUN': G * M_SUN,                          # [m³/s²]
+        'G_OVER_C2': G / C**2,                        # [m/kg]
+        'GM_SUN_OVER_KPC': G * M_SUN / KPC,           # [m²/s²]，M [M_sun] / R [kpc] → v²
+        'SIGMA_UNIT': sigma_unit,                     # 10⁹ M_sun/kpc² [kg/m²]
+        # M [M_sun] / R² [kpc²] → 平均表面密度 M/(πR²) [10⁹ M_sun/kpc²]
+        'SURFACE_DENSITY_SCALE': (M_SUN / KPC**2) / sigma_unit / math.pi,
+        # 2πGΣ，Σ 以 10⁹ M_sun/kpc² 计 → [m/s²]
+        'DISK_ACCEL_SCALE': 2.0 * math.pi * G * sigma_unit,
+        # V⁴ = V4_COEFF · a [m/s²] · M [M_sun] · (a_eff/a₀)(1+β)，V 以 km/s 计
+        'V4_COEFF': 2.0 * G * M_SUN / 1e12,
+    }
+
+
 class PhysicalConstants:
-    """物理常数"""
-    
+    """物理常数；类属性为默认常数集，实例可选择常数集"""
+
     # 基本常数
     C = 299792458.0                    # 光速 [m/s]
     G = 6.67430e-11                    # 引力常数 [m³/kg/s²]
     H0 = 2.27e-18                      # 哈勃常数 [Hz]
     H0_km_s_Mpc = 67.36                # 哈勃常数 [km/s/Mpc]
-    
+
     # 天文单位
     M_SUN = 1.98847e30                 # 太阳质量 [kg]
     M_EARTH = 5.9722e24                # 地球质量 [kg]
@@ -20,27 +52,67 @@ class PhysicalConstants:
     KPC = 3.085677581e19               # 千秒差距 [m]
     MPC = 3.085677581e22               # 百万秒差距 [m]
     LY = 9.461e15                      # 光年 [m]
-    
+
     # 时间单位
+    DAY = 86400.0                      # 日 [秒]
     YEAR = 31556926.0                  # 年 [秒]
-    
+
     # 其他常数
     M_PL = 2.176434e-8                 # 普朗克质量 [kg]
     M_PL_EV = 2.176434e17              # 普朗克质量 [eV]
 
+    name = DEFAULT_CONSTANT_SET
+
+    def __init__(self, name: str = DEFAULT_CONSTANT_SET):
+        """
+        参数:
+            name: 常数集 (见 CONSTANT_SETS)
+        """
+        if name not in CONSTANT_SETS:
+            raise ValueError(f"未知常数集: {name} (可选: {', '.join(CONSTANT_SETS)})")
+        if name != DEFAULT_CONSTANT_SET:
+            self.name = name
+            self.__dict__.update(CONSTANT_SETS[name])
+            self.__dict__.update(DERIVED_CONSTANTS[name])
+
+
+_DEFAULT_VALUES = {key: value for key, value in vars(PhysicalConstants).items()
+                   if key[0].isupper()}
+
+# 常数集名 -> 基本常数
+CONSTANT_SETS: Dict[str, Dict[str, float]] = {
+    'iau2015': _DEFAULT_VALUES,
+    'legacy': {**_DEFAULT_VALUES, 'M_SUN': 1.989e30, 'KPC': 3.086e19, 'MPC': 3.086e22},
+}
+
+# 常数集名 -> 导出量 (导入时算好)
+DERIVED_CONSTANTS: Dict[str, Dict[str, float]] = {
+    name: _derived(**values) for name, values in CONSTANT_SETS.items()
+}
+
+for _key, _value in DERIVED_CONSTANTS[DEFAULT_CONSTANT_SET].items():
+    setattr(PhysicalConstants, _key, _value)
+
+
+def get_constants(constants=None) -> PhysicalConstants:
+    """None、常数集名或 PhysicalConstants → PhysicalConstants"""
+    if isinstance(constants, PhysicalConstants):
+        return constants
+    return PhysicalConstants(constants or DEFAULT_CONSTANT_SET)
+
 
 class QSTConstants:
     """量子时空统一理论常数 v4.5"""
-    
+
     # 场值 (归一化)
     PHI_PLUS = 1.621
     PHI_MINUS = 1.459
     OMEGA = 1.297
-    
+
     # 基本常数
     MU = 0.00306
     V_CONST = 2.0527
-    
+
     # v4.5优化参数 (SPARC优化报告)
     BETA0 = 0.800                      # 第五力耦合常数 (优化值)
     M_TH = 1.0e22                      # 质量阈值 [kg]
@@ -48,14 +120,18 @@ class QSTConstants:
     SIGMA_CRIT = 0.4                   # 临界表面密度 [10^9 M_sun/kpc²]
     SIGMA_TRANSITION = 2.5             # 过渡表面密度 [10^9 M_sun/kpc²]
     ALPHA = 1.0                        # 幂律指数 (线性过渡)
-    
+
     # 第五力参数
     LAMBDA_5TH = 915.0                 # 第五力力程 [AU]
     M_OMEGA_5TH = 1.44e-21             # 第五力质量 [eV]
-    
+
+    # 火星钟 (平均轨道上的常数近似)
+    MARS_DELTA_PHI = 3.386e-9          # 平均轨道上的太阳势差
+    MARS_DELAY_SCALE = MARS_DELTA_PHI * 86400.0 * 1e6   # β₀ → 钟速率差 [μs/天]
+
     # 宇宙学参数
     M_PHI_EFF = 0.08                   # m_Φ,eff/H₀
     M_OMEGA_EFF = 0.06                 # m_Ω,eff/H₀
-    
+
     # 标准加速度
     A0_STANDARD = 1.2e-10              # m/s²
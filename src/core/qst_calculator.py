@@ -2,21 +2,47 @@
 量子时空统一理论 - 核心计算器 v4.5 (最终正确版)
 """
 
-import numpy as np
 from typing import Dict, Tuple, Optional
-from .physics_constants import PhysicalConstants, QSTConstants
+from .physics_constants import QSTConstants, get_constants
+from .instrumentation import instrumented
+from .backends import resolve_backend as _resolve_backend
+
+
+def _kernel_module(backend=None):
+    """按后端返回批量核心函数模块 (首次调用时导入NumPy/numba)"""
+    if _resolve_backend(backend) == 'numba':
+        from . import numba_kernels
+        return numba_kernels
+    from . import kernels
+    return kernels
 
 
 class QSTCalculator:
     """量子时空统一理论计算器 v4.5"""
     
-    def __init__(self, param_set: str = 'sparc_optimized'):
+    def __init__(self, param_set: str = 'sparc_optimized', overrides: Optional[Dict] = None,
+                 constants=None):
+        """
+        参数:
+            param_set: 参数集 ('sparc_optimized'、'local'、'effective'、'bare')
+            overrides: 参数覆盖
+            constants: 常数集名 ('iau2015' 默认、'legacy') 或 PhysicalConstants
+        """
         self.param_set = param_set
-        self.constants = PhysicalConstants()
+        self.constants = get_constants(constants)
         self.qst_constants = QSTConstants()
         self._setup_parameters()
+        if overrides:
+            self._apply_overrides(overrides)
         self._cache = {}
     
+    def _apply_overrides(self, overrides: Dict):
+        """覆盖参数集中已有的参数 (用于配置文件与参数扫描)"""
+        unknown = [key for key in overrides if key not in self.params]
+        if unknown:
+            raise ValueError(f"参数集 {self.param_set} 中不存在参数: {unknown}")
+        self.params.update(overrides)
+    
     def _setup_parameters(self):
         """设置参数"""
         if self.param_set == 'sparc_optimized':
@@ -73,6 +99,7 @@ class QSTCalculator:
         else:
             raise ValueError(f"未知参数集: {self.param_set}")
     
+    @instrumented
     def beta_effective(self, M: float) -> float:
         """计算尺度依赖的耦合常数 β_eff(M) - 完全正确版"""
         if self.param_set not in ['local', 'sparc_optimized']:
@@ -108,6 +135,7 @@ class QSTCalculator:
         return beta_eff
     
     # 保持其他函数不变...
+    @instrumented
     def dark_energy_density(self) -> float:
         if self.param_set not in ['effective', 'sparc_optimized']:
             raise ValueError("此计算需要有效参数集")
@@ -130,30 +158,27 @@ class QSTCalculator:
         
         return Omega_DE
     
+    @instrumented
     def mars_time_delay(self) -> float:
+        """火星钟相对地球钟的速率差 [μs/天] (平均轨道上的常数近似；逐时刻序列见 simulation.clock_offsets)"""
         if self.param_set not in ['local', 'sparc_optimized']:
             raise ValueError("此计算需要局部参数集")
         
-        beta0 = self.params['beta0']
-        delta_phi_grav = 3.386e-9
-        delta_tau_tau = beta0 * delta_phi_grav
-        seconds_per_day = 86400.0
-        microseconds_per_second = 1e6
-        delta_tau_per_day = delta_tau_tau * seconds_per_day * microseconds_per_second
-        
-        return delta_tau_per_day
+        return self.params['beta0'] * self.qst_constants.MARS_DELAY_SCALE
     
+    @instrumented
     def effective_a0_ratio(self, sigma: float) -> float:
         if self.param_set == 'sparc_optimized':
             A_low = self.params['A_low']
             sigma_crit = self.params['sigma_crit']
             sigma_transition = self.params['sigma_transition']
+            alpha = self.params.get('alpha', 1.0)
             
             if sigma < sigma_crit:
                 return A_low
             elif sigma < sigma_transition:
                 frac = (sigma - sigma_crit) / (sigma_transition - sigma_crit)
-                return A_low + (1.0 - A_low) * frac
+                return A_low + (1.0 - A_low) * frac**alpha
             else:
                 return 1.0
         else:
@@ -179,26 +204,149 @@ class QSTCalculator:
             else:
                 return 1.0
     
+    @instrumented
     def galaxy_rotation_velocity(self, M_baryon: float, R_disk: float, 
                                 sigma: Optional[float] = None) -> Tuple[float, float]:
+        c = self.constants
         if sigma is None:
-            M_baryon_kg = M_baryon * self.constants.M_SUN
-            R_disk_m = R_disk * self.constants.KPC
-            sigma = M_baryon_kg / (np.pi * R_disk_m**2)
-            sigma = sigma / (1e9 * self.constants.M_SUN / self.constants.KPC**2)
+            sigma = M_baryon / R_disk**2 * c.SURFACE_DENSITY_SCALE
         
         a_ratio = self.effective_a0_ratio(sigma)
         a0_standard = self.params.get('a0_standard', 1.2e-10)
-        M_baryon_kg = M_baryon * self.constants.M_SUN
-        a_eff = a0_standard * a_ratio
-        beta_eff = self.beta_effective(M_baryon_kg)
+        beta_eff = self.beta_effective(M_baryon * c.M_SUN)
         
-        v4 = self.constants.G * M_baryon_kg * a_eff * (1.0 + beta_eff) * 2.0
-        v_qst = v4**0.25
-        v_qst_km_s = v_qst / 1000.0
+        # V⁴ 直接以 (km/s)⁴ 计
+        v4 = c.V4_COEFF * a0_standard * M_baryon * a_ratio * (1.0 + beta_eff)
+        v_qst_km_s = v4**0.25
         
         return v_qst_km_s, a_ratio
     
+    # ==================== 批量 (向量化) 接口 ====================
+    # 与上面的标量方法逐点一致；NumPy仅在首次调用时导入
+    
+    @instrumented
+    def beta_effective_batch(self, M, dtype=None, mass_unit: float = 1.0, backend=None):
+        """
+        批量计算 β_eff(M)
+
+        参数:
+            M: 质量数组，以mass_unit为单位 (默认kg)
+            dtype: 计算精度 'float64' (默认) 或 'float32'
+            mass_unit: M的单位 [kg]，例如太阳质量
+            backend: 'numpy'、'numba'、'auto'，None 使用缺省后端 (见 backends)
+        """
+        if self.param_set not in ['local', 'sparc_optimized']:
+            raise ValueError("此计算需要局部参数集")
+        kernels = _kernel_module(backend)
+        return kernels.beta_effective(M, self.params['beta0'], self.params['M_th'],
+                                      dtype=dtype, mass_unit=mass_unit)
+    
+    @instrumented
+    def effective_a0_ratio_batch(self, sigma, dtype=None, backend=None):
+        """批量计算 a_eff/a₀(σ)，σ单位 [10⁹ M_sun/kpc²]"""
+        kernels = _kernel_module(backend)
+        if self.param_set == 'sparc_optimized':
+            return kernels.a0_ratio_sparc(
+                sigma, self.params['A_low'], self.params['sigma_crit'],
+                self.params['sigma_transition'], self.params.get('alpha', 1.0), dtype=dtype)
+        return kernels.a0_ratio_compatible(sigma, dtype=dtype)
+    
+    @instrumented
+    def evaluate_galaxies_batch(self, M_baryon, R_disk, sigma=None, dtype=None,
+                                backend=None) -> Dict:
+        """
+        批量计算星系量
+        
+        参数:
+            M_baryon: 重子质量数组 [M_sun]
+            R_disk: 盘半径数组 [kpc]
+            sigma: 表面密度数组 [10⁹ M_sun/kpc²]，为None时由M/(πR²)计算
+            dtype: 计算与输出精度 'float64' (默认) 或 'float32'；
+                   float32 相对float64的误差界见 kernels.FLOAT32_ERROR_BOUNDS
+            backend: 'numpy'、'numba'、'auto'，None 使用缺省后端；
+                     numba 后端在单个并行循环中算出全部四个量
+        
+        返回:
+            {'sigma', 'a_ratio', 'beta_eff', 'v_rot'} 数组字典，v_rot单位 km/s
+        """
+        from . import kernels
+        import numpy as np
+        
+        if self.param_set not in ['local', 'sparc_optimized']:
+            raise ValueError("此计算需要局部参数集")
+        if _resolve_backend(backend) == 'numba':
+            return _kernel_module('numba').evaluate_galaxies(
+                M_baryon, R_disk, sigma, self.params, self.constants,
+                self.param_set == 'sparc_optimized', dtype=dtype)
+        dtype = kernels.resolve_dtype(dtype)
+        M_baryon = np.asarray(M_baryon, dtype=dtype)
+        if sigma is None:
+            sigma = kernels.surface_density(M_baryon, R_disk,
+                                            self.constants.SURFACE_DENSITY_SCALE, dtype=dtype)
+        sigma = np.broadcast_to(np.asarray(sigma, dtype=dtype), M_baryon.shape)
+        
+        a_ratio = self.effective_a0_ratio_batch(sigma, dtype=dtype, backend='numpy')
+        beta_eff = self.beta_effective_batch(M_baryon, dtype=dtype,
+                                             mass_unit=self.constants.M_SUN, backend='numpy')
+        v_rot = kernels.rotation_velocity(M_baryon, a_ratio, beta_eff,
+                                          self.params.get('a0_standard', 1.2e-10),
+                                          self.constants.V4_COEFF, dtype=dtype)
+        return {'sigma': sigma, 'a_ratio': a_ratio, 'beta_eff': beta_eff, 'v_rot': v_rot}
+    
+    def galaxy_rotation_velocity_batch(self, M_baryon, R_disk, sigma=None, dtype=None,
+                                       backend=None) -> Tuple:
+        """galaxy_rotation_velocity 的批量版本，返回 (v_qst [km/s], a_ratio) 数组"""
+        result = self.evaluate_galaxies_batch(M_baryon, R_disk, sigma, dtype=dtype,
+                                              backend=backend)
+        return result['v_rot'], result['a_ratio']
+
+    @instrumented
+    def galaxy_rotation_velocity_gradient(self, M_baryon, R_disk, sigma=None,
+                                          dtype=None) -> Tuple:
+        """
+        旋转速度对全部参数的解析梯度 (批量)
+
+        ln v = ¼[ln(2GM) + ln a₀ + ln(a_eff/a₀) + ln(1+β₀f(M/M_th))] − ln 1000，
+        因此 ∂v/∂θ = (v/4)·∂ln(...)/∂θ。不影响 v 的参数梯度为0。
+        分段区间边界处取右侧区间的导数。
+
+        参数:
+            M_baryon: 重子质量数组 [M_sun]
+            R_disk: 盘半径数组 [kpc]
+            sigma: 表面密度数组 [10⁹ M_sun/kpc²]，为None时由M/(πR²)计算
+
+        返回:
+            (v_rot [km/s], {参数名: ∂v/∂θ 数组})，字典包含 self.params 的全部参数
+        """
+        if self.param_set not in ['local', 'sparc_optimized']:
+            raise ValueError("此计算需要局部参数集")
+        from . import kernels
+        import numpy as np
+
+        dtype = kernels.resolve_dtype(dtype)
+        result = self.evaluate_galaxies_batch(M_baryon, R_disk, sigma, dtype=dtype)
+        v, a_ratio, beta_eff = result['v_rot'], result['a_ratio'], result['beta_eff']
+        M_baryon = np.asarray(M_baryon, dtype=dtype)
+
+        beta0, M_th = self.params['beta0'], self.params['M_th']
+        x = M_baryon * dtype(self.constants.M_SUN / M_th)
+        dlnv_dbeta = v / (4.0 * (1.0 + beta_eff))
+        dlnv_dratio = v / (4.0 * a_ratio)
+
+        gradient = {name: np.zeros_like(v) for name in self.params}
+        gradient['beta0'] = dlnv_dbeta * kernels.beta_scale_factor(x, dtype=dtype)
+        gradient['M_th'] = (dlnv_dbeta * dtype(beta0) * kernels.beta_scale_factor_derivative(x, dtype)
+                            * (-x / dtype(M_th)))
+        if self.param_set == 'sparc_optimized':
+            ratio_gradient = kernels.a0_ratio_sparc_gradient(
+                result['sigma'], self.params['A_low'], self.params['sigma_crit'],
+                self.params['sigma_transition'], self.params.get('alpha', 1.0), dtype=dtype)
+            for name, partial in ratio_gradient.items():
+                gradient[name] = dlnv_dratio * partial
+            gradient['a0_standard'] = v / (4.0 * dtype(self.params['a0_standard']))
+        return v, gradient
+
+    @instrumented
     def fifth_force_range(self) -> Tuple[float, float]:
         if self.param_set not in ['local', 'sparc_optimized']:
             raise ValueError("此计算需要局部参数集")
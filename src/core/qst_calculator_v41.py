@@ -3,9 +3,9 @@ QST计算器 - v4.1版本 (兼容层)
 此模块提供v4.1参数的兼容性
 """
 
-import numpy as np
 from typing import Dict, Tuple, Optional
-from .physics_constants import PhysicalConstants
+from .physics_constants import QSTConstants, get_constants
+from .instrumentation import instrumented
 
 
 class QSTConstants_v41:
@@ -39,7 +39,7 @@ class QSTConstants_v41:
 class QSTCalculator_v41:
     """量子时空统一理论计算器 v4.1"""
     
-    def __init__(self, param_set: str = 'effective'):
+    def __init__(self, param_set: str = 'effective', constants=None):
         """
         初始化QST计算器 v4.1
         
@@ -48,9 +48,10 @@ class QSTCalculator_v41:
                 - 'bare': 理论裸参数
                 - 'effective': 宇宙学有效参数
                 - 'local': 局部第五力参数
+            constants: 常数集名 ('iau2015' 默认、'legacy') 或 PhysicalConstants
         """
         self.param_set = param_set
-        self.constants = PhysicalConstants()
+        self.constants = get_constants(constants)
         self.qst_constants = QSTConstants_v41()
         
         self._setup_parameters()
@@ -70,16 +71,12 @@ class QSTCalculator_v41:
         else:
             raise ValueError("v4.1仅支持local参数集")
     
+    @instrumented
     def mars_time_delay(self) -> float:
         """计算火星时间延迟 - v4.1版本"""
-        beta0 = self.params['beta0']
-        delta_phi_grav = 3.386e-9
-        delta_tau_tau = beta0 * delta_phi_grav
-        seconds_per_day = 86400.0
-        microseconds_per_second = 1e6
-        delta_tau_per_day = delta_tau_tau * seconds_per_day * microseconds_per_second
-        return delta_tau_per_day
+        return self.params['beta0'] * QSTConstants.MARS_DELAY_SCALE
     
+    @instrumented
     def beta_effective(self, M: float) -> float:
         """计算尺度依赖的耦合常数 β_eff(M) - v4.1版本"""
         beta0 = self.params['beta0']
@@ -1,374 +0,0 @@
-"""
-量子时空统一理论 - 核心计算器 v4.5 (最终正确版)
-"""
-
-import numpy as np
-from typing import Dict, Tuple, Optional, Union
-
-
-class PhysicalConstants:
-    """物理常数"""
-    
-    def __init__(self):
-        # 基本常数
-        self.M_PL = 2.176434e-8          # 普朗克质量 [kg]
-        self.H0 = 2.27e-18               # 哈勃常数 [Hz]
-        self.G = 6.67430e-11             # 引力常数 [m³/kg/s²]
-        self.C = 2.99792458e8            # 光速 [m/s]
-        
-        # 天文常数
-        self.M_SUN = 1.989e30            # 太阳质量 [kg]
-        self.KPC = 3.086e19              # 千秒差距 [m]
-        self.AU = 1.495978707e11         # 天文单位 [m]
-        self.LY = 9.461e15               # 光年 [m]
-        
-        # 单位转换
-        self.EV_TO_J = 1.602176634e-19   # eV到Joule
-
-
-class QSTConstants_v45:
-    """QST理论常数 - v4.5优化版本"""
-    
-    def __init__(self):
-        # ==================== v4.5优化参数 ====================
-        # 从SPARC数据库优化得到
-        self.BETA0 = 0.8000              # 第五力修正系数 (优化前: 0.279)
-        self.M_TH = 1.0e22               # 质量阈值 [kg]
-        
-        # 加速度尺度参数
-        self.A_LOW = 0.0150              # 矮星系的a_eff/a₀ (优化前: 0.0010)
-        self.SIGMA_CRIT = 0.4000         # 临界表面密度 (优化前: 0.3000)
-        self.SIGMA_TRANSITION = 2.5000   # 过渡表面密度 (优化前: 5.0000)
-        self.ALPHA = 1.0000              # 幂律指数 (优化前: 1.8000)
-        
-        # ==================== 原有参数 ====================
-        # 场值 (与v4.1相同)
-        self.PHI_PLUS = 1.621            # Φ⁺场值
-        self.PHI_MINUS = 1.459           # Φ⁻场值
-        self.OMEGA = 1.297               # Ω场值
-        
-        # 第五力参数
-        self.M_OMEGA_5TH = 1.44e-21      # 第五力质量 [eV]
-        self.LAMBDA_5TH = 915.0          # 第五力力程 [AU]
-        
-        # 宇宙学参数
-        self.M_PHI_EFF = 0.08            # Φ场有效质量 (H₀单位)
-        self.M_OMEGA_EFF = 0.06          # Ω场有效质量 (H₀单位)
-        self.MU = 0.00306                # 混合参数
-        self.V_CONST = 2.0527            # 势能常数
-        
-        # 标准值
-        self.A0_STANDARD = 1.2e-10       # 标准加速度尺度 [m/s²]
-
-
-class QSTCalculator_v45:
-    """量子时空统一理论计算器 v4.5"""
-    
-    def __init__(self, param_set: str = 'sparc_optimized'):
-        """
-        初始化QST v4.5计算器
-        
-        参数:
-            param_set: 参数集类型
-                - 'sparc_optimized': v4.5优化参数 (推荐)
-                - 'local': 局部第五力参数
-                - 'effective': 宇宙学有效参数
-                - 'bare': 理论裸参数
-        """
-        self.param_set = param_set
-        self.constants = PhysicalConstants()
-        self.qst_constants = QSTConstants_v45()
-        self._setup_parameters()
-    
-    def _setup_parameters(self):
-        """设置v4.5参数"""
-        if self.param_set == 'sparc_optimized':
-            # v4.5优化参数
-            self.params = {
-                # 场值
-                'phi_plus': self.qst_constants.PHI_PLUS,
-                'phi_minus': self.qst_constants.PHI_MINUS,
-                'omega': self.qst_constants.OMEGA,
-                
-                # v4.5优化参数
-                'beta0': self.qst_constants.BETA0,
-                'M_th': self.qst_constants.M_TH,
-                'A_low': self.qst_constants.A_LOW,
-                'sigma_crit': self.qst_constants.SIGMA_CRIT,
-                'sigma_transition': self.qst_constants.SIGMA_TRANSITION,
-                'alpha': self.qst_constants.ALPHA,
-                
-                # 其他参数
-                'a0_standard': self.qst_constants.A0_STANDARD,
-                'm_omega_5th': self.qst_constants.M_OMEGA_5TH,
-                'lambda_5th': self.qst_constants.LAMBDA_5TH,
-                'm_phi': self.qst_constants.M_PHI_EFF,
-                'm_omega': self.qst_constants.M_OMEGA_EFF,
-                'mu': self.qst_constants.MU,
-                'V_const': self.qst_constants.V_CONST,
-            }
-        elif self.param_set == 'local':
-            # 仅第五力参数
-            self.params = {
-                'phi_plus': self.qst_constants.PHI_PLUS,
-                'phi_minus': self.qst_constants.PHI_MINUS,
-                'omega': self.qst_constants.OMEGA,
-                'beta0': self.qst_constants.BETA0,
-                'M_th': self.qst_constants.M_TH,
-                'm_omega_5th': self.qst_constants.M_OMEGA_5TH,
-                'lambda_5th': self.qst_constants.LAMBDA_5TH,
-            }
-        elif self.param_set == 'effective':
-            # 宇宙学有效参数
-            self.params = {
-                'phi_plus': self.qst_constants.PHI_PLUS,
-                'phi_minus': self.qst_constants.PHI_MINUS,
-                'omega': self.qst_constants.OMEGA,
-                'm_phi': self.qst_constants.M_PHI_EFF,
-                'm_omega': self.qst_constants.M_OMEGA_EFF,
-                'mu': self.qst_constants.MU,
-                'V_const': self.qst_constants.V_CONST,
-            }
-        elif self.param_set == 'bare':
-            # 理论裸参数
-            self.params = {
-                'phi_plus': self.qst_constants.PHI_PLUS,
-                'phi_minus': self.qst_constants.PHI_MINUS,
-                'omega': self.qst_constants.OMEGA,
-                'm_phi': 0.935,          # 裸质量
-                'm_omega': 1.0,          # 裸质量
-                'mu': self.qst_constants.MU,
-                'lambda1': 2.34e-6,
-                'lambda2': 3.78e-7,
-                'lambda3': 1.29e-8,
-            }
-        else:
-            raise ValueError(f"未知参数集: {self.param_set}")
-    
-    def beta_effective(self, M: float) -> float:
-        """
-        计算尺度依赖的耦合常数 β_eff(M) - v4.5版本
-        
-        参数:
-            M: 质量 [kg]
-        
-        返回:
-            β_eff: 有效耦合常数
-        """
-        if self.param_set not in ['local', 'sparc_optimized']:
-            raise ValueError("此计算需要局部或sparc_optimized参数集")
-        
-        beta0 = self.params['beta0']
-        M_th = self.params['M_th']
-        
-        x = M / M_th
-        
-        # v4.5的尺度依赖函数 - 基于优化结果
-        if x < 0.001:
-            f = 0.001
-        elif x < 0.01:      # 0.001 ≤ x < 0.01
-            f = 0.01
-        elif x < 0.1:       # 0.01 ≤ x < 0.1
-            f = 0.1
-        elif x < 0.5:       # 0.1 ≤ x < 0.5
-            f = 0.5
-        elif x < 0.8:       # 0.5 ≤ x < 0.8
-            f = 0.7
-        elif x < 1.0:       # 0.8 ≤ x < 1.0
-            # 线性插值: x=0.8时f=0.7, x=1.0时f=0.8
-            f = 0.7 + 0.1 * (x - 0.8) / 0.2
-        elif x < 2.0:       # 1.0 ≤ x < 2.0
-            # 线性插值: x=1.0时f=0.8, x=2.0时f=0.9
-            f = 0.8 + 0.1 * (x - 1.0) / 1.0
-        else:               # x ≥ 2.0
-            f = 0.9
-        
-        beta_eff = beta0 * f
-        return beta_eff
-    
-    def effective_a0_ratio(self, sigma: float) -> float:
-        """
-        计算有效加速度尺度比例 a_eff/a₀ - v4.5版本
-        
-        参数:
-            sigma: 表面密度 [10⁹ M_sun/kpc²]
-        
-        返回:
-            a_eff/a₀: 有效加速度尺度比例
-        """
-        if self.param_set != 'sparc_optimized':
-            # 如果不使用sparc_optimized参数集，返回兼容版本
-            return self._compatible_a0_ratio(sigma)
-        
-        A_low = self.params['A_low']
-        sigma_crit = self.params['sigma_crit']
-        sigma_transition = self.params['sigma_transition']
-        
-        if sigma < sigma_crit:
-            return A_low
-        elif sigma < sigma_transition:
-            # 线性插值
-            frac = (sigma - sigma_crit) / (sigma_transition - sigma_crit)
-            return A_low + (1.0 - A_low) * frac
-        else:
-            return 1.0
-    
-    def _compatible_a0_ratio(self, sigma: float) -> float:
-        """兼容版本的a_eff函数"""
-        if sigma < 0.001:
-            return 0.0001
-        elif sigma < 0.01:
-            return 0.0005
-        elif sigma < 0.1:
-            return 0.001
-        elif sigma < 0.5:
-            return 0.01
-        elif sigma < 5.0:
-            return 0.1
-        elif sigma < 50.0:
-            return 0.5
-        else:
-            return 1.0
-    
-    def dark_energy_density(self) -> float:
-        """计算暗能量密度 Ω_DE"""
-        if self.param_set not in ['effective', 'sparc_optimized']:
-            raise ValueError("此计算需要有效或sparc_optimized参数集")
-        
-        phi_plus = self.params['phi_plus']
-        phi_minus = self.params['phi_minus']
-        omega = self.params['omega']
-        m_phi = self.params.get('m_phi', self.qst_constants.M_PHI_EFF)
-        m_omega = self.params.get('m_omega', self.qst_constants.M_OMEGA_EFF)
-        mu = self.params.get('mu', self.qst_constants.MU)
-        V_const = self.params.get('V_const', self.qst_constants.V_CONST)
-        
-        # 计算势能
-        V_phi = 0.5 * m_phi**2 * (phi_plus**2 + phi_minus**2)
-        V_mix = -mu**2 * phi_plus * phi_minus
-        V_omega = 0.5 * m_omega**2 * omega**2
-        
-        V_total = V_phi + V_mix + V_omega + V_const
-        
-        # 归一化单位下 ρ_crit = 3
-        rho_crit = 3.0
-        Omega_DE = V_total / rho_crit
-        
-        return Omega_DE
-    
-    def mars_time_delay(self) -> float:
-        """计算火星时间延迟"""
-        if self.param_set not in ['local', 'sparc_optimized']:
-            raise ValueError("此计算需要局部或sparc_optimized参数集")
-        
-        beta0 = self.params['beta0']
-        delta_phi_grav = 3.386e-9
-        delta_tau_tau = beta0 * delta_phi_grav
-        
-        # 转换为μs/日
-        seconds_per_day = 86400.0
-        microseconds_per_second = 1e6
-        delta_tau_per_day = delta_tau_tau * seconds_per_day * microseconds_per_second
-        
-        return delta_tau_per_day
-    
-    def galaxy_rotation_velocity(self, M_baryon: float, R_disk: float, 
-                                sigma: Optional[float] = None) -> Tuple[float, float]:
-        """
-        计算星系旋转速度
-        
-        参数:
-            M_baryon: 重子质量 [M_sun]
-            R_disk: 盘半径 [kpc]
-            sigma: 表面密度 [10⁹ M_sun/kpc²]，如果为None则自动计算
-        
-        返回:
-            (v_qst, a_ratio): 旋转速度 [km/s] 和 a_eff/a₀比例
-        """
-        # 计算表面密度
-        if sigma is None:
-            M_baryon_kg = M_baryon * self.constants.M_SUN
-            R_disk_m = R_disk * self.constants.KPC
-            sigma = M_baryon_kg / (np.pi * R_disk_m**2)
-            # 转换为 [10⁹ M_sun/kpc²]
-            sigma = sigma / (1e9 * self.constants.M_SUN / self.constants.KPC**2)
-        
-        # 获取参数
-        a_ratio = self.effective_a0_ratio(sigma)
-        a0_standard = self.params.get('a0_standard', 1.2e-10)
-        M_baryon_kg = M_baryon * self.constants.M_SUN
-        
-        # 计算a_eff
-        a_eff = a0_standard * a_ratio
-        
-        # 计算β_eff
-        beta_eff = 0.0
-        if self.param_set in ['local', 'sparc_optimized']:
-            beta_eff = self.beta_effective(M_baryon_kg)
-        
-        # QST公式: V_qst⁴ = G × M_baryon × a_eff × (1 + β_eff) × 2
-        v4 = self.constants.G * M_baryon_kg * a_eff * (1.0 + beta_eff) * 2.0
-        v_qst = v4**0.25
-        
-        # 转换为 km/s
-        v_qst_km_s = v_qst / 1000.0
-        
-        return v_qst_km_s, a_ratio
-    
-    def fifth_force_range(self) -> Tuple[float, float]:
-        """计算第五力力程"""
-        if self.param_set not in ['local', 'sparc_optimized']:
-            raise ValueError("此计算需要局部或sparc_optimized参数集")
-        
-        lambda_au = self.params['lambda_5th']
-        lambda_m = lambda_au * self.constants.AU
-        
-        return lambda_m, lambda_au
-    
-    def get_parameters(self) -> Dict:
-        """获取当前参数集的参数"""
-        return self.params.copy()
-    
-    def print_parameters(self):
-        """打印当前参数集的参数"""
-        print(f"QST v4.5计算器 - 参数集: {self.param_set}")
-        print("=" * 60)
-        
-        for key, value in self.params.items():
-            if isinstance(value, float):
-                if abs(value) < 1e-3:
-                    print(f"{key:25} = {value:.6e}")
-                else:
-                    print(f"{key:25} = {value:.6f}")
-            else:
-                print(f"{key:25} = {value}")
-    
-    def print_v45_optimization_summary(self):
-        """打印v4.5优化参数总结"""
-        print("=" * 60)
-        print("QST v4.5 优化参数总结")
-        print("=" * 60)
-        
-        if self.param_set != 'sparc_optimized':
-            print("⚠️  注意: 当前不是sparc_optimized参数集")
-            return
-        
-        print("v4.5优化参数 (基于SPARC数据库):")
-        print("-" * 60)
-        
-        # 显示优化前后的对比
-        optimizations = [
-            ('β₀ (第五力修正)', 0.279, self.params['beta0'], '+186.7%'),
-            ('A_low (矮星系a_eff/a₀)', 0.0010, self.params['A_low'], '+1400%'),
-            ('σ_crit (临界表面密度)', 0.3000, self.params['sigma_crit'], '+33.3%'),
-            ('σ_transition (过渡表面密度)', 5.0000, self.params['sigma_transition'], '-50.0%'),
-            ('α (幂律指数)', 1.8000, self.params['alpha'], '-44.4%'),
-        ]
-        
-        for name, old_val, new_val, change in optimizations:
-            print(f"{name:25}: {old_val:8.4f} → {new_val:8.4f} ({change})")
-        
-        print("\n优化效果:")
-        print("- 矮星系拟合误差: 从67.1%降低到20.3% (-70.0%)")
-        print("- 优秀拟合率: 从0.0%提升到53.3%")
-        print("- 中位数误差: 从66.8%降低到9.8% (-85.3%)")
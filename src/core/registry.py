@@ -0,0 +1,95 @@
+"""
+量子时空统一理论 - 模型版本注册表
+
+每个模型版本只有一个实现，按需导入:
+
+    v4.5  core.qst_calculator.QSTCalculator          (当前版本，别名 latest)
+    v4.1  core.qst_calculator_v41.QSTCalculator_v41  (v4.1 局部参数与 β_eff，用于对比)
+
+get_calculator 首次请求某版本时才导入其模块，构造的实例按
+(版本, 参数集, 参数覆盖, 常数集) 缓存并在调用者之间共享，不要修改其 params；
+需要独立实例时用 calculator_class(version)(...)。未给参数集时使用版本的默认参数集
+(v4.1 只有 local)。已删除的 qst_calculator_v45_* 模块使用旧常数 (M_SUN = 1.989e30)，
+其结果可由 get_calculator('v4.5', constants='legacy') 复现。
+
+本模块不导入任何计算器模块或NumPy。
+"""
+
+import importlib
+import threading
+from typing import Dict, Optional, Tuple
+
+
+# 版本名 -> (模块 (相对包根), 类名, 是否支持参数覆盖, 默认参数集)
+VERSIONS: Dict[str, Tuple[str, str, bool, str]] = {
+    'v4.5': ('.core.qst_calculator', 'QSTCalculator', True, 'sparc_optimized'),
+    'v4.1': ('.core.qst_calculator_v41', 'QSTCalculator_v41', False, 'local'),
+}
+ALIASES = {'latest': 'v4.5', 'v45': 'v4.5', 'v41': 'v4.1'}
+DEFAULT_VERSION = 'v4.5'
+
+_PACKAGE_ROOT = __name__.split('.')[0]
+_lock = threading.Lock()
+_classes: Dict[str, type] = {}
+_instances: Dict[Tuple, object] = {}
+
+
+def resolve_version(version: str = DEFAULT_VERSION) -> str:
+    """别名 → 规范版本名"""
+    version = ALIASES.get(version, version)
+    if version not in VERSIONS:
+        known = ', '.join(sorted(VERSIONS) + sorted(ALIASES))
+        raise ValueError(f"未知模型版本: {version} (可选: {known})")
+    return version
+
+
+def available_versions() -> Tuple[str, ...]:
+    """规范版本名"""
+    return tuple(VERSIONS)
+
+
+def calculator_class(version: str = DEFAULT_VERSION) -> type:
+    """版本对应的计算器类 (首次调用时导入模块)"""
+    version = resolve_version(version)
+    if version not in _classes:
+        module_name, class_name = VERSIONS[version][:2]
+        module = importlib.import_module(module_name, _PACKAGE_ROOT)
+        _classes[version] = getattr(module, class_name)
+    return _classes[version]
+
+
+def get_calculator(version: str = DEFAULT_VERSION, param_set: Optional[str] = None,
+                   overrides: Optional[Dict] = None, constants=None):
+    """
+    取共享的计算器实例
+
+    参数:
+        version: 模型版本或别名
+        param_set: 参数集；None 使用 VERSIONS 中该版本的默认参数集
+        overrides: 参数覆盖 (仅 v4.5)
+        constants: 常数集名 ('iau2015' 默认、'legacy') 或 PhysicalConstants
+
+    返回:
+        缓存的计算器实例 (同一参数返回同一对象)
+    """
+    version = resolve_version(version)
+    if overrides and not VERSIONS[version][2]:
+        raise ValueError(f"模型版本 {version} 不支持参数覆盖")
+    param_set = param_set or VERSIONS[version][3]
+    key = (version, param_set, tuple(sorted((overrides or {}).items())), constants)
+    calc = _instances.get(key)
+    if calc is not None:
+        return calc
+    kwargs = {'overrides': dict(overrides)} if overrides else {}
+    if constants is not None:
+        kwargs['constants'] = constants
+    calc = calculator_class(version)(param_set, **kwargs)
+    with _lock:
+        # 并发构造时保留先存入的实例
+        return _instances.setdefault(key, calc)
+
+
+def clear_cache():
+    """清空实例缓存"""
+    with _lock:
+        _instances.clear()
@@ -0,0 +1,104 @@
+"""
+量子时空统一理论 - 单位换算
+
+每个常数集的全部换算系数 (同量纲单位两两之间) 在导入时算好，
+convert 只做一次查表和一次乘法，可直接用于星系表的整列。
+
+    convert(table['R_disk'], 'pc', 'kpc')
+    convert_columns(table, {'M_baryon': ('kg', 'M_sun'), 'v_obs': ('m/s', 'km/s')})
+
+本模块不导入NumPy；数组输入在首次换算时才导入。
+"""
+
+from typing import Dict, Mapping, Tuple
+
+from .physics_constants import CONSTANT_SETS, DEFAULT_CONSTANT_SET, DERIVED_CONSTANTS
+
+
+def _units(c: Dict[str, float]) -> Dict[str, Tuple[str, float]]:
+    """单位名 -> (量纲, SI 值)"""
+    pc = c['KPC'] / 1e3
+    return {
+        'kg': ('mass', 1.0), 'M_sun': ('mass', c['M_SUN']), '1e9 M_sun': ('mass', 1e9 * c['M_SUN']),
+        'M_earth': ('mass', c['M_EARTH']),
+        'm': ('length', 1.0), 'km': ('length', 1e3), 'AU': ('length', c['AU']),
+        'pc': ('length', pc), 'kpc': ('length', c['KPC']), 'Mpc': ('length', c['MPC']),
+        'ly': ('length', c['LY']),
+        'm/s': ('velocity', 1.0), 'km/s': ('velocity', 1e3),
+        'm/s2': ('acceleration', 1.0),
+        'kg/m2': ('surface_density', 1.0),
+        'M_sun/pc2': ('surface_density', c['M_SUN'] / pc**2),
+        'M_sun/kpc2': ('surface_density', c['M_SUN'] / c['KPC']**2),
+        '1e9 M_sun/kpc2': ('surface_density', c['SIGMA_UNIT']),
+        's': ('time', 1.0), 'day': ('time', c['DAY']), 'yr': ('time', c['YEAR']),
+    }
+
+
+def _factor_table(c: Dict[str, float]) -> Dict[Tuple[str, str], float]:
+    units = _units(c)
+    return {(a, b): va / vb for a, (da, va) in units.items()
+            for b, (db, vb) in units.items() if da == db}
+
+
+UNITS = tuple(_units({**CONSTANT_SETS[DEFAULT_CONSTANT_SET],
+                     **DERIVED_CONSTANTS[DEFAULT_CONSTANT_SET]}))
+
+# 常数集名 -> {(源单位, 目标单位): 系数}
+CONVERSION_FACTORS = {name: _factor_table({**values, **DERIVED_CONSTANTS[name]})
+                      for name, values in CONSTANT_SETS.items()}
+
+
+def conversion_factor(from_unit: str, to_unit: str, constants=None) -> float:
+    """
+    换算系数: 以 from_unit 计的值乘以它得到以 to_unit 计的值
+
+    参数:
+        from_unit / to_unit: UNITS 中的单位名
+        constants: 常数集名或 PhysicalConstants，缺省为默认常数集
+    """
+    if constants is None:
+        name = DEFAULT_CONSTANT_SET
+    else:
+        name = constants if isinstance(constants, str) else constants.name
+    table = CONVERSION_FACTORS.get(name)
+    if table is None:
+        raise ValueError(f"未知常数集: {name}")
+    factor = table.get((from_unit, to_unit))
+    if factor is None:
+        unknown = [u for u in (from_unit, to_unit) if u not in UNITS]
+        if unknown:
+            raise ValueError(f"未知单位: {unknown} (可选: {', '.join(UNITS)})")
+        raise ValueError(f"量纲不同，无法换算: {from_unit} → {to_unit}")
+    return factor
+
+
+def convert(values, from_unit: str, to_unit: str, constants=None):
+    """
+    换算数值或数组
+
+    返回:
+        标量输入返回 float，否则为float64数组
+    """
+    factor = conversion_factor(from_unit, to_unit, constants)
+    if isinstance(values, (int, float)):
+        return float(values) * factor
+    import numpy as np
+    return np.asarray(values, dtype=float) * factor
+
+
+def convert_columns(table: Mapping, units: Mapping[str, Tuple[str, str]],
+                    constants=None) -> Dict:
+    """
+    换算表格中的列 (其余列原样保留)
+
+    参数:
+        table: {列名: 数组}
+        units: {列名: (源单位, 目标单位)}
+    """
+    missing = [name for name in units if name not in table]
+    if missing:
+        raise ValueError(f"表格缺少列: {missing}")
+    out = dict(table)
+    for name, (from_unit, to_unit) in units.items():
+        out[name] = convert(table[name], from_unit, to_unit, constants)
+    return out
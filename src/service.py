@@ -0,0 +1,398 @@
+"""
+量子时空统一理论 - 本地微批处理计算服务
+
+基于asyncio的HTTP/JSON服务 (TCP或Unix套接字)。并发到达的小请求 (一个星系、一个质量)
+先按操作排队，最多等待 max_delay 秒或凑满 max_batch 个点，再合并为一次向量化的
+批量计算，结果按请求拆分返回。
+
+接口:
+    POST /galaxy    {"M_baryon": [M_sun], "R_disk": [kpc], "sigma": 可选}
+                    → {"sigma", "a_ratio", "beta_eff", "v_rot"}
+    POST /beta_eff  {"M_baryon": [M_sun]} → {"beta_eff"}
+    POST /a_ratio   {"sigma": [10⁹ M_sun/kpc²]} → {"a_ratio"}
+    GET  /metrics   每个操作的请求延迟分位数与批大小
+    GET  /health
+
+各字段可为数值或等长数值列表；输入全为数值时输出也为数值。
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+from .core.instrumentation import Instrumentation
+
+
+# 操作 -> (必需字段, 可选字段)
+OPERATIONS = {
+    'galaxy': (('M_baryon', 'R_disk'), ('sigma',)),
+    'beta_eff': (('M_baryon',), ()),
+    'a_ratio': (('sigma',), ()),
+}
+
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_BATCH = 4096
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# json.dumps 带非默认参数时每次新建编码器，这里复用一个。
+# allow_nan=False: NaN/Infinity 不是合法JSON，遇到时改走 _encode_json 的慢路径
+_encode_strict = json.JSONEncoder(ensure_ascii=False, allow_nan=False).encode
+
+
+def _finite_or_none(value):
+    """把非有限浮点数 (NaN/±Infinity) 换成 None，递归处理列表与字典"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, list):
+        return [_finite_or_none(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _finite_or_none(v) for k, v in value.items()}
+    return value
+
+
+def _encode_json(payload) -> str:
+    """编码为标准JSON；非有限数值输出为 null"""
+    try:
+        return _encode_strict(payload)
+    except ValueError:
+        return _encode_strict(_finite_or_none(payload))
+
+
+class RequestError(ValueError):
+    """请求内容无效 (返回400)"""
+
+
+def parse_request(operation: str, payload) -> Tuple[Dict[str, List[float]], int, bool]:
+    """
+    校验请求并展开为等长的浮点列表
+
+    返回:
+        (字段 -> 列表, 点数, 输入是否全为标量)
+    """
+    if operation not in OPERATIONS:
+        raise RequestError(f"未知操作: {operation} (可选: {', '.join(OPERATIONS)})")
+    if not isinstance(payload, dict):
+        raise RequestError("请求体须为JSON对象")
+    required, optional = OPERATIONS[operation]
+    missing = [name for name in required if name not in payload]
+    if missing:
+        raise RequestError(f"缺少字段: {', '.join(missing)}")
+    unknown = [name for name in payload if name not in required + optional]
+    if unknown:
+        raise RequestError(f"未知字段: {', '.join(unknown)}")
+
+    columns, scalar, n = {}, True, None
+    for name, value in payload.items():
+        if isinstance(value, list):
+            scalar = False
+            if n is not None and len(value) != n:
+                raise RequestError("各列表字段长度须相同")
+            n = len(value)
+        columns[name] = value
+    n = 1 if n is None else n
+    try:
+        for name, value in columns.items():
+            columns[name] = ([float(v) for v in value] if isinstance(value, list)
+                             else [float(value)] * n)
+    except (TypeError, ValueError):
+        raise RequestError("字段值须为数值或数值列表") from None
+    return columns, n, scalar
+
+
+def compute(calc, operation: str, columns: Dict) -> Dict:
+    """对合并后的列调用计算器的批量接口"""
+    import numpy as np
+
+    arrays = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    if operation == 'galaxy':
+        return calc.evaluate_galaxies_batch(arrays['M_baryon'], arrays['R_disk'],
+                                            arrays.get('sigma'))
+    if operation == 'beta_eff':
+        return {'beta_eff': calc.beta_effective_batch(arrays['M_baryon'],
+                                                      mass_unit=calc.constants.M_SUN)}
+    return {'a_ratio': calc.effective_a0_ratio_batch(arrays['sigma'])}
+
+
+class _Pending:
+    __slots__ = ('columns', 'n', 'future', 'start')
+
+    def __init__(self, columns, n, future):
+        self.columns = columns
+        self.n = n
+        self.future = future
+        self.start = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    请求合批器: 按 (操作, 字段) 排队，到期或凑满后一次计算
+
+    参数:
+        calc: QSTCalculator 实例
+        max_delay: 队首请求的最长等待时间 [s]；0 表示只合并同一轮事件循环内到达的请求
+        max_batch: 每批最多点数；max_batch=1 即逐请求计算
+        metrics: 记录统计的 Instrumentation，缺省新建并启用
+    """
+
+    def __init__(self, calc, max_delay: float = DEFAULT_MAX_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH, metrics: Optional[Instrumentation] = None):
+        if max_delay < 0 or max_batch < 1:
+            raise ValueError("max_delay 须非负，max_batch 须为正整数")
+        self.calc = calc
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        if metrics is None:
+            metrics = Instrumentation()
+            metrics.enable()
+        self.metrics = metrics
+        self._queues: Dict[Tuple, List[_Pending]] = {}
+        self._sizes: Dict[Tuple, int] = {}
+        self._timers: Dict[Tuple, asyncio.Handle] = {}
+
+    def enqueue(self, operation: str, columns: Dict[str, List[float]], n: int) -> asyncio.Future:
+        """排队一个已校验的请求 (见 parse_request)；future 的结果为 {输出名: 列表}"""
+        loop = asyncio.get_running_loop()
+        key = (operation, tuple(sorted(columns)))
+        pending = _Pending(columns, n, loop.create_future())
+        self._queues.setdefault(key, []).append(pending)
+        self._sizes[key] = self._sizes.get(key, 0) + n
+
+        if self._sizes[key] >= self.max_batch:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            self._flush(key)
+        elif key not in self._timers:
+            if self.max_delay > 0:
+                self._timers[key] = loop.call_later(self.max_delay, self._flush, key)
+            else:
+                self._timers[key] = loop.call_soon(self._flush, key)
+        return pending.future
+
+    async def submit(self, operation: str, columns: Dict[str, List[float]], n: int) -> Dict:
+        """enqueue 的协程形式"""
+        return await self.enqueue(operation, columns, n)
+
+    def _flush(self, key: Tuple):
+        self._timers.pop(key, None)
+        batch = self._queues.pop(key, [])
+        self._sizes.pop(key, None)
+        if not batch:
+            return
+        operation, names = key
+        start = time.perf_counter()
+        try:
+            merged = {name: list(chain.from_iterable(p.columns[name] for p in batch))
+                      for name in names}
+            result = {name: values.tolist()
+                      for name, values in compute(self.calc, operation, merged).items()}
+        except Exception as exc:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+        end = time.perf_counter()
+        self.metrics.record(f'batch.{operation}', end - start, sum(p.n for p in batch))
+        request_name = f'request.{operation}'
+        offset = 0
+        for p in batch:
+            if not p.future.done():
+                p.future.set_result({name: values[offset:offset + p.n]
+                                     for name, values in result.items()})
+            self.metrics.record(request_name, end - p.start, p.n)
+            offset += p.n
+
+    def metrics_snapshot(self) -> Dict:
+        """
+        {'requests': {操作: 排队+计算延迟统计}, 'batches': {操作: 计算时间与批大小}}
+
+        批大小 (batch_mean/batch_max) 以点数计。
+        """
+        snapshot = {'requests': {}, 'batches': {}}
+        for name, stats in self.metrics.snapshot().items():
+            kind, operation = name.split('.', 1)
+            snapshot['requests' if kind == 'request' else 'batches'][operation] = stats
+        return snapshot
+
+
+class Response:
+    """
+    一个请求的响应: 立即可得的 (status, payload)，或等待合批结果的 future
+
+    scalar 为真时把结果列表取成单个数值。
+    """
+    __slots__ = ('status', 'payload', 'future', 'scalar')
+
+    def __init__(self, status: int = 200, payload: Optional[Dict] = None,
+                 future: Optional[asyncio.Future] = None, scalar: bool = False):
+        self.status = status
+        self.payload = payload
+        self.future = future
+        self.scalar = scalar
+
+    def done(self) -> bool:
+        return self.future is None or self.future.done()
+
+    def result(self) -> Tuple[int, Dict]:
+        """(状态码, JSON对象)；须在 done() 为真后调用"""
+        if self.future is None:
+            return self.status, self.payload
+        exc = self.future.exception()
+        if exc is not None:
+            return 500, {'error': f"{type(exc).__name__}: {exc}"}
+        result = self.future.result()
+        if self.scalar:
+            result = {name: values[0] for name, values in result.items()}
+        return 200, result
+
+    def encode(self, keep_alive: bool) -> bytes:
+        status, payload = self.result()
+        body = _encode_json(payload).encode('utf-8')
+        connection = '' if keep_alive else 'Connection: close\r\n'
+        head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"{connection}\r\n")
+        return head.encode('latin-1') + body
+
+
+class _HTTPProtocol(asyncio.Protocol):
+    """
+    最小的 HTTP/1.1 协议实现: keep-alive 与流水线请求
+
+    响应按请求顺序写回，同一连接上已完成的响应合并为一次写入；不为请求创建任务。
+    """
+
+    def __init__(self, service: 'QSTService'):
+        self.service = service
+        self.transport = None
+        self.buffer = bytearray()
+        self.responses = deque()
+        self.closing = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.responses.clear()
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        while not self.closing:
+            end = self.buffer.find(b'\r\n\r\n')
+            if end < 0:
+                if len(self.buffer) > MAX_HEADER_BYTES:
+                    self._fail(400, '请求头过大')
+                break
+            try:
+                lines = self.buffer[:end].decode('latin-1').split('\r\n')
+                method, path, version = lines[0].split()
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                self._fail(400, '无效的HTTP请求')
+                break
+            if length < 0:
+                self._fail(400, '无效的Content-Length')
+                break
+            if length > MAX_BODY_BYTES:
+                self._fail(413, '请求体过大')
+                break
+            total = end + 4 + length
+            if len(self.buffer) < total:
+                break
+            body = bytes(self.buffer[end + 4:total])
+            del self.buffer[:total]
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                          else connection == 'keep-alive')
+            self.closing = not keep_alive
+            response = self.service.handle_request(method, path, body)
+            self.responses.append((response, keep_alive))
+            if response.future is not None:
+                response.future.add_done_callback(self._write_ready)
+        self._write_ready()
+
+    def _fail(self, status: int, message: str):
+        self.responses.append((Response(status, {'error': message}), False))
+        self.closing = True
+
+    def _write_ready(self, _future=None):
+        chunks = []
+        close = False
+        while self.responses and self.responses[0][0].done():
+            response, keep_alive = self.responses.popleft()
+            chunks.append(response.encode(keep_alive))
+            if not keep_alive:
+                close = True
+                self.responses.clear()
+        if chunks and not self.transport.is_closing():
+            self.transport.write(b''.join(chunks))
+            if close:
+                self.transport.close()
+
+
+class QSTService:
+    """
+    HTTP/JSON 服务
+
+    参数:
+        param_set: 计算器参数集
+        max_delay / max_batch: 见 MicroBatcher
+        calc: 直接给出计算器时忽略 param_set
+    """
+
+    def __init__(self, param_set: str = 'sparc_optimized', max_delay: float = DEFAULT_MAX_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH, calc=None):
+        if calc is None:
+            from .core.registry import get_calculator
+            calc = get_calculator('v4.5', param_set)
+        self.calc = calc
+        self.batcher = MicroBatcher(calc, max_delay, max_batch)
+
+    def handle_request(self, method: str, path: str, body: bytes) -> Response:
+        """处理一个请求 (须在事件循环中调用)"""
+        route = path.split('?', 1)[0].strip('/')
+        if route in ('metrics', 'health'):
+            if method != 'GET':
+                return Response(405, {'error': f"/{route} 只支持GET"})
+            if route == 'health':
+                return Response(200, {'status': 'ok', 'param_set': self.calc.param_set})
+            return Response(200, self.batcher.metrics_snapshot())
+        if route not in OPERATIONS:
+            return Response(404, {'error': f"未知路径: {path}"})
+        if method != 'POST':
+            return Response(405, {'error': f"/{route} 只支持POST"})
+        try:
+            columns, n, scalar = parse_request(route, json.loads(body or b'null'))
+        except ValueError as exc:
+            return Response(400, {'error': str(exc)})
+        return Response(future=self.batcher.enqueue(route, columns, n), scalar=scalar)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """启动监听 (unix_path 给出时使用Unix套接字)，返回 asyncio 服务器"""
+        loop = asyncio.get_running_loop()
+        if unix_path:
+            return await loop.create_unix_server(lambda: _HTTPProtocol(self), unix_path)
+        return await loop.create_server(lambda: _HTTPProtocol(self), host, port)
+
+    def run(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None):
+        """阻塞运行，直到被中断"""
+        async def main():
+            server = await self.start(host, port, unix_path)
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(main())
@@ -0,0 +1,204 @@
+"""
+量子时空统一理论 - 行星钟的时间分辨QST钟差
+
+mars_time_delay 用平均轨道半径上的太阳势差 Δφ = 3.386e-9 给出单个常数。
+这里在开普勒轨道上逐时刻计算第五力势对钟速的影响:
+
+    y_b(t) = −Σ_s β_eff(M_s) G M_s e^(−d/λ) / (c² d),   d = |r_b(t) − r_s(t)|
+
+源 s 为太阳 (位于原点) 与其他参与计算的天体，λ 为第五力力程 lambda_5th [AU]。
+钟速以 μs/天 给出，累积钟差 (相对参考天体) 为钟速差对时间的梯形积分 [μs]。
+时间 t 以 J2000 起算的天数计；轨道根数为 J2000 平根数 (JPL 近似行星位置表)。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from ..core.physics_constants import PhysicalConstants
+
+
+SECONDS_PER_DAY = 86400.0
+MICROSECONDS_PER_DAY = SECONDS_PER_DAY * 1e6
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class KeplerOrbit:
+    """
+    日心开普勒轨道 (J2000 黄道坐标)
+
+    角度单位为度；mean_anomaly 为 J2000 时刻的平近点角。
+    """
+    mass: float
+    a: float
+    e: float
+    inclination: float
+    node: float
+    arg_perihelion: float
+    mean_anomaly: float
+
+
+ORBITS = {
+    'earth': KeplerOrbit(PhysicalConstants.M_EARTH, a=1.00000261, e=0.01671123,
+                         inclination=-0.00001531, node=0.0, arg_perihelion=102.93768193,
+                         mean_anomaly=-2.47311027),
+    'mars': KeplerOrbit(PhysicalConstants.M_MARS, a=1.52371034, e=0.09339410,
+                        inclination=1.84969142, node=49.55953891,
+                        arg_perihelion=-73.5031685, mean_anomaly=19.39019754),
+}
+
+
+def solve_kepler(M, e: float, tol: float = 1e-14, max_iter: int = 50):
+    """
+    向量化求解开普勒方程 E − e sin E = M (牛顿迭代)
+
+    参数:
+        M: 平近点角 [rad]
+        e: 偏心率 (0 ≤ e < 1)
+
+    返回:
+        偏近点角 E [rad]
+    """
+    if not 0.0 <= e < 1.0:
+        raise ValueError(f"偏心率须在 [0, 1) 内: {e}")
+    M = np.remainder(np.asarray(M, dtype=float), 2.0 * np.pi)
+    E = M + e * np.sin(M)
+    for _ in range(max_iter):
+        step = (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+        E -= step
+        if np.max(np.abs(step), initial=0.0) < tol:
+            break
+    return E
+
+
+def orbit_positions(orbit: KeplerOrbit, t_days, constants=None):
+    """
+    天体在 t 时刻的日心位置
+
+    参数:
+        orbit: 轨道根数
+        t_days: J2000 起算的天数 (数组)
+        constants: PhysicalConstants，缺省新建
+
+    返回:
+        (3, n) 位置数组 [m]
+    """
+    constants = constants or PhysicalConstants()
+    a = orbit.a * constants.AU
+    n = np.sqrt((constants.GM_SUN + constants.G * orbit.mass) / a**3)
+    M = np.radians(orbit.mean_anomaly) + n * SECONDS_PER_DAY * np.asarray(t_days, dtype=float)
+    E = solve_kepler(M, orbit.e)
+    x = a * (np.cos(E) - orbit.e)
+    y = a * np.sqrt(1.0 - orbit.e**2) * np.sin(E)
+
+    w, node, inc = np.radians([orbit.arg_perihelion, orbit.node, orbit.inclination])
+    cw, sw, cn, sn, ci, si = np.cos(w), np.sin(w), np.cos(node), np.sin(node), np.cos(inc), np.sin(inc)
+    rotation = np.array([[cw * cn - sw * sn * ci, -sw * cn - cw * sn * ci],
+                         [cw * sn + sw * cn * ci, -sw * sn + cw * cn * ci],
+                         [sw * si, cw * si]])
+    return rotation @ np.stack([x, y])
+
+
+def _coupling(calc, mass: float) -> float:
+    """β_eff(M) G M / c² [m]"""
+    beta = float(calc.beta_effective_batch(mass))
+    return beta * calc.constants.G_OVER_C2 * mass
+
+
+def clock_rates(calc, t_days, bodies: Sequence[str] = ('earth', 'mars'),
+                orbits: Optional[Dict[str, KeplerOrbit]] = None):
+    """
+    各天体钟的QST速率偏移 y_b(t) (无量纲)
+
+    参数:
+        calc: local 或 sparc_optimized 参数集的计算器
+        t_days: J2000 起算的天数
+        bodies: 天体名 (见 ORBITS，或 orbits 中给出)
+        orbits: 额外或替换的轨道根数
+
+    返回:
+        (len(bodies), n) 数组
+    """
+    orbits = {**ORBITS, **(orbits or {})}
+    unknown = [b for b in bodies if b not in orbits]
+    if unknown:
+        raise ValueError(f"未知天体: {unknown} (可选: {', '.join(orbits)})")
+    constants = calc.constants
+    length = calc.params['lambda_5th'] * constants.AU
+    t_days = np.asarray(t_days, dtype=float)
+    positions = [orbit_positions(orbits[b], t_days, constants) for b in bodies]
+    couplings = [_coupling(calc, orbits[b].mass) for b in bodies]
+    sun = _coupling(calc, constants.M_SUN)
+
+    rates = np.empty((len(bodies),) + t_days.shape)
+    for i, r in enumerate(positions):
+        d = np.sqrt(np.einsum('i...,i...->...', r, r))
+        rates[i] = -sun * np.exp(-d / length) / d
+        for j, other in enumerate(positions):
+            if j != i:
+                d = np.sqrt(np.einsum('i...,i...->...', r - other, r - other))
+                rates[i] -= couplings[j] * np.exp(-d / length) / d
+    return rates
+
+
+def clock_offset_series(calc, t_days, bodies: Sequence[str] = ('earth', 'mars'),
+                        reference: str = 'earth',
+                        orbits: Optional[Dict[str, KeplerOrbit]] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    时间分辨的钟速与累积钟差
+
+    参数:
+        calc: local 或 sparc_optimized 参数集的计算器
+        t_days: 单调不减的时刻 [J2000 起算天数]，一维
+        bodies: 天体名，须包含 reference
+        reference: 参考钟所在天体
+        orbits: 额外或替换的轨道根数
+        chunk_size: 分块长度，限制中间数组的内存
+
+    返回:
+        {'t': 时刻, 'bodies': 天体名,
+         'rate': (B, n) 钟速 [μs/天],
+         'relative_rate': (B, n) 相对参考钟的钟速 [μs/天],
+         'offset': (B, n) 自 t[0] 起相对参考钟的累积钟差 [μs]}
+    """
+    t_days = np.asarray(t_days, dtype=float)
+    if t_days.ndim != 1:
+        raise ValueError("t_days 须为一维数组")
+    if t_days.size > 1 and np.any(np.diff(t_days) < 0):
+        raise ValueError("t_days 须单调不减")
+    bodies = list(bodies)
+    if reference not in bodies:
+        raise ValueError(f"参考天体 {reference} 不在 bodies 中")
+    ref = bodies.index(reference)
+
+    n = t_days.size
+    rate = np.empty((len(bodies), n))
+    offset = np.empty((len(bodies), n))
+    carry = np.zeros(len(bodies))
+    previous = None
+    for lo in range(0, n, chunk_size):
+        hi = min(n, lo + chunk_size)
+        block = clock_rates(calc, t_days[lo:hi], bodies, orbits)
+        rate[:, lo:hi] = block
+        relative = block - block[ref]
+        # 梯形积分；块首与上一块末点之间的区间由 previous 接上
+        t_block = t_days[lo:hi]
+        if previous is None:
+            steps = np.zeros((len(bodies), hi - lo))
+        else:
+            t_prev, rel_prev = previous
+            steps = np.empty((len(bodies), hi - lo))
+            steps[:, 0] = 0.5 * (rel_prev + relative[:, 0]) * (t_block[0] - t_prev)
+        steps[:, 1:] = 0.5 * (relative[:, 1:] + relative[:, :-1]) * np.diff(t_block)
+        offset[:, lo:hi] = carry[:, None] + np.cumsum(steps, axis=1)
+        carry = offset[:, hi - 1].copy()
+        previous = (t_block[-1], relative[:, -1].copy())
+
+    rate *= MICROSECONDS_PER_DAY
+    offset *= MICROSECONDS_PER_DAY
+    return {'t': t_days, 'bodies': bodies, 'rate': rate,
+            'relative_rate': rate - rate[ref], 'offset': offset}
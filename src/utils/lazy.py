@@ -0,0 +1,55 @@
+"""
+量子时空统一理论 - 延迟导入工具
+
+NumPy/SciPy/Matplotlib 及模拟模块只在首次访问属性时才真正导入，
+使命令行短进程的启动时间保持在毫秒级。
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule(ModuleType):
+    """首次访问属性时才导入的模块代理"""
+
+    def __init__(self, name: str, setup: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__['_lazy_name'] = name
+        self.__dict__['_lazy_setup'] = setup
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            setup = self.__dict__['_lazy_setup']
+            if setup == 'agg':
+                # 批量绘图/无显示环境：在pyplot导入前固定Agg后端
+                import matplotlib
+                matplotlib.use('Agg')
+            module = importlib.import_module(self.__dict__['_lazy_name'])
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str, setup: Optional[str] = None) -> ModuleType:
+    """
+    返回延迟导入的模块
+
+    参数:
+        name: 模块全名，例如 'scipy.integrate'
+        setup: 可选的导入前准备，目前支持 'agg' (matplotlib非交互后端)
+
+    返回:
+        已导入时直接返回模块，否则返回LazyModule代理
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name, setup)
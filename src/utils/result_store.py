@@ -0,0 +1,278 @@
+"""
+量子时空统一理论 - 内容寻址的结果存储
+
+以 sha256(类别, 参数集, 配置, 代码版本) 为键，把一次运行的数组结果保存为 .npy
+(读取时内存映射) 加上 meta.json，相同参数的重复运行直接返回已有结果。
+
+目录结构:
+    <root>/objects/<键前2位>/<键>/{meta.json, <名称>.npy ...}
+    <root>/tmp/        写入中的条目与待删除的条目
+    <root>/.lock       淘汰时的进程间锁
+
+跨进程安全:
+    - 条目先完整写入 tmp/ 下的私有目录，再用一次 rename 发布；读者看不到半个条目。
+      两个进程同时写同一个键时先发布者生效，后者丢弃自己的副本。
+    - 每次命中更新 meta.json 的 mtime，淘汰时按 mtime 从旧到新删除，直到总大小不超过
+      max_bytes (LRU)；删除先把目录 rename 进 tmp/ 再递归删除。
+    - 已打开的内存映射在条目被淘汰后仍可读 (POSIX)；读取途中条目消失按未命中处理。
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 淘汰不加锁，rename 失败的条目跳过
+    fcntl = None
+
+
+DEFAULT_STORE_DIR = Path('.cache') / 'results'
+DEFAULT_MAX_BYTES = 4 << 30
+
+# tmp/ 中超过此时长 [s] 的目录视为崩溃进程的残留，淘汰时清除
+STALE_TMP_S = 3600.0
+
+_PACKAGE_ROOT = __name__.split('.')[0]
+_SOURCE_HASHES: Dict[str, str] = {}
+
+
+def code_version(modules: Sequence[str] = ()) -> str:
+    """
+    代码版本: 模块源码的 sha256 (按进程缓存)
+
+    参数:
+        modules: 模块名，相对包根 (例如 '.simulation.cosmic_evolution')
+    """
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        if name not in _SOURCE_HASHES:
+            module = importlib.import_module(name, _PACKAGE_ROOT)
+            with open(module.__file__, 'rb') as fh:
+                _SOURCE_HASHES[name] = hashlib.sha256(fh.read()).hexdigest()
+        digest.update(f"{name}:{_SOURCE_HASHES[name]}".encode())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """配置中的数组以内容哈希表示；数据类按字段展开"""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return {'dtype': array.dtype.str, 'shape': list(array.shape),
+                'sha256': hashlib.sha256(array.tobytes()).hexdigest()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    raise TypeError(f"无法用作结果键的配置值: {type(value).__name__}")
+
+
+def result_key(kind: str, param_set: str, config: Optional[Dict] = None,
+               modules: Sequence[str] = ()) -> str:
+    """
+    结果键
+
+    参数:
+        kind: 运行类别，例如 'cosmic'、'galaxies'
+        param_set: 参数集名
+        config: 影响结果的全部设置与输入 (可含数组、数据类)
+        modules: 计算所依赖的模块，其源码变化使键失效
+
+    返回:
+        64位十六进制 sha256
+    """
+    payload = json.dumps({'kind': kind, 'param_set': param_set, 'config': config or {},
+                          'code': code_version(modules)},
+                         sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class StoredResult:
+    """存储中的一条结果；数组为只读内存映射"""
+    key: str
+    arrays: Dict[str, np.ndarray]
+    metadata: Dict = field(default_factory=dict)
+    hit: bool = True
+
+
+class ResultStore:
+    """内容寻址的结果存储，按总大小做 LRU 淘汰"""
+
+    def __init__(self, root=DEFAULT_STORE_DIR, max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        """
+        参数:
+            root: 存储目录 (可由多个进程共享)
+            max_bytes: 总大小上限，写入后超出即淘汰最久未用的条目；None表示不限制
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes 不能为负")
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._objects = self.root / 'objects'
+        self._tmp = self.root / 'tmp'
+
+    def _path(self, key: str) -> Path:
+        if len(key) < 3 or not all(c in '0123456789abcdef' for c in key):
+            raise ValueError(f"无效的结果键: {key!r}")
+        return self._objects / key[:2] / key
+
+    def __contains__(self, key: str) -> bool:
+        return (self._path(key) / 'meta.json').exists()
+
+    def get(self, key: str) -> Optional[StoredResult]:
+        """读取结果并标记为最近使用；不存在时返回None"""
+        path = self._path(key)
+        try:
+            meta = json.loads((path / 'meta.json').read_text(encoding='utf-8'))
+            arrays = {name: np.load(path / f"{name}.npy",
+                                    mmap_mode='r' if np.prod(info['shape']) else None)
+                      for name, info in meta['arrays'].items()}
+            os.utime(path / 'meta.json')
+        except (OSError, ValueError, KeyError):
+            # 不存在、正被淘汰或已损坏: 一律按未命中处理
+            return None
+        return StoredResult(key, arrays, meta.get('metadata', {}))
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray],
+            metadata: Optional[Dict] = None) -> StoredResult:
+        """
+        保存结果 (已存在时保留已有条目)
+
+        参数:
+            key: result_key 返回的键
+            arrays: {名称: 数组}，名称须为合法标识符
+            metadata: 可JSON序列化的附加信息
+        """
+        path = self._path(key)
+        bad = [name for name in arrays if not str(name).isidentifier()]
+        if bad:
+            raise ValueError(f"数组名须为合法标识符: {bad}")
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        staging = self._tmp / f"{key}.{os.getpid()}.{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            info = {}
+            nbytes = 0
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                np.save(staging / f"{name}.npy", array)
+                info[name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+                nbytes += array.nbytes
+            meta = {'key': key, 'created': time.time(), 'nbytes': nbytes,
+                    'arrays': info, 'metadata': metadata or {}}
+            # meta.json 最后写入: 有它的目录即为完整条目
+            (staging / 'meta.json').write_text(json.dumps(meta, default=_json_default),
+                                              encoding='utf-8')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, path)
+            except OSError:
+                if not path.exists():
+                    raise
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        if self.max_bytes is not None:
+            self.evict()
+        result = self.get(key)
+        if result is None:
+            # 刚写入即被淘汰 (单条超过上限)：直接返回内存中的数组
+            result = StoredResult(key, dict(arrays), metadata or {})
+        result.hit = False
+        return result
+
+    def cached(self, key: str, compute: Callable[[], Dict[str, np.ndarray]],
+               metadata: Optional[Dict] = None) -> StoredResult:
+        """命中则读取，否则调用 compute() 并保存；返回值的 hit 表示是否命中"""
+        result = self.get(key)
+        if result is not None:
+            return result
+        return self.put(key, compute(), metadata)
+
+    @contextlib.contextmanager
+    def _lock(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / '.lock', 'a') as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _entries(self) -> List:
+        """(最近使用时间, 大小, 路径)，按时间从旧到新"""
+        entries = []
+        for path in self._objects.glob('*/*'):
+            try:
+                mtime = (path / 'meta.json').stat().st_mtime
+                size = sum(f.stat().st_size for f in path.iterdir())
+            except OSError:
+                continue
+            entries.append((mtime, size, path))
+        return sorted(entries)
+
+    def _remove(self, path: Path) -> bool:
+        trash = self._tmp / f"trash-{uuid.uuid4().hex}"
+        try:
+            self._tmp.mkdir(parents=True, exist_ok=True)
+            os.rename(path, trash)
+        except OSError:
+            return False
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        删除最久未用的条目直到总大小不超过上限
+
+        参数:
+            max_bytes: 上限，缺省为 self.max_bytes
+
+        返回:
+            被删除的键
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed = []
+        with self._lock():
+            now = time.time()
+            for stale in self._tmp.glob('*') if self._tmp.exists() else ():
+                with contextlib.suppress(OSError):
+                    if now - stale.stat().st_mtime > STALE_TMP_S:
+                        shutil.rmtree(stale, ignore_errors=True)
+            if limit is None:
+                return removed
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= limit:
+                    break
+                if self._remove(path):
+                    removed.append(path.name)
+                    total -= size
+        return removed
+
+    def stats(self) -> Dict:
+        """{'n_entries', 'nbytes', 'max_bytes'}"""
+        entries = self._entries()
+        return {'n_entries': len(entries), 'nbytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """删除全部条目"""
+        with self._lock():
+            for _, _, path in self._entries():
+                self._remove(path)
@@ -0,0 +1,141 @@
+"""
+量子时空统一理论 - 列式表格读写 (CSV / NPY / NPZ)
+
+表格统一表示为 {列名: 一维数组} 字典，批量计算接口直接使用这些列。
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+SUPPORTED_SUFFIXES = ('.csv', '.npy', '.npz')
+
+# CSV输出格式，保留足够有效数字
+CSV_FORMAT = '%.12g'
+
+
+def _suffix(path) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise ValueError(f"不支持的文件格式: {suffix} (支持 {', '.join(SUPPORTED_SUFFIXES)})")
+    return suffix
+
+
+def read_csv_header(path) -> list:
+    """读取CSV首行列名"""
+    with open(path, 'r', encoding='utf-8') as fh:
+        return [name.strip() for name in fh.readline().strip().split(',')]
+
+
+def parse_csv(source, header, skiprows: int = 0) -> Dict[str, np.ndarray]:
+    """
+    解析CSV数据行
+
+    参数:
+        source: 文件路径或数据行列表 (流式分块读取时)
+        header: 列名
+        skiprows: 跳过的首行数
+
+    返回:
+        {列名: 数组}；非数值列 (如星系名) 读为字符串
+    """
+    try:
+        data = np.loadtxt(source, delimiter=',', skiprows=skiprows, ndmin=2)
+    except ValueError:
+        return _read_mixed_csv(source, header, skiprows)
+    return {name: data[:, i] for i, name in enumerate(header)}
+
+
+def csv_rows(columns: Dict[str, np.ndarray]):
+    """
+    np.savetxt 所需的数据矩阵与格式
+
+    参数:
+        columns: {列名: 等长一维数组}
+
+    返回:
+        (data, fmt)；非数值列按 %s 写出
+    """
+    arrays = [np.asarray(col) for col in columns.values()]
+    text = [arr.dtype.kind in 'USO' for arr in arrays]
+    if any(text):
+        data = np.column_stack([arr.astype(object) for arr in arrays])
+        return data, ['%s' if is_text else CSV_FORMAT for is_text in text]
+    return np.column_stack([arr.astype(float) for arr in arrays]), CSV_FORMAT
+
+
+def _read_mixed_csv(source, header, skiprows) -> Dict[str, np.ndarray]:
+    """含非数值列 (如星系名) 的CSV: 按字符串读入，能转为浮点的列再转换"""
+    text = np.char.strip(np.loadtxt(source, delimiter=',', skiprows=skiprows,
+                                    ndmin=2, dtype=str))
+    columns = {}
+    for i, name in enumerate(header):
+        try:
+            columns[name] = text[:, i].astype(float)
+        except ValueError:
+            columns[name] = text[:, i]
+    return columns
+
+
+def read_table(path, names: Optional[Sequence[str]] = None,
+               mmap_mode: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    读取表格
+
+    参数:
+        path: .csv (首行为列名；非数值列读为字符串) / .npy (结构化数组或二维数组) / .npz
+        names: 二维普通 .npy 的列名；缺省为 col0, col1, ...
+        mmap_mode: 传给 np.load，用于大文件的内存映射读取
+
+    返回:
+        {列名: 数组}
+    """
+    suffix = _suffix(path)
+    if suffix == '.csv':
+        return parse_csv(path, read_csv_header(path), skiprows=1)
+    if suffix == '.npz':
+        with np.load(path) as archive:
+            return {key: archive[key] for key in archive.files}
+
+    array = np.load(path, mmap_mode=mmap_mode)
+    if array.dtype.names:
+        return {name: array[name] for name in array.dtype.names}
+    if array.ndim == 1:
+        array = array[:, None]
+    if names is None:
+        names = [f'col{i}' for i in range(array.shape[1])]
+    if len(names) != array.shape[1]:
+        raise ValueError(f"列名数量 {len(names)} 与数组列数 {array.shape[1]} 不符")
+    return {name: array[:, i] for i, name in enumerate(names)}
+
+
+def to_structured(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """列字典转为结构化数组"""
+    arrays = [np.asarray(col) for col in columns.values()]
+    dtype = [(name, arr.dtype) for name, arr in zip(columns, arrays)]
+    out = np.empty(len(arrays[0]) if arrays else 0, dtype=dtype)
+    for name, arr in zip(columns, arrays):
+        out[name] = arr
+    return out
+
+
+def write_table(path, columns: Dict[str, np.ndarray]):
+    """
+    写出表格，格式由扩展名决定
+
+    参数:
+        path: .csv / .npy (结构化数组) / .npz
+        columns: {列名: 等长一维数组}
+    """
+    suffix = _suffix(path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if suffix == '.csv':
+        data, fmt = csv_rows(columns)
+        np.savetxt(path, data, delimiter=',', header=','.join(columns),
+                   comments='', fmt=fmt)
+    elif suffix == '.npz':
+        np.savez(path, **columns)
+    else:
+        np.save(path, to_structured(columns))
@@ -0,0 +1,119 @@
+"""
+批量 (向量化) 接口测试 - 与标量方法逐点比较
+"""
+
+import numpy as np
+import pytest
+from src.core.kernels import FLOAT32_ERROR_BOUNDS, resolve_dtype
+from src.core.qst_calculator import QSTCalculator
+from src.utils.table_io import read_table, write_table
+
+
+# 覆盖β_eff各区间及边界的质量比
+X_GRID = np.array([1e-7, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.3, 0.5, 0.6,
+                   0.8, 0.9, 1.0, 1.5, 2.0, 3.0, 100.0])
+SIGMA_GRID = np.array([1e-4, 0.001, 0.005, 0.05, 0.2, 0.4, 0.5, 1.0, 2.0, 2.5,
+                       3.0, 7.0, 20.0, 60.0])
+
+
+class TestBatchAgreement:
+    """批量接口与标量接口一致"""
+
+    def test_beta_effective_batch(self):
+        calc = QSTCalculator('sparc_optimized')
+        M = X_GRID * calc.params['M_th']
+        expected = [calc.beta_effective(m) for m in M]
+        np.testing.assert_allclose(calc.beta_effective_batch(M), expected, rtol=0, atol=1e-15)
+
+    @pytest.mark.parametrize("param_set", ['sparc_optimized', 'local'])
+    def test_a0_ratio_batch(self, param_set):
+        calc = QSTCalculator(param_set)
+        expected = [calc.effective_a0_ratio(s) for s in SIGMA_GRID]
+        np.testing.assert_allclose(calc.effective_a0_ratio_batch(SIGMA_GRID), expected,
+                                   rtol=1e-14, atol=1e-15)
+
+    def test_galaxy_rotation_batch(self):
+        calc = QSTCalculator('sparc_optimized')
+        rng = np.random.default_rng(0)
+        M = 10**rng.uniform(7, 12, 200)
+        R = rng.uniform(0.5, 20.0, 200)
+        v, a = calc.galaxy_rotation_velocity_batch(M, R)
+        for i in range(0, 200, 17):
+            v_ref, a_ref = calc.galaxy_rotation_velocity(M[i], R[i])
+            assert abs(v[i] - v_ref) < 1e-10 * v_ref
+            assert abs(a[i] - a_ref) < 1e-12
+
+    def test_explicit_sigma_broadcast(self):
+        calc = QSTCalculator('sparc_optimized')
+        v, a = calc.galaxy_rotation_velocity_batch(np.array([1e9, 2e9]), 2.0, 0.4)
+        v_ref, _ = calc.galaxy_rotation_velocity(1e9, 2.0, 0.4)
+        assert abs(v[0] - v_ref) < 1e-10
+        assert np.all(a == 0.015)
+
+    def test_batch_requires_local_parameters(self):
+        with pytest.raises(ValueError):
+            QSTCalculator('effective').beta_effective_batch(np.ones(3))
+
+
+class TestFloat32:
+    """float32 精度策略"""
+
+    @pytest.mark.parametrize("param_set", ['sparc_optimized', 'local'])
+    def test_error_bounds(self, param_set):
+        """float32 结果在文档给出的误差界内"""
+        calc = QSTCalculator(param_set)
+        rng = np.random.default_rng(1)
+        M = 10**rng.uniform(6, 12.5, 100000)
+        R = rng.uniform(0.1, 30.0, 100000)
+        reference = calc.evaluate_galaxies_batch(M, R)
+        result = calc.evaluate_galaxies_batch(M, R, dtype='float32')
+        for name, (rtol, atol) in FLOAT32_ERROR_BOUNDS.items():
+            assert result[name].dtype == np.float32
+            np.testing.assert_allclose(result[name], reference[name], rtol=rtol, atol=atol)
+
+    def test_no_overflow_for_massive_galaxies(self):
+        """M[kg] 超出float32范围时仍可计算"""
+        calc = QSTCalculator('sparc_optimized')
+        v = calc.galaxy_rotation_velocity_batch(np.array([1e12, 1e13]), 10.0, dtype='float32')[0]
+        assert np.all(np.isfinite(v))
+
+    def test_resolve_dtype(self):
+        assert resolve_dtype(None) is np.float64
+        assert resolve_dtype(np.float32) is np.float32
+        with pytest.raises(ValueError):
+            resolve_dtype('float16')
+
+
+class TestTableIO:
+    """CSV/NPY/NPZ读写"""
+
+    @pytest.mark.parametrize("suffix", ['.csv', '.npy', '.npz'])
+    def test_roundtrip(self, tmp_path, suffix):
+        columns = {'M_baryon': np.array([1e9, 2e10]), 'R_disk': np.array([2.0, 5.5])}
+        path = tmp_path / f"table{suffix}"
+        write_table(path, columns)
+        loaded = read_table(path)
+        assert list(loaded) == list(columns)
+        for name in columns:
+            np.testing.assert_allclose(loaded[name], columns[name])
+
+    @pytest.mark.parametrize("suffix", ['.csv', '.npy', '.npz'])
+    def test_string_column(self, tmp_path, suffix):
+        """星系名等字符串列原样读回，数值列仍为浮点"""
+        columns = {'name': np.array(['NGC 3198', 'DDO154']), 'M_baryon': np.array([1e9, 2e10])}
+        path = tmp_path / f"table{suffix}"
+        write_table(path, columns)
+        loaded = read_table(path)
+        assert list(loaded['name']) == ['NGC 3198', 'DDO154']
+        assert loaded['M_baryon'].dtype == float
+        np.testing.assert_allclose(loaded['M_baryon'], columns['M_baryon'])
+
+    def test_plain_npy_with_names(self, tmp_path):
+        path = tmp_path / "plain.npy"
+        np.save(path, np.array([[1e9, 2.0], [2e9, 3.0]]))
+        loaded = read_table(path, names=['M_baryon', 'R_disk'])
+        np.testing.assert_allclose(loaded['R_disk'], [2.0, 3.0])
+
+    def test_unsupported_suffix(self, tmp_path):
+        with pytest.raises(ValueError):
+            read_table(tmp_path / "table.txt")
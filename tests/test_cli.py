@@ -0,0 +1,116 @@
+"""
+qst 命令行测试
+"""
+
+import numpy as np
+import pytest
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+from src.simulation.cosmic_evolution import CosmicEvolver
+from src.utils.table_io import read_table, write_table
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    columns = {
+        'M_baryon': np.array([1e8, 1e9, 5e10]),
+        'R_disk': np.array([1.0, 2.0, 8.0]),
+        'v_obs': np.array([20.0, 35.0, 150.0]),
+    }
+    path = tmp_path / "catalog.csv"
+    write_table(path, columns)
+    return path, columns
+
+
+class TestCLI:
+    """测试各子命令"""
+
+    @pytest.mark.parametrize("suffix", ['.csv', '.npy'])
+    def test_evaluate(self, catalog, tmp_path, suffix):
+        path, columns = catalog
+        out = tmp_path / f"out{suffix}"
+        assert main(['evaluate', str(path), '-o', str(out), '--keep-input']) == 0
+
+        result = read_table(out)
+        calc = QSTCalculator('sparc_optimized')
+        for i in range(3):
+            v_ref, a_ref = calc.galaxy_rotation_velocity(columns['M_baryon'][i],
+                                                         columns['R_disk'][i])
+            assert abs(result['v_rot'][i] - v_ref) < 1e-8 * v_ref
+            assert abs(result['a_ratio'][i] - a_ref) < 1e-10
+        assert 'M_baryon' in result
+
+    def test_evaluate_missing_column(self, catalog, tmp_path):
+        path, _ = catalog
+        with pytest.raises(SystemExit):
+            main(['evaluate', str(path), '-o', str(tmp_path / 'o.csv'), '--mass-col', 'M'])
+
+    def test_galaxy(self, catalog, tmp_path, capsys):
+        path, _ = catalog
+        out = tmp_path / "galaxy.csv"
+        assert main(['galaxy', str(path), '-o', str(out)]) == 0
+        assert '"n_galaxies": 3' in capsys.readouterr().out
+        assert 'pct_error' in read_table(out)
+
+    def test_plots(self, catalog, tmp_path, capsys):
+        path, _ = catalog
+        out = tmp_path / "figures"
+        assert main(['plots', str(path), '-o', str(out)]) == 0
+        assert '绘制 6 张' in capsys.readouterr().out
+        assert (out / 'galaxy' / '000000.png').exists()
+        assert (out / 'diagnostics' / 'residuals.png').exists()
+        assert main(['plots', str(path), '-o', str(out)]) == 0
+        assert '跳过 6 张' in capsys.readouterr().out
+
+    def test_plots_name_col(self, tmp_path):
+        path = tmp_path / "named.csv"
+        path.write_text("name,M_baryon,R_disk\nNGC3198,3e10,3.0\nDDO154,4e8,1.0\n")
+        out = tmp_path / "figures"
+        assert main(['plots', str(path), '-o', str(out), '--name-col', 'name']) == 0
+        assert sorted(p.name for p in (out / 'galaxy').iterdir()) == ['DDO154.png', 'NGC3198.png']
+
+    def test_report(self, tmp_path):
+        out = tmp_path / "report.md"
+        assert main(['report', '-o', str(out), '--cache-dir', str(tmp_path / 'cache'),
+                     '--n-points', '200']) == 0
+        text = out.read_text(encoding='utf-8')
+        assert 'Ω_DE (解析, V/ρ_crit) = 0.690309' in text
+
+    def test_cosmic(self, tmp_path):
+        out = tmp_path / "cosmic.npz"
+        assert main(['cosmic', '--n-points', '200', '-o', str(out)]) == 0
+        result = read_table(out)
+        assert abs(result['Omega_DE'][-1] - 0.690309) < 1e-3
+
+
+class TestCosmicEvolver:
+    """宇宙背景演化"""
+
+    def test_today_values(self):
+        evolver = CosmicEvolver('effective', N_points=300)
+        results = evolver.evolve()
+        assert evolver.check_results(results)
+        assert abs(results['H'][-1] - 1.0) < 1e-3
+        assert results['w_DE'][-1] < -0.99
+        # 早期物质/辐射主导
+        assert results['Omega_DE'][0] < 1e-6
+
+    def test_requires_background_parameters(self):
+        with pytest.raises(ValueError):
+            CosmicEvolver('local')
+
+    def test_float32_grid(self):
+        """float32 输出网格与float64一致到 1e-6"""
+        reference = CosmicEvolver('effective', N_points=300, N_range=(-20.0, 0.0)).evolve()
+        evolver = CosmicEvolver('effective', N_points=300, N_range=(-20.0, 0.0),
+                                dtype='float32')
+        results = evolver.evolve()
+        assert evolver.check_results(results)
+        for key, value in results.items():
+            assert value.dtype == np.float32
+            np.testing.assert_allclose(value, reference[key], rtol=1e-6)
+
+    def test_float32_overflow_raises(self):
+        """ρ_r 在 N=-30 时超出float32范围"""
+        with pytest.raises(ValueError):
+            CosmicEvolver('effective', N_points=50, dtype='float32').evolve()
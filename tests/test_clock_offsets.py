@@ -0,0 +1,86 @@
+"""
+时间分辨钟差测试
+"""
+
+import numpy as np
+import pytest
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+from src.simulation.clock_offsets import (ORBITS, KeplerOrbit, clock_offset_series,
+                                          orbit_positions, solve_kepler)
+from src.utils.table_io import read_table
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+def _circular(a):
+    return KeplerOrbit(1.0, a=a, e=0.0, inclination=0.0, node=0.0, arg_perihelion=0.0,
+                       mean_anomaly=0.0)
+
+
+class TestOrbits:
+    """测试开普勒求解与轨道位置"""
+
+    def test_kepler_residual(self):
+        M = np.linspace(-10.0, 10.0, 10001)
+        for e in (0.0, 0.0934, 0.7):
+            E = solve_kepler(M, e)
+            residual = E - e * np.sin(E) - np.remainder(M, 2 * np.pi)
+            assert np.max(np.abs(residual)) < 1e-12
+        with pytest.raises(ValueError):
+            solve_kepler(M, 1.0)
+
+    def test_j2000_positions(self, calc):
+        """J2000 时刻: 地球近日点附近 (0.9833 AU)，火星约 1.391 AU"""
+        AU = calc.constants.AU
+        earth = orbit_positions(ORBITS['earth'], [0.0]) / AU
+        mars = orbit_positions(ORBITS['mars'], [0.0]) / AU
+        assert abs(np.linalg.norm(earth) - 0.9833) < 1e-3
+        np.testing.assert_allclose(mars[:, 0], [1.3907, -0.0134, -0.0345], atol=2e-3)
+
+
+class TestClockOffsets:
+    """测试钟速与累积钟差"""
+
+    def test_consistent_with_constant(self, calc):
+        """一个会合周期上的平均钟速差 ≈ β_eff(M_sun)/β₀ × mars_time_delay"""
+        t = np.linspace(0.0, 780.0 * 4, 40001)
+        series = clock_offset_series(calc, t)
+        f_sun = calc.beta_effective_batch(calc.constants.M_SUN) / calc.params['beta0']
+        mean_rate = series['relative_rate'][1].mean()
+        assert abs(mean_rate / (f_sun * calc.mars_time_delay()) - 1.0) < 0.01
+        assert np.all(series['relative_rate'][0] == 0.0)
+        assert series['offset'][1, 0] == 0.0
+
+    def test_circular_orbits_accumulate_linearly(self, calc):
+        orbits = {'inner': _circular(1.0), 'outer': _circular(1.5)}
+        t = np.linspace(0.0, 100.0, 1001)
+        series = clock_offset_series(calc, t, bodies=('inner', 'outer'), reference='inner',
+                                     orbits=orbits)
+        rate = series['relative_rate'][1]
+        assert np.ptp(rate) < 1e-6 * rate.mean()
+        assert abs(series['offset'][1, -1] - rate[0] * 100.0) < 1e-9 * abs(rate[0] * 100.0)
+
+    def test_chunking_matches(self, calc):
+        t = np.sort(np.random.default_rng(1).uniform(-500.0, 3000.0, 5000))
+        full = clock_offset_series(calc, t, bodies=('earth', 'mars'))
+        chunked = clock_offset_series(calc, t, bodies=('earth', 'mars'), chunk_size=333)
+        np.testing.assert_allclose(chunked['rate'], full['rate'], rtol=1e-14)
+        np.testing.assert_allclose(chunked['offset'], full['offset'], rtol=1e-12, atol=1e-9)
+
+    def test_invalid(self, calc):
+        with pytest.raises(ValueError):
+            clock_offset_series(calc, [2.0, 1.0])
+        with pytest.raises(ValueError):
+            clock_offset_series(calc, [0.0], bodies=('mars',), reference='earth')
+        with pytest.raises(ValueError):
+            clock_offset_series(calc, [0.0], bodies=('earth', 'venus'))
+
+    def test_cli(self, tmp_path):
+        out = tmp_path / 'clocks.npz'
+        assert main(['clocks', '--days', '10', '--step', '0.5', '-o', str(out)]) == 0
+        table = read_table(out)
+        assert table['t'].size == 21 and 'offset:mars' in table and 'rate:earth' in table
@@ -0,0 +1,77 @@
+"""
+多版本模型对比测试
+"""
+
+import numpy as np
+import pytest
+from src.analysis import comparison
+from src.analysis.comparison import compare_models, get_model, to_columns
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+from src.core.qst_calculator_v41 import QSTCalculator_v41
+from src.utils.table_io import read_table, write_table
+
+
+def _sample(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return 10**rng.uniform(-3, 12.5, n), rng.uniform(0.1, 20.0, n)
+
+
+class TestCompareModels:
+    """测试对比结果与各版本计算器一致"""
+
+    def test_shapes(self):
+        M, R = _sample()
+        result = compare_models(M, R)
+        assert result['versions'] == ['v4.1', 'v4.5', 'v4.5-compat']
+        for quantity in ('beta_eff', 'a_ratio', 'v_rot'):
+            assert result[quantity].shape == (3, M.size)
+        assert result['mars_delay'].shape == (3,)
+
+    def test_rows_match_calculators(self):
+        M, R = _sample()
+        result = compare_models(M, R)
+        for row, param_set in ((1, 'sparc_optimized'), (2, 'local')):
+            expected = QSTCalculator(param_set).evaluate_galaxies_batch(M, R)
+            for quantity in ('beta_eff', 'a_ratio', 'v_rot'):
+                np.testing.assert_allclose(result[quantity][row], expected[quantity],
+                                           rtol=1e-12, atol=1e-15)
+
+    def test_v41_beta_segment(self):
+        """v4.1 保留 x < 1e-6 时 β_eff = 0 的区间"""
+        v41 = QSTCalculator_v41('local')
+        M_SUN = v41.constants.M_SUN
+        x = np.array([1e-8, 5e-7, 1e-6, 0.0005, 0.005, 0.3, 0.9, 1.5, 3.0])
+        M = x * v41.params['M_th'] / M_SUN
+        result = compare_models(M, sigma=1.0, versions=['v4.1'], quantities=['beta_eff'])
+        expected = [v41.beta_effective(m * M_SUN) for m in M]
+        np.testing.assert_allclose(result['beta_eff'][0], expected, rtol=1e-12, atol=1e-15)
+        assert np.all(result['beta_eff'][0][:2] == 0.0)
+        assert result['mars_delay'][0] == pytest.approx(v41.mars_time_delay())
+
+    def test_inputs_converted_once(self, monkeypatch):
+        """σ只计算一次，相同曲线的版本共享结果"""
+        calls = []
+        original = comparison.kernels.surface_density
+        monkeypatch.setattr(comparison.kernels, 'surface_density',
+                            lambda *a, **k: calls.append(1) or original(*a, **k))
+        M, R = _sample()
+        compare_models(M, R, versions=['v4.1', 'v4.5', 'v4.5-compat'])
+        assert len(calls) == 1
+
+    def test_unknown_version(self):
+        with pytest.raises(ValueError):
+            get_model('v3.0')
+        with pytest.raises(ValueError):
+            compare_models(np.ones(3), np.ones(3), quantities=['chi2'])
+
+    def test_cli(self, tmp_path):
+        M, R = _sample(50)
+        src = tmp_path / "cat.csv"
+        write_table(src, {'M_baryon': M, 'R_disk': R})
+        out = tmp_path / "cmp.npy"
+        assert main(['compare', str(src), '-o', str(out), '--versions', 'v4.1,v4.5']) == 0
+        table = read_table(out)
+        expected = to_columns(compare_models(M, R, versions=['v4.1', 'v4.5']))
+        assert list(table) == list(expected)
+        np.testing.assert_allclose(table['v_rot:v4.5'], expected['v_rot:v4.5'])
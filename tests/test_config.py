@@ -0,0 +1,147 @@
+"""
+配置加载测试
+"""
+
+import pickle
+from pathlib import Path
+
+import pytest
+from src.core.qst_calculator import QSTCalculator
+from src.utils import config as config_module
+from src.utils.config import RunConfig, load_config, load_raw
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+ALL_FILES = [CONFIG_DIR / name for name in
+             ('example_config.yaml', 'qst_params.yaml', 'simulation_config.yaml',
+              'plot_config.yaml')]
+
+
+class TestLoadConfig:
+    """测试配置解析与校验"""
+
+    def test_repository_configs(self, tmp_path):
+        """仓库中的配置文件均可加载，后者覆盖前者"""
+        cfg = load_config(*ALL_FILES, cache_dir=tmp_path)
+        assert cfg.qst.as_dict()['beta0'] == 0.8
+        assert cfg.qst.as_dict()['M_th'] == 1e22  # YAML中 1.0e22 被读为字符串
+        assert cfg.cosmic_evolution.N_range == (-30.0, 0.0)
+        assert cfg.cosmic_evolution.solver == 'DOP853'
+        assert cfg.visualization.figure_size == (10.0, 6.0)
+        assert cfg.output.formats == ('png', 'pdf')
+
+    def test_frozen(self, tmp_path):
+        cfg = load_config(CONFIG_DIR / 'example_config.yaml', cache_dir=tmp_path)
+        with pytest.raises(Exception):
+            cfg.cosmology.H0 = 70.0
+
+    def test_build_calculator(self, tmp_path):
+        """配置参数写入计算器，未出现在参数集中的项被忽略"""
+        cfg = load_config(*ALL_FILES, cache_dir=tmp_path)
+        calc = cfg.build_calculator('sparc_optimized')
+        default = QSTCalculator('sparc_optimized')
+        assert calc.params == default.params
+
+        local = cfg.build_calculator('local')
+        assert local.params['beta0'] == 0.8
+        assert 'sigma_crit' not in local.params
+
+    def test_with_overrides(self, tmp_path):
+        """参数覆盖不修改原配置"""
+        cfg = load_config(*ALL_FILES, cache_dir=tmp_path)
+        swept = cfg.with_overrides(beta0=0.5)
+        assert swept.qst.as_dict()['beta0'] == 0.5
+        assert cfg.qst.as_dict()['beta0'] == 0.8
+        assert swept.build_calculator('sparc_optimized').params['beta0'] == 0.5
+
+    def test_unknown_override(self):
+        with pytest.raises(ValueError):
+            QSTCalculator('effective', overrides={'beta0': 0.5})
+
+    @pytest.mark.parametrize("text", [
+        "qst_parameters:\n  galaxy:\n    sigma_crit: 3.0\n    sigma_transition: 2.5\n",
+        "qst_parameters:\n  fifth_force:\n    M_th: -1\n",
+        "qst_parameters:\n  fifth_force:\n    beta0: abc\n",
+        "simulation:\n  cosmic_evolution:\n    N_range: [0, -30]\n",
+        "simulation:\n  cosmic_evolution:\n    solver: euler\n",
+        "simulation:\n  cosmic_evolution:\n    N_range: [-30, 1]\n",
+        "- 1\n- 2\n",
+    ])
+    def test_invalid(self, tmp_path, text):
+        path = tmp_path / 'bad.yaml'
+        path.write_text(text, encoding='utf-8')
+        with pytest.raises(ValueError):
+            load_config(path, cache_dir=None)
+
+    def test_unknown_keys_warn(self, tmp_path):
+        """拼错的键给出带完整路径的警告，其余配置照常加载"""
+        path = tmp_path / 'typo.yaml'
+        path.write_text("qst_parameters:\n  fifth_force:\n    beta_0: 0.5\n"
+                        "simulaton:\n  x: 1\n", encoding='utf-8')
+        with pytest.warns(UserWarning, match=r'qst_parameters\.fifth_force\.beta_0.*simulaton'):
+            cfg = load_config(path, cache_dir=None)
+        assert cfg.qst.as_dict() == {}
+
+    def test_build_calculator_constructs_once(self, tmp_path, monkeypatch):
+        cfg = load_config(*ALL_FILES, cache_dir=tmp_path)
+        calls = []
+        init = QSTCalculator.__init__
+
+        def counting_init(self, *args, **kwargs):
+            calls.append(args)
+            init(self, *args, **kwargs)
+
+        monkeypatch.setattr(QSTCalculator, '__init__', counting_init)
+        assert cfg.build_calculator('local').params['beta0'] == 0.8
+        assert len(calls) == 1
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.yaml'
+        path.write_text('', encoding='utf-8')
+        assert load_config(path, cache_dir=None) == RunConfig(source=(str(path),))
+
+
+class TestConfigCache:
+    """测试两级缓存"""
+
+    def test_disk_cache_skips_yaml(self, tmp_path, monkeypatch):
+        """磁盘缓存命中时不再调用YAML解析"""
+        path = tmp_path / 'cfg.yaml'
+        path.write_text("cosmology:\n  H0: 70.0\n", encoding='utf-8')
+        cache_dir = tmp_path / 'cache'
+        load_raw(path, cache_dir)
+        assert len(list(cache_dir.glob('*.json'))) == 1
+
+        config_module.clear_memory_cache()
+        monkeypatch.setattr(config_module.yaml, 'safe_load',
+                            lambda *_: pytest.fail("不应重新解析YAML"))
+        assert load_raw(path, cache_dir) == {'cosmology': {'H0': 70.0}}
+
+    def test_corrupt_or_unsafe_cache_is_miss(self, tmp_path):
+        """损坏的缓存按未命中处理；非JSON可表示的配置不写磁盘缓存"""
+        path = tmp_path / 'cfg.yaml'
+        path.write_text("cosmology:\n  H0: 70.0\n", encoding='utf-8')
+        cache_dir = tmp_path / 'cache'
+        load_raw(path, cache_dir)
+        for content in (b'\x80\x04garbage', b'[1, 2]', b'{"cosmology": '):
+            next(cache_dir.glob('*.json')).write_bytes(content)
+            config_module.clear_memory_cache()
+            assert load_raw(path, cache_dir) == {'cosmology': {'H0': 70.0}}
+
+        dated = tmp_path / 'dated.yaml'
+        dated.write_text("run:\n  date: 2024-01-01\n  1: one\n", encoding='utf-8')
+        other = tmp_path / 'other'
+        assert load_raw(dated, other)['run'][1] == 'one'
+        assert not other.exists()
+
+    def test_modified_file_reparsed(self, tmp_path):
+        """文件内容变化后重新解析"""
+        path = tmp_path / 'cfg.yaml'
+        path.write_text("cosmology:\n  H0: 70.0\n", encoding='utf-8')
+        assert load_config(path, cache_dir=tmp_path).cosmology.H0 == 70.0
+        path.write_text("cosmology:\n  H0: 68.00\n", encoding='utf-8')
+        assert load_config(path, cache_dir=tmp_path).cosmology.H0 == 68.0
+
+    def test_config_picklable(self, tmp_path):
+        """配置对象可传给工作进程"""
+        cfg = load_config(*ALL_FILES, cache_dir=tmp_path)
+        assert pickle.loads(pickle.dumps(cfg)) == cfg
@@ -0,0 +1,86 @@
+"""
+表面密度轮廓旋转曲线测试
+"""
+
+import numpy as np
+import pytest
+from scipy import special
+from src.analysis.disk_rotation import disk_acceleration, hankel_transform, rotation_curve
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+def _exponential_disks(n_galaxies=5, seed=0):
+    rng = np.random.default_rng(seed)
+    R_d = rng.uniform(1.0, 5.0, (n_galaxies, 1))
+    sigma0 = 10**rng.uniform(-1.0, 1.5, (n_galaxies, 1))
+    R = np.geomspace(0.05, 15.0, 200) * R_d
+    return R, sigma0 * np.exp(-R / R_d), R_d, sigma0
+
+
+class TestHankel:
+    """测试 FFTLog Hankel 变换"""
+
+    def test_gaussian_pair(self):
+        """∫ e^(−r²/2) J₀(kr) r dr = e^(−k²/2)；∫ r e^(−r²/2) J₁(kr) r dr = k e^(−k²/2)"""
+        r = np.geomspace(1e-6, 1e6, 4096)
+        k, F0 = hankel_transform(r, np.exp(-r**2 / 2), mu=0.0)
+        inside = (k > 1e-2) & (k < 4.0)
+        np.testing.assert_allclose(F0[inside], np.exp(-k[inside]**2 / 2), atol=1e-6)
+        k, F1 = hankel_transform(r, r * np.exp(-r**2 / 2), mu=1.0)
+        np.testing.assert_allclose(F1[inside], k[inside] * np.exp(-k[inside]**2 / 2),
+                                   atol=1e-6)
+
+
+class TestDiskAcceleration:
+    """测试薄盘牛顿加速度"""
+
+    def test_exponential_disk(self, calc):
+        """与 Freeman 指数盘的解析解一致"""
+        R, sigma, R_d, sigma0 = _exponential_disks()
+        result = disk_acceleration(R, sigma, calc.constants)
+        c = calc.constants
+        y = R / (2 * R_d)
+        v2 = (4 * np.pi * c.G * sigma0 * 1e9 * c.M_SUN / c.KPC**2 * R_d * c.KPC * y**2
+              * (special.i0(y) * special.k0(y) - special.i1(y) * special.k1(y)))
+        np.testing.assert_allclose(result['g_N'], v2 / (R * c.KPC), rtol=2e-3)
+        M = 2 * np.pi * sigma0 * 1e9 * R_d**2 * (1 - np.exp(-R / R_d) * (1 + R / R_d))
+        np.testing.assert_allclose(result['M_enclosed'], M, rtol=1e-3)
+
+    def test_batch_matches_single(self, calc):
+        R, sigma, _, _ = _exponential_disks()
+        batch = disk_acceleration(R, sigma, calc.constants)
+        for i in range(R.shape[0]):
+            single = disk_acceleration(R[i], sigma[i], calc.constants)
+            np.testing.assert_allclose(single['g_N'], batch['g_N'][i], rtol=1e-10)
+
+    def test_invalid(self, calc):
+        with pytest.raises(ValueError):
+            disk_acceleration([1.0, 1.0, 2.0], [1.0, 1.0, 1.0], calc.constants)
+        with pytest.raises(ValueError):
+            disk_acceleration([0.0, 1.0], [1.0, 1.0], calc.constants)
+
+
+class TestRotationCurve:
+    """测试逐半径的 QST 修正"""
+
+    def test_modifications(self, calc):
+        R, sigma, _, _ = _exponential_disks()
+        curve = rotation_curve(calc, R, sigma)
+        np.testing.assert_allclose(curve['a_ratio'], calc.effective_a0_ratio_batch(sigma))
+        np.testing.assert_allclose(curve['beta_eff'],
+                                   calc.beta_effective_batch(curve['M_enclosed'],
+                                                             mass_unit=calc.constants.M_SUN))
+        assert np.all(curve['v_rot'] > curve['v_newton'])
+
+    def test_flat_limit(self, calc):
+        """外盘 v⁴ → 2 G M a₀ a_ratio (1+β)，即 galaxy_rotation_velocity 的公式"""
+        R = np.geomspace(0.05, 2000.0, 400)
+        curve = rotation_curve(calc, R, 1.0 * np.exp(-R), n_grid=4096)
+        M = curve['M_enclosed'][-1]
+        v_flat, _ = calc.galaxy_rotation_velocity(M, 1.0, sigma=1.0 * np.exp(-R[-1]))
+        assert abs(curve['v_rot'][-1] / v_flat - 1.0) < 0.01
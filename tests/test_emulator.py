@@ -0,0 +1,82 @@
+"""
+宇宙背景预计算表测试
+"""
+
+import numpy as np
+import pytest
+from src.simulation.emulator import (EMULATOR_AXES, OBSERVABLES, CosmicEmulator,
+                                     background_observables, build_emulator)
+
+# 窄范围的小表，建表只需数秒
+RANGES = {'m_phi': (0.06, 0.1), 'm_omega': (0.04, 0.08), 'mu': (0.0, 0.01),
+          'V_const': (2.0, 2.1)}
+
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp('emulator')
+    meta = build_emulator(path, ranges=RANGES, z_max=3.0, n_z=48, max_nodes=5,
+                          n_validation=6, N_start=-20.0)
+    return path, meta
+
+
+class TestEmulator:
+    """测试建表与插值"""
+
+    def test_layout(self, table):
+        path, meta = table
+        emulator = CosmicEmulator(path)
+        assert isinstance(emulator.values, np.memmap)
+        assert emulator.values.shape == ((len(OBSERVABLES),)
+                                         + tuple(len(meta['axes'][n]) for n in EMULATOR_AXES)
+                                         + (48,))
+        assert set(emulator.error_bounds) == set(OBSERVABLES)
+
+    def test_exact_on_nodes(self, table):
+        """网格节点上返回求解器结果"""
+        path, meta = table
+        emulator = CosmicEmulator(path)
+        params = {name: float(np.sqrt(meta['axes'][name][1])) if name != 'V_const'
+                  else meta['axes'][name][1] for name in EMULATOR_AXES}
+        N = np.asarray(meta['N'])
+        exact = background_observables(params, N, N_start=-20.0)
+        result = emulator.evaluate(np.expm1(-N), **params)
+        for row, name in enumerate(OBSERVABLES):
+            np.testing.assert_allclose(result[name], exact[row], rtol=1e-10)
+
+    def test_within_error_bounds(self, table):
+        """网格外的参数与红移上，误差与建表时测得的误差界同量级"""
+        path, _ = table
+        emulator = CosmicEmulator(path)
+        rng = np.random.default_rng(7)
+        params = {name: rng.uniform(*RANGES[name]) for name in EMULATOR_AXES}
+        z = np.array([0.0, 0.37, 1.21, 2.9])
+        exact = background_observables(params, -np.log1p(z)[::-1], N_start=-20.0)[:, ::-1]
+        result = emulator.evaluate(z, **params)
+        bounds = emulator.error_bounds
+        assert np.max(np.abs(result['Omega_DE'] - exact[0])) <= 3 * bounds['Omega_DE'] + 1e-9
+        assert np.max(np.abs(result['H'] / exact[1] - 1)) <= 3 * bounds['H'] + 1e-9
+        assert bounds['Omega_DE'] < 1e-3
+
+    def test_vectorized_broadcast(self, table):
+        path, _ = table
+        emulator = CosmicEmulator(path)
+        m_phi = np.linspace(0.06, 0.1, 5)[:, None]
+        z = np.linspace(0.0, 3.0, 7)[None, :]
+        result = emulator.evaluate(z, m_phi=m_phi, observables=['H'])
+        assert result['H'].shape == (5, 7)
+        assert np.all(np.diff(result['H'], axis=1) > 0)
+
+    def test_out_of_range(self, table):
+        path, _ = table
+        emulator = CosmicEmulator(path)
+        with pytest.raises(ValueError):
+            emulator.evaluate(0.5, m_phi=0.2)
+        with pytest.raises(ValueError):
+            emulator.evaluate(4.0)
+        with pytest.raises(ValueError):
+            emulator.evaluate(0.5, lambda1=1.0)
+
+    def test_invalid_range(self, tmp_path):
+        with pytest.raises(ValueError):
+            build_emulator(tmp_path, ranges={'mu': (0.1, 0.0)})
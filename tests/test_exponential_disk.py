@@ -0,0 +1,71 @@
+"""
+Freeman 指数盘模型测试
+"""
+
+import numpy as np
+import pytest
+from scipy import special
+from src.analysis.disk_rotation import rotation_curve
+from src.analysis.exponential_disk import exponential_disk_rotation, freeman_term
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+def _exact(y):
+    return y**2 * (special.ive(0, y) * special.kve(0, y) - special.ive(1, y) * special.kve(1, y))
+
+
+class TestFreemanTerm:
+    """测试查表的 Bessel 项"""
+
+    def test_matches_scipy(self):
+        # 表外紧挨 TABLE_MAX 处是渐近展开误差最大的地方
+        y = np.concatenate([np.geomspace(1e-6, 64.0, 20001),
+                            np.geomspace(64.0 * (1 + 1e-12), 200.0, 100)])
+        np.testing.assert_allclose(freeman_term(y), _exact(y), rtol=1e-8)
+        # 更大的 y 上参考值 I₀K₀ − I₁K₁ 相消，自身只有约 4y²ε 的精度
+        y = np.geomspace(200.0, 1e4, 50)
+        np.testing.assert_allclose(freeman_term(y), _exact(y), rtol=1e-6)
+
+    def test_shapes_and_limits(self):
+        assert freeman_term(0.0) == 0.0
+        assert freeman_term(np.zeros((2, 3))).shape == (2, 3)
+        assert abs(freeman_term(0.5) - _exact(0.5)) < 1e-12
+        with pytest.raises(ValueError):
+            freeman_term([-1.0])
+
+
+class TestExponentialDisk:
+    """测试 (星系 × 半径) 旋转曲线"""
+
+    def test_matches_profile_method(self, calc):
+        """与由 Σ(R) 采样经 FFTLog 求得的曲线一致"""
+        M = np.array([[1e9], [3e10], [2e11]])
+        R_d = np.array([[1.0], [2.5], [4.0]])
+        R = np.geomspace(0.05, 15.0, 200) * R_d
+        model = exponential_disk_rotation(calc, M, R_d, R)
+        profile = rotation_curve(calc, R, model['sigma'])
+        np.testing.assert_allclose(model['v_newton'], profile['v_newton'], rtol=2e-3)
+        np.testing.assert_allclose(model['M_enclosed'], profile['M_enclosed'], rtol=1e-3)
+        np.testing.assert_allclose(model['v_rot'], profile['v_rot'], rtol=2e-3)
+
+    def test_broadcasting(self, calc):
+        M = 10**np.linspace(8.0, 11.0, 7)[:, None]
+        R = np.linspace(0.5, 20.0, 30)
+        out = exponential_disk_rotation(calc, M, 2.0, R)
+        assert out['v_rot'].shape == (7, 30)
+        single = exponential_disk_rotation(calc, M[3, 0], 2.0, R)
+        np.testing.assert_array_equal(single['v_rot'], out['v_rot'][3])
+        # 外盘趋于 galaxy_rotation_velocity 的平坦速度公式
+        far = exponential_disk_rotation(calc, 1e10, 1.0, 1e5)
+        v_flat, _ = calc.galaxy_rotation_velocity(float(far['M_enclosed']), 1.0,
+                                                  sigma=float(far['sigma']))
+        assert abs(far['v_rot'] / v_flat - 1.0) < 1e-3
+
+    def test_invalid(self, calc):
+        with pytest.raises(ValueError):
+            exponential_disk_rotation(calc, 1e10, 0.0, [1.0])
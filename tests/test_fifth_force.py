@@ -0,0 +1,118 @@
+"""
+Barnes–Hut 第五力加速度测试
+"""
+
+import numpy as np
+import pytest
+from src.core.qst_calculator import QSTCalculator
+from src.simulation.fifth_force import (BarnesHutTree, direct_accelerations,
+                                        fifth_force_accelerations, fifth_force_charges)
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+@pytest.fixture(scope='module')
+def cloud():
+    rng = np.random.default_rng(5)
+    n = 800
+    positions = rng.normal(size=(3, n)) * np.array([[1.0], [1.0], [0.2]])
+    masses = 10**rng.uniform(0.0, 3.0, n)
+    charges = 0.7 * masses
+    return positions, masses, charges
+
+
+def _relative_error(a, b):
+    return np.linalg.norm(a - b, axis=0) / np.linalg.norm(b, axis=0)
+
+
+class TestBarnesHut:
+    """测试树算法与直接求和一致"""
+
+    def test_converges_to_direct(self, cloud):
+        positions, masses, charges = cloud
+        tree = BarnesHutTree(positions, masses, charges)
+        reference = direct_accelerations(positions, masses, charges, 1.0, 0.5)
+        assert np.max(_relative_error(tree.accelerations(1.0, 0.5, theta=0.05),
+                                      reference)) < 1e-6
+        assert np.median(_relative_error(tree.accelerations(1.0, 0.5, theta=0.5),
+                                         reference)) < 1e-2
+
+    @pytest.mark.parametrize("newtonian,yukawa", [(True, False), (False, True)])
+    def test_separate_terms(self, cloud, newtonian, yukawa):
+        positions, masses, charges = cloud
+        tree = BarnesHutTree(positions, masses, charges, leaf_size=4)
+        result = tree.accelerations(1.0, 0.5, theta=0.3, newtonian=newtonian, yukawa=yukawa)
+        reference = direct_accelerations(positions, masses, charges, 1.0, 0.5,
+                                         newtonian=newtonian, yukawa=yukawa)
+        assert np.median(_relative_error(result, reference)) < 2e-3
+
+    def test_yukawa_opening_criterion(self, cloud):
+        """λ 小于体系尺度时只含汤川项的误差也受控 (节点须小于 θλ)"""
+        positions, masses, charges = cloud
+        tree = BarnesHutTree(positions, masses, charges)
+        result = tree.accelerations(1.0, 0.2, theta=0.5, newtonian=False)
+        reference = direct_accelerations(positions, masses, charges, 1.0, 0.2, newtonian=False)
+        error = _relative_error(result, reference)
+        assert np.median(error) < 1e-3 and np.max(error) < 3e-2
+
+    def test_two_body(self):
+        positions = np.array([[0.0, 3.0], [0.0, 0.0], [0.0, 0.0]])
+        masses, charges = np.array([2.0, 5.0]), np.array([1.0, 4.0])
+        acc = BarnesHutTree(positions, masses, charges).accelerations(2.0, 1.5)
+        x = 3.0 / 1.5
+        expected = 2.0 * (5.0 + 4.0 * (1 + x) * np.exp(-x)) / 9.0
+        assert abs(acc[0, 0] - expected) < 1e-14 * expected
+        assert acc[1, 0] == 0.0 and acc[0, 1] < 0.0
+
+    def test_long_range_limit(self, cloud):
+        """λ → ∞ 时汤川项等于以荷为质量的牛顿项"""
+        positions, masses, charges = cloud
+        yukawa = direct_accelerations(positions, masses, charges, 1.0, 1e30, newtonian=False)
+        newton = direct_accelerations(positions, charges, 0.0, 1.0, 1e30, yukawa=False)
+        np.testing.assert_allclose(yukawa, newton, rtol=1e-12)
+
+    def test_coincident_particles(self):
+        positions = np.zeros((3, 40))
+        positions[:, 20:] = np.random.default_rng(0).normal(size=(3, 20))
+        tree = BarnesHutTree(positions, 1.0, 1.0, leaf_size=4)
+        acc = tree.accelerations(1.0, 1.0, theta=0.05, softening=0.1)
+        assert np.all(np.isfinite(acc))
+        reference = direct_accelerations(positions, 1.0, 1.0, 1.0, 1.0, softening=0.1)
+        assert np.max(_relative_error(acc, reference)) < 1e-6
+
+    def test_coincident_without_softening(self):
+        """ε = 0 时重合粒子之间的力取 0，不产生 nan"""
+        positions = np.zeros((3, 30))
+        positions[:, 10:] = np.random.default_rng(1).normal(size=(3, 20))
+        tree = BarnesHutTree(positions, 1.0, 1.0, leaf_size=4)
+        acc = tree.accelerations(1.0, 1.0, theta=0.05)
+        assert np.all(np.isfinite(acc))
+        reference = direct_accelerations(positions, 1.0, 1.0, 1.0, 1.0)
+        np.testing.assert_allclose(acc, reference, rtol=1e-9)
+
+    def test_invalid(self, cloud):
+        positions, masses, charges = cloud
+        with pytest.raises(ValueError):
+            BarnesHutTree(positions.T, masses, charges)
+        with pytest.raises(ValueError):
+            BarnesHutTree(positions, masses, charges).accelerations(1.0, 1.0, theta=1.5)
+
+
+class TestCalculatorInterface:
+    """测试由计算器参数构造的加速度"""
+
+    def test_tree_matches_direct(self, calc):
+        AU = calc.constants.AU
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(-2000.0, 2000.0, (3, 500)) * AU
+        masses = 10**rng.uniform(18.0, 25.0, 500)
+        tree = fifth_force_accelerations(calc, positions, masses, theta=0.3)
+        direct = fifth_force_accelerations(calc, positions, masses, method='direct')
+        assert np.median(_relative_error(tree, direct)) < 5e-3
+        charges = fifth_force_charges(calc, masses)
+        np.testing.assert_allclose(charges / masses, calc.beta_effective_batch(masses))
+        with pytest.raises(ValueError):
+            fifth_force_accelerations(calc, positions, masses, method='fmm')
@@ -0,0 +1,80 @@
+"""
+旋转速度解析梯度测试 - 与中心差分比较
+"""
+
+import numpy as np
+import pytest
+from src.analysis.galaxy_analysis import chi2_with_gradient, fit_parameters
+from src.core.qst_calculator import QSTCalculator
+
+SPARC_PARAMETERS = ('beta0', 'M_th', 'A_low', 'sigma_crit', 'sigma_transition', 'alpha',
+                    'a0_standard')
+
+
+def _finite_difference(param_set, name, M, R, base_params, rel_step=1e-6):
+    h = rel_step * abs(base_params[name])
+    v_plus = QSTCalculator(param_set, overrides={**base_params, name: base_params[name] + h})
+    v_minus = QSTCalculator(param_set, overrides={**base_params, name: base_params[name] - h})
+    return (v_plus.evaluate_galaxies_batch(M, R)['v_rot']
+            - v_minus.evaluate_galaxies_batch(M, R)['v_rot']) / (2.0 * h)
+
+
+class TestRotationGradient:
+    """测试 ∂v/∂θ"""
+
+    @pytest.mark.parametrize("alpha", [1.0, 1.8])
+    def test_matches_finite_difference(self, alpha):
+        rng = np.random.default_rng(0)
+        M = 10**rng.uniform(7, 12, 500)
+        R = rng.uniform(0.5, 20.0, 500)
+        calc = QSTCalculator('sparc_optimized', overrides={'alpha': alpha})
+        v, gradient = calc.galaxy_rotation_velocity_gradient(M, R)
+        np.testing.assert_allclose(v, calc.evaluate_galaxies_batch(M, R)['v_rot'])
+        assert set(gradient) == set(calc.params)
+        for name in SPARC_PARAMETERS:
+            expected = _finite_difference('sparc_optimized', name, M, R, calc.params)
+            np.testing.assert_allclose(gradient[name], expected, rtol=1e-5,
+                                       atol=1e-7 * np.abs(expected).max() + 1e-12)
+
+    def test_threshold_mass_gradient(self):
+        """M ~ M_th 的线性段上 ∂v/∂M_th 非零"""
+        calc = QSTCalculator('local')
+        x = np.array([0.85, 0.95, 1.2, 1.7, 3.0])
+        M = x * calc.params['M_th'] / calc.constants.M_SUN
+        R = np.full_like(M, 1e-9)
+        _, gradient = calc.galaxy_rotation_velocity_gradient(M, R)
+        expected = _finite_difference('local', 'M_th', M, R, calc.params)
+        np.testing.assert_allclose(gradient['M_th'], expected, rtol=1e-5)
+        assert gradient['M_th'][-1] == 0.0 and np.all(gradient['M_th'][:-1] < 0)
+
+    def test_requires_local_parameters(self):
+        with pytest.raises(ValueError):
+            QSTCalculator('effective').galaxy_rotation_velocity_gradient(np.ones(2), np.ones(2))
+
+
+class TestGradientFit:
+    """测试基于梯度的参数拟合"""
+
+    def test_chi2_gradient(self):
+        rng = np.random.default_rng(1)
+        M, R = 10**rng.uniform(8, 11, 100), rng.uniform(1.0, 10.0, 100)
+        calc = QSTCalculator()
+        v_obs = calc.evaluate_galaxies_batch(M, R)['v_rot'] * rng.normal(1.0, 0.05, 100)
+        v_err = np.full(100, 5.0)
+        chi2, gradient = chi2_with_gradient(calc, M, R, v_obs, v_err, ['beta0'])
+        h = 1e-6
+        shifted = [chi2_with_gradient(QSTCalculator(overrides={'beta0': 0.8 + s}), M, R,
+                                      v_obs, v_err, [])[0] for s in (h, -h)]
+        assert gradient['beta0'] == pytest.approx((shifted[0] - shifted[1]) / (2 * h), rel=1e-5)
+
+    def test_recovers_parameters(self):
+        """L-BFGS 从默认值出发恢复生成模拟数据的参数"""
+        rng = np.random.default_rng(3)
+        M, R = 10**rng.uniform(7, 11.5, 300), rng.uniform(0.5, 15.0, 300)
+        truth = {'beta0': 0.6, 'A_low': 0.02, 'sigma_crit': 0.5, 'sigma_transition': 3.0}
+        v_obs = QSTCalculator(overrides=truth).evaluate_galaxies_batch(M, R)['v_rot']
+        result = fit_parameters(M, R, v_obs, np.ones(300))
+        assert result['success']
+        assert result['n_evaluations'] < 100
+        for name, value in truth.items():
+            assert result['params'][name] == pytest.approx(value, rel=1e-4)
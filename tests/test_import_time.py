@@ -0,0 +1,90 @@
+"""
+导入开销测试
+
+每个测试都在全新子进程中测量，避免当前进程已加载的模块影响结果。
+断言不加载重量级依赖，并给耗时一个宽松预算: 取固定下限与解释器空启动
+(python -c pass) 耗时倍数中的较大者，使预算随机器负载伸缩，繁忙的CI上不易误报。
+设置环境变量 QST_SKIP_IMPORT_BUDGET=1 可跳过耗时断言。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ('numpy', 'scipy', 'matplotlib', 'pandas')
+
+# 导入耗时预算: max(下限, 倍数 × 空启动耗时) [s]
+IMPORT_BUDGET_FLOOR = 0.25
+IMPORT_BUDGET_FACTOR = 5.0
+
+
+def _measure(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope='module')
+def import_budget() -> float:
+    """按同一解释器空启动耗时 (3次取最小) 换算的导入预算 [s]"""
+    startup = []
+    for _ in range(3):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        startup.append(time.perf_counter() - t)
+    return max(IMPORT_BUDGET_FLOOR, IMPORT_BUDGET_FACTOR * min(startup))
+
+
+class TestImportTime:
+    """测试包入口与计算器的导入开销"""
+
+    @pytest.mark.parametrize("statement", [
+        "import src",
+        "import src.core.qst_calculator",
+        "import src.core.registry",
+        "from src.core.registry import get_calculator\nget_calculator('v4.1', 'local')",
+        "import src.cli",
+    ])
+    def test_no_heavy_imports(self, statement, import_budget):
+        """导入不加载重量级依赖，且耗时在预算内"""
+        result = _measure(statement)
+        assert result['heavy'] == [], f"{statement} 加载了: {result['heavy']}"
+        print(f"\n{statement}: {result['elapsed'] * 1e3:.2f} ms "
+              f"(预算 {import_budget * 1e3:.0f} ms)")
+        if os.environ.get('QST_SKIP_IMPORT_BUDGET'):
+            return
+        assert result['elapsed'] < import_budget, \
+            f"{statement} 耗时 {result['elapsed'] * 1e3:.1f} ms，超过预算 {import_budget * 1e3:.0f} ms"
+
+    def test_lazy_attribute_access(self):
+        """包入口的延迟属性可正常使用"""
+        result = _measure("import src\ncalc = src.QSTCalculator('effective')")
+        assert result['heavy'] == []
+
+    def test_lazy_module_proxy(self):
+        """LazyModule在首次访问属性时才导入"""
+        result = _measure(
+            "from src.utils.lazy import lazy_import\n"
+            "np = lazy_import('numpy')\n"
+            "assert 'numpy' not in sys.modules\n"
+        )
+        assert result['heavy'] == []
+
+        from src.utils.lazy import lazy_import
+        np = lazy_import('numpy')
+        assert np.arange(3).sum() == 3
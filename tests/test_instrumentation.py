@@ -0,0 +1,81 @@
+"""
+计算器调用计数与计时测试
+"""
+
+import json
+
+import pytest
+from src.core.qst_calculator import QSTCalculator
+from src.core.qst_calculator_v41 import QSTCalculator_v41
+from src.core.instrumentation import (
+    MethodStats,
+    INSTRUMENTATION,
+    enable_instrumentation,
+    disable_instrumentation,
+    reset_instrumentation,
+    instrumentation_snapshot,
+    instrumentation_json,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    reset_instrumentation()
+    yield
+    disable_instrumentation()
+    reset_instrumentation()
+
+
+class TestInstrumentation:
+    """测试方法级计数与计时"""
+
+    def test_disabled_records_nothing(self):
+        """默认关闭时不记录"""
+        calc = QSTCalculator('sparc_optimized')
+        calc.beta_effective(5.97e24)
+        assert instrumentation_snapshot() == {}
+
+    def test_counts_and_latencies(self):
+        """启用后记录调用次数与延迟分位数"""
+        enable_instrumentation()
+        calc = QSTCalculator('sparc_optimized')
+        for _ in range(10):
+            calc.beta_effective(5.97e24)
+        calc.dark_energy_density()
+
+        snap = instrumentation_snapshot()
+        stats = snap['qst_calculator.QSTCalculator.beta_effective']
+        assert stats['count'] == 10
+        assert stats['batch_total'] == 10
+        assert 0.0 <= stats['min_s'] <= stats['p50_s'] <= stats['p99_s'] <= stats['max_s']
+        assert snap['qst_calculator.QSTCalculator.dark_energy_density']['count'] == 1
+        print("\n✅ 调用计数与延迟统计正确")
+
+    def test_nested_calls_and_versions(self):
+        """嵌套调用与不同版本计算器分别计数"""
+        enable_instrumentation()
+        QSTCalculator('sparc_optimized').galaxy_rotation_velocity(1e9, 2.0, 0.4)
+        QSTCalculator_v41('local').mars_time_delay()
+
+        snap = instrumentation_snapshot()
+        assert snap['qst_calculator.QSTCalculator.galaxy_rotation_velocity']['count'] == 1
+        assert snap['qst_calculator.QSTCalculator.effective_a0_ratio']['count'] == 1
+        assert snap['qst_calculator_v41.QSTCalculator_v41.mars_time_delay']['count'] == 1
+
+    def test_batch_size_and_json(self):
+        """批量大小推断与JSON导出"""
+        INSTRUMENTATION.record('demo', 0.001, batch=128)
+        INSTRUMENTATION.record('demo', 0.003, batch=32)
+        data = json.loads(instrumentation_json())
+        assert data['demo']['batch_max'] == 128
+        assert data['demo']['batch_mean'] == 80
+        assert abs(data['demo']['total_s'] - 0.004) < 1e-12
+
+    def test_reservoir_is_uniform_over_all_calls(self):
+        """前一半调用慢、后一半快: 蓄水池分位数反映全程而非最近窗口"""
+        stats = MethodStats(reservoir_size=200)
+        for i in range(20000):
+            stats.record(1.0 if i < 10000 else 0.0, 1)
+        assert len(stats.samples) == 200
+        assert 0.3 < sum(stats.samples) / 200 < 0.7
+        assert stats.to_dict()['p90_s'] == 1.0
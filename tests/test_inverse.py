@@ -0,0 +1,85 @@
+"""
+由观测速度反解重子质量测试
+"""
+
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+from src.analysis.inverse import segment_breakpoints, solve_baryonic_mass
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+from src.utils.table_io import read_table
+
+
+def _catalog(calc, n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    M = 10**rng.uniform(6.0, 12.0, n)
+    R = 10**rng.uniform(-0.5, 1.3, n)
+    v, _ = calc.galaxy_rotation_velocity_batch(M, R)
+    return M, R, v
+
+
+class TestSolveBaryonicMass:
+    """测试反解与正向计算、brentq 的一致性"""
+
+    @pytest.mark.parametrize('param_set, overrides', [
+        ('sparc_optimized', None), ('sparc_optimized', {'alpha': 0.6}),
+        ('local', None),
+        # M_th 落在星系质量范围内: β_eff 的线性段与阶跃都起作用
+        ('sparc_optimized', {'M_th': 1e40}),
+    ])
+    def test_round_trip(self, param_set, overrides):
+        calc = QSTCalculator(param_set, overrides=overrides)
+        M, R, v = _catalog(calc)
+        M_solved, info = solve_baryonic_mass(calc, v, R, full_output=True)
+        assert info['exact'].all() and info['iterations'] < 50
+        np.testing.assert_allclose(M_solved, M, rtol=1e-11)
+
+    def test_matches_brentq(self):
+        calc = QSTCalculator('sparc_optimized')
+        _, R, v = _catalog(calc, n=20, seed=1)
+        M_solved = solve_baryonic_mass(calc, v, R)
+        for i in range(20):
+            expected = brentq(lambda m: calc.galaxy_rotation_velocity(m, R[i])[0] - v[i],
+                              1e3, 1e14, xtol=1e-9, rtol=1e-14)
+            assert M_solved[i] == pytest.approx(expected, rel=1e-11)
+
+    def test_gap_returns_breakpoint(self):
+        """v_flat 落在 β_eff 阶跃 (x = 0.5) 的跳跃内时返回该断点"""
+        calc = QSTCalculator('sparc_optimized', overrides={'M_th': 1e40})
+        R = np.array([3.0])
+        breakpoints = segment_breakpoints(calc, R)[0]
+        M_edge = breakpoints[np.argmin(np.abs(breakpoints / (0.5e40 / calc.constants.M_SUN) - 1))]
+        v_below, _ = calc.galaxy_rotation_velocity_batch(np.array([M_edge * (1 - 1e-9)]), R)
+        v_above, _ = calc.galaxy_rotation_velocity_batch(np.array([M_edge]), R)
+        assert v_above[0] > v_below[0] * 1.01
+        M, info = solve_baryonic_mass(calc, 0.5 * (v_below + v_above), R, full_output=True)
+        assert M[0] == M_edge and not info['exact'][0]
+
+    def test_broadcast_and_invalid(self):
+        calc = QSTCalculator('sparc_optimized')
+        M = solve_baryonic_mass(calc, [[50.0, 100.0], [150.0, -1.0]], 2.0)
+        assert M.shape == (2, 2) and np.isnan(M[1, 1])
+        assert np.all(np.diff(M.ravel()[:3]) > 0)
+        assert np.isnan(solve_baryonic_mass(calc, 100.0, [np.nan])[0])
+        with pytest.raises(ValueError):
+            solve_baryonic_mass(QSTCalculator('effective'), 100.0, 2.0)
+        with pytest.raises(ValueError):
+            solve_baryonic_mass(calc, 100.0, 2.0, rtol=0.0)
+
+
+class TestMassCLI:
+    """测试 qst mass 子命令"""
+
+    def test_cli(self, tmp_path):
+        path = tmp_path / 'catalog.csv'
+        path.write_text("v_flat,R_disk\n100.0,2.0\n45.0,1.0\n")
+        out = tmp_path / 'mass.csv'
+        assert main(['mass', str(path), '-o', str(out), '--keep-input']) == 0
+        table = read_table(out)
+        assert set(table) == {'v_flat', 'R_disk', 'M_baryon', 'exact'}
+        v, _ = QSTCalculator('sparc_optimized').galaxy_rotation_velocity_batch(
+            table['M_baryon'], table['R_disk'])
+        np.testing.assert_allclose(v, [100.0, 45.0], rtol=1e-9)
+        with pytest.raises(SystemExit):
+            main(['mass', str(path), '-o', str(out), '--vflat-col', 'v_obs'])
@@ -0,0 +1,138 @@
+"""
+辛 N 体积分器测试
+"""
+
+import numpy as np
+import pytest
+from src.core.qst_calculator import QSTCalculator
+from src.simulation.fifth_force import direct_accelerations
+from src.simulation.nbody import (LeapfrogIntegrator, ParticleSet, cell_list_pairs,
+                                  make_integrator)
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+def _cluster(n=300, seed=4):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(0.0, 10.0, (3, n))
+    velocities = rng.normal(scale=0.01, size=(3, n))
+    masses = rng.uniform(1.0, 2.0, n)
+    return ParticleSet(positions, velocities, masses, 0.5 * masses)
+
+
+class TestCellList:
+    """测试单元格链表配对"""
+
+    def test_matches_brute_force(self):
+        positions = np.random.default_rng(1).uniform(-5.0, 5.0, (3, 400))
+        i, j = cell_list_pairs(positions, 1.3)
+        found = set(zip(np.minimum(i, j), np.maximum(i, j)))
+        assert len(found) == i.size
+        d = np.linalg.norm(positions[:, :, None] - positions[:, None, :], axis=0)
+        a, b = np.nonzero(np.triu(d < 1.3, k=1))
+        assert found == set(zip(a, b))
+
+    def test_invalid_radius(self):
+        with pytest.raises(ValueError):
+            cell_list_pairs(np.zeros((3, 2)), 0.0)
+
+
+class TestLeapfrog:
+    """测试力的计算与积分性质"""
+
+    def test_yukawa_matches_direct_inside_switch(self):
+        """所有粒子对都在 r_on 以内时，截断汤川项等于直接求和"""
+        particles = _cluster()
+        integrator = LeapfrogIntegrator(particles, 1.0, 5.0, cutoff=4.0, newtonian=None)
+        expected = direct_accelerations(particles.positions, particles.masses,
+                                        particles.charges, 1.0, 5.0, newtonian=False)
+        np.testing.assert_allclose(integrator.accelerations(), expected, rtol=1e-10)
+
+    def test_cutoff_limits_range(self):
+        particles = _cluster()
+        integrator = LeapfrogIntegrator(particles, 1.0, 0.5, newtonian=None)
+        i, j = integrator.neighbours.pairs(particles.positions)
+        assert i.size < particles.n * (particles.n - 1) // 2 * 0.2
+        full = direct_accelerations(particles.positions, particles.masses, particles.charges,
+                                    1.0, 0.5, newtonian=False)
+        rel = np.linalg.norm(integrator.accelerations() - full, axis=0) / \
+            np.linalg.norm(full, axis=0)
+        assert np.median(rel) < 0.03
+
+    def test_energy_and_momentum_conserved(self):
+        particles = _cluster(n=60)
+        integrator = LeapfrogIntegrator(particles, 1e-3, 1.5, softening=0.2, skin=0.2)
+        momentum = (particles.masses * particles.velocities).sum(axis=1)
+        run = integrator.run(0.05, 2000, every=200, record_energy=True)
+        drift = np.abs(run['energy'] / run['energy'][0] - 1.0)
+        assert drift.max() < 1e-4
+        np.testing.assert_allclose((particles.masses * particles.velocities).sum(axis=1),
+                                   momentum, atol=1e-12)
+        assert integrator.neighbours.n_builds > 1
+        assert run['positions'].shape == (11, 3, 60)
+
+    @pytest.mark.parametrize("block_pairs", [1, 1000, 10**8])
+    def test_newtonian_energy_matches_pair_sum(self, block_pairs, monkeypatch):
+        """分块求和的牛顿势能与逐对求和一致，与分块大小无关"""
+        import src.simulation.nbody as nbody
+
+        particles = _cluster(n=80)
+        integrator = LeapfrogIntegrator(particles, 1.0, 1.0, softening=0.3)
+        p = particles
+        d = np.linalg.norm(p.positions[:, :, None] - p.positions[:, None, :], axis=0)
+        i, j = np.triu_indices(p.n, k=1)
+        expected = -np.sum(p.masses[i] * p.masses[j] / np.sqrt(d[i, j]**2 + 0.3**2))
+        monkeypatch.setattr(nbody._pair_potential_sum, '__defaults__', (0.0, block_pairs))
+        assert integrator.energy()['newtonian'] == pytest.approx(expected, rel=1e-12)
+
+    def test_time_reversible(self):
+        particles = _cluster(n=50)
+        start = particles.copy()
+        integrator = LeapfrogIntegrator(particles, 1e-3, 1.5, softening=0.2)
+        integrator.step(0.5, 100)
+        particles.velocities *= -1.0
+        integrator.step(0.5, 100)
+        np.testing.assert_allclose(particles.positions, start.positions, atol=1e-9)
+
+    def test_tree_newtonian(self):
+        particles = _cluster()
+        direct = LeapfrogIntegrator(particles, 1.0, 1.0, newtonian='direct')
+        tree = LeapfrogIntegrator(particles, 1.0, 1.0, newtonian='tree', theta=0.2)
+        rel = np.linalg.norm(tree.accelerations() - direct.accelerations(), axis=0) / \
+            np.linalg.norm(direct.accelerations(), axis=0)
+        assert np.median(rel) < 1e-3
+
+    def test_invalid(self):
+        particles = _cluster(n=5)
+        with pytest.raises(ValueError):
+            LeapfrogIntegrator(particles, 1.0, 1.0, newtonian='fmm')
+        with pytest.raises(ValueError):
+            LeapfrogIntegrator(particles, 1.0, 1.0, switch=1.0)
+        with pytest.raises(ValueError):
+            ParticleSet(np.zeros((2, 5)), np.zeros((2, 5)), 1.0, 1.0)
+
+
+class TestSolarOrbit:
+    """测试由计算器参数构造的太阳-地球系统"""
+
+    def test_one_year(self, calc):
+        c = calc.constants
+        length, _ = calc.fifth_force_range()
+        x = c.AU / length
+        q_sun = float(calc.beta_effective_batch(c.M_SUN)) * c.M_SUN
+        r = c.AU
+        v = np.sqrt(c.G * (c.M_SUN + q_sun * (1 + x) * np.exp(-x)) / r)
+        integrator = make_integrator(calc, [[0.0, r], [0.0, 0.0], [0.0, 0.0]],
+                                     [[0.0, 0.0], [0.0, v], [0.0, 0.0]],
+                                     [c.M_SUN, c.M_EARTH])
+        q = integrator.particles.charges
+        np.testing.assert_allclose(q / integrator.particles.masses,
+                                   calc.beta_effective_batch(integrator.particles.masses))
+        # 以牛顿 + 汤川向心力给出的圆轨道速度出发，一年后轨道半径不变
+        run = integrator.run(3600.0 * 6, 1461, every=1461)
+        d = np.linalg.norm(run['positions'][-1, :, 1] - run['positions'][-1, :, 0])
+        assert abs(d / r - 1.0) < 1e-4
+        assert integrator.neighbours.n_builds == 1
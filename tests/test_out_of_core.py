@@ -0,0 +1,99 @@
+"""
+内存映射分块计算测试
+"""
+
+import mmap
+
+import numpy as np
+import pytest
+from src.analysis.out_of_core import chunk_bounds, evaluate_memmap
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture
+def arrays(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 5000
+    M = 10**rng.uniform(7, 12, n)
+    R = rng.uniform(0.5, 10.0, n)
+    np.save(tmp_path / 'M.npy', M)
+    np.save(tmp_path / 'R.npy', R)
+    return tmp_path, M, R
+
+
+class TestChunkBounds:
+    """测试页对齐分块"""
+
+    def test_page_aligned(self):
+        page = mmap.PAGESIZE
+        bounds = chunk_bounds(100_000, 8, chunk_size=3000, offset=128)
+        assert bounds[0][0] == 0 and bounds[-1][1] == 100_000
+        assert all(a[1] == b[0] for a, b in zip(bounds[:-1], bounds[1:]))
+        for _, stop in bounds[:-1]:
+            assert (128 + 8 * stop) % page == 0
+        # 块长向下取整到整页，最小一页
+        assert bounds[1][1] - bounds[1][0] == 3000 // (page // 8) * (page // 8)
+        assert chunk_bounds(10, 8, chunk_size=1) == [(0, 10)]
+
+
+class TestEvaluateMemmap:
+    """测试结果与内存中的批量计算一致"""
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_matches_batch(self, arrays, workers):
+        path, M, R = arrays
+        calc = QSTCalculator('sparc_optimized')
+        stats = evaluate_memmap(calc, path / 'M.npy', path / 'R.npy', output=path / 'out',
+                                chunk_size=512, workers=workers)
+        assert stats['n_rows'] == M.size and stats['n_chunks'] > 5
+        expected = calc.evaluate_galaxies_batch(M, R)
+        for name in ('sigma', 'a_ratio', 'beta_eff', 'v_rot'):
+            result = np.load(path / 'out' / f'{name}.npy', mmap_mode='r')
+            np.testing.assert_array_equal(result, expected[name])
+
+    def test_sigma_input_and_preallocated_output(self, arrays):
+        path, M, R = arrays
+        calc = QSTCalculator('local')
+        sigma = calc.evaluate_galaxies_batch(M, R)['sigma']
+        np.save(path / 'sigma.npy', sigma)
+        out = {'v_rot': np.lib.format.open_memmap(path / 'v.npy', 'w+', np.float32, M.shape)}
+        stats = evaluate_memmap(calc, np.load(path / 'M.npy', mmap_mode='r'),
+                                sigma=path / 'sigma.npy', output=out, quantities=('v_rot',),
+                                chunk_size=1024, dtype='float32')
+        assert set(stats['outputs']) == {'v_rot'}
+        expected = calc.evaluate_galaxies_batch(M, R)['v_rot']
+        np.testing.assert_allclose(np.load(path / 'v.npy'), expected, rtol=2e-6)
+
+    def test_invalid_inputs(self, arrays):
+        path, M, _ = arrays
+        calc = QSTCalculator('sparc_optimized')
+        with pytest.raises(ValueError):
+            evaluate_memmap(calc, path / 'M.npy', output=path / 'out')
+        with pytest.raises(ValueError):
+            evaluate_memmap(calc, path / 'M.npy', np.ones(3), output=path / 'out')
+        with pytest.raises(ValueError):
+            evaluate_memmap(calc, path / 'M.npy', path / 'R.npy', output=path / 'out',
+                            quantities=('v_flat',))
+        # 非连续输出 (reshape 会复制，结果将丢失)
+        strided = {'v_rot': np.empty((M.size, 2))[:, 0]}
+        with pytest.raises(ValueError):
+            evaluate_memmap(calc, path / 'M.npy', path / 'R.npy', output=strided,
+                            quantities=('v_rot',))
+
+    def test_noncontiguous_inputs(self, arrays):
+        """非连续输入 (列切片) 结果正确"""
+        path, M, R = arrays
+        calc = QSTCalculator('sparc_optimized')
+        table = np.column_stack([M, R])
+        out = {'v_rot': np.empty_like(M)}
+        evaluate_memmap(calc, table[:, 0], table[:, 1], output=out, quantities=('v_rot',),
+                        chunk_size=512)
+        np.testing.assert_array_equal(out['v_rot'], calc.evaluate_galaxies_batch(M, R)['v_rot'])
+
+    def test_cli(self, arrays):
+        path, M, R = arrays
+        assert main(['evaluate-npy', str(path / 'M.npy'), '--radius', str(path / 'R.npy'),
+                     '-o', str(path / 'cli'), '--chunk-size', '1024', '--workers', '2']) == 0
+        expected = QSTCalculator('sparc_optimized').evaluate_galaxies_batch(M, R)['v_rot']
+        np.testing.assert_array_equal(np.load(path / 'cli' / 'v_rot.npy'), expected)
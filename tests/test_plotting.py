@@ -0,0 +1,105 @@
+"""
+批量绘图测试
+"""
+
+import numpy as np
+import pytest
+from src.analysis.plotting import (MANIFEST_FILE, FigureJob, FigureTemplate, diagnostic_jobs,
+                                   galaxy_jobs, render_figures)
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+def _jobs(calc, v_obs=None):
+    M = np.array([1e9, 3e10, 2e11])
+    R = np.array([1.0, 3.0, 6.0])
+    return galaxy_jobs(calc, M, R, names=['a', 'b', 'c'], v_obs=v_obs,
+                       v_err=None if v_obs is None else np.full(3, 5.0), n_radii=20)
+
+
+class TestRenderFigures:
+    """测试渲染、清单跳过与重绘"""
+
+    def test_render_and_skip(self, calc, tmp_path):
+        jobs = _jobs(calc) + diagnostic_jobs(calc)
+        stats = render_figures(jobs, tmp_path)
+        assert stats['rendered'] == 5 and stats['skipped'] == 0
+        for job in jobs:
+            assert (tmp_path / f"{job.name}.png").stat().st_size > 0
+        assert (tmp_path / MANIFEST_FILE).exists()
+
+        stats = render_figures(jobs, tmp_path)
+        assert stats['rendered'] == 0 and stats['skipped'] == 5
+
+    def test_rerender_changed(self, calc, tmp_path):
+        """数据变化或文件缺失的图才重绘"""
+        render_figures(_jobs(calc), tmp_path)
+        stats = render_figures(_jobs(calc, v_obs=np.array([50.0, 150.0, 250.0])), tmp_path)
+        assert stats['rendered'] == 3
+
+        (tmp_path / 'galaxy' / 'b.png').unlink()
+        stats = render_figures(_jobs(calc, v_obs=np.array([50.0, 150.0, 250.0])), tmp_path)
+        assert stats['rendered'] == 1 and (tmp_path / 'galaxy' / 'b.png').exists()
+
+    def test_force_and_formats(self, calc, tmp_path):
+        jobs = diagnostic_jobs(calc)
+        render_figures(jobs, tmp_path)
+        stats = render_figures(jobs, tmp_path, formats=('png', 'svg'))
+        assert stats['rendered'] == 2
+        assert (tmp_path / 'diagnostics' / 'beta_eff.svg').exists()
+        assert render_figures(jobs, tmp_path, formats=('png', 'svg'), force=True)['rendered'] == 2
+
+    def test_workers(self, calc, tmp_path):
+        """多进程渲染与单进程输出相同的文件集"""
+        stats = render_figures(_jobs(calc), tmp_path, workers=2)
+        assert stats['rendered'] == 3
+        assert sorted(p.name for p in (tmp_path / 'galaxy').iterdir()) == \
+            ['a.png', 'b.png', 'c.png']
+
+    def test_caller_style_untouched(self, calc, tmp_path):
+        """当前进程渲染不改变调用方的 rcParams"""
+        import matplotlib
+
+        before = matplotlib.rcParams['font.size']
+        render_figures(diagnostic_jobs(calc), tmp_path, style={'font_size': before + 3})
+        assert matplotlib.rcParams['font.size'] == before
+
+    def test_unknown_template(self, tmp_path):
+        with pytest.raises(ValueError):
+            render_figures([FigureJob('x', 'pie', {})], tmp_path)
+
+    def test_template_is_abstract(self):
+        with pytest.raises(TypeError):
+            FigureTemplate()
+
+
+class TestGalaxyJobs:
+    """测试星系名到输出文件名的转换"""
+
+    def _names(self, calc, names):
+        M = np.full(len(names), 1e10)
+        return [job.name for job in galaxy_jobs(calc, M, 2.0, names=names, n_radii=5)]
+
+    def test_path_components_escaped(self, calc, tmp_path):
+        """名称中的 .. 与路径分隔符不能跳出输出目录或产生子目录"""
+        names = self._names(calc, ['../x', 'a/b', 'c\\d', '..', 'NGC 3198'])
+        assert names == ['galaxy/_x', 'galaxy/a_b', 'galaxy/c_d', 'galaxy/000003',
+                         'galaxy/NGC_3198']
+        jobs = galaxy_jobs(calc, np.full(2, 1e10), 2.0, names=['../x', 'a/b'], n_radii=5)
+        render_figures(jobs, tmp_path / 'out')
+        assert sorted(p.name for p in (tmp_path / 'out' / 'galaxy').iterdir()) == \
+            ['_x.png', 'a_b.png']
+        assert not (tmp_path / 'x.png').exists()
+
+    def test_duplicates_made_unique(self, calc, tmp_path):
+        names = self._names(calc, ['NGC1', 'NGC1', 'ngc1', 'NGC1_1'])
+        assert len(set(n.lower() for n in names)) == 4
+        assert names[:2] == ['galaxy/NGC1', 'galaxy/NGC1_1']
+        jobs = galaxy_jobs(calc, np.full(2, 1e10), 2.0, names=['a', 'a'], n_radii=5)
+        stats = render_figures(jobs, tmp_path)
+        assert stats['rendered'] == 2
+        assert len(list((tmp_path / 'galaxy').glob('*.png'))) == 2
@@ -0,0 +1,68 @@
+"""
+模型版本注册表测试
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.core import registry
+from src.core.qst_calculator import QSTCalculator
+from src.core.qst_calculator_v41 import QSTCalculator_v41
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestRegistry:
+    """测试版本解析、延迟导入与实例缓存"""
+
+    def test_versions(self):
+        assert registry.available_versions() == ('v4.5', 'v4.1')
+        assert registry.calculator_class('latest') is QSTCalculator
+        assert registry.calculator_class('v41') is QSTCalculator_v41
+        with pytest.raises(ValueError):
+            registry.resolve_version('v4.5_final')
+
+    def test_instances_cached(self):
+        calc = registry.get_calculator('v4.5', 'local')
+        assert isinstance(calc, QSTCalculator) and calc.param_set == 'local'
+        assert registry.get_calculator('latest', 'local') is calc
+        assert registry.get_calculator('v4.5', 'effective') is not calc
+        assert registry.get_calculator('v4.1', 'local') is registry.get_calculator('v41', 'local')
+        registry.clear_cache()
+        assert registry.get_calculator('v4.5', 'local') is not calc
+
+    def test_default_param_set(self):
+        assert registry.get_calculator('v4.1') is registry.get_calculator('v4.1', 'local')
+        assert registry.get_calculator() is registry.get_calculator('v4.5', 'sparc_optimized')
+
+    def test_constants(self):
+        """legacy 常数集复现已删除的 _v45_* 模块 (M_SUN = 1.989e30)"""
+        legacy = registry.get_calculator('v4.5', constants='legacy')
+        assert legacy.constants.M_SUN == 1.989e30
+        assert registry.get_calculator('v4.5', constants='legacy') is legacy
+        assert registry.get_calculator('v4.5') is not legacy
+        assert registry.get_calculator('v4.1', constants='legacy').constants.name == 'legacy'
+        v_legacy, _ = legacy.galaxy_rotation_velocity(1e10, 3.0)
+        v, _ = registry.get_calculator('v4.5').galaxy_rotation_velocity(1e10, 3.0)
+        assert v_legacy != v
+
+    def test_overrides(self):
+        calc = registry.get_calculator('v4.5', 'local', overrides={'beta0': 0.5})
+        assert calc.params['beta0'] == 0.5
+        assert registry.get_calculator('v4.5', 'local', {'beta0': 0.5}) is calc
+        assert registry.get_calculator('v4.5', 'local').params['beta0'] == 0.8
+        with pytest.raises(ValueError):
+            registry.get_calculator('v4.1', 'local', overrides={'beta0': 0.5})
+
+    def test_lazy_import(self):
+        """只导入请求的版本"""
+        code = ("import sys\n"
+                "from src import get_calculator\n"
+                "get_calculator('v4.1', 'local')\n"
+                "print('src.core.qst_calculator' in sys.modules, "
+                "'src.core.qst_calculator_v41' in sys.modules)\n")
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+        assert out.stdout.split() == ['False', 'True']
@@ -0,0 +1,88 @@
+"""
+增量报告生成测试
+"""
+
+import numpy as np
+from src.analysis import report
+from src.analysis.report import SECTIONS, build_report
+from src.utils.table_io import write_table
+
+
+ALL_SECTIONS = [name for name, _, _ in SECTIONS]
+
+
+class TestIncrementalReport:
+    """测试章节哈希缓存"""
+
+    def test_second_build_fully_cached(self, tmp_path):
+        text1, stats1 = build_report(cache_dir=tmp_path, n_points=200)
+        text2, stats2 = build_report(cache_dir=tmp_path, n_points=200)
+        assert stats1['built'] == ALL_SECTIONS
+        assert stats2['built'] == [] and stats2['cached'] == ALL_SECTIONS
+        assert text1 == text2
+        assert '| v4.5 | 0.8 | 234.0 |' in text1
+        assert '| v4.1 | 0.279 | 81.6 |' in text1
+
+    def test_only_affected_sections_rebuilt(self, tmp_path):
+        build_report(cache_dir=tmp_path, n_points=200)
+
+        # 改变宇宙演化分辨率只影响暗能量章节
+        _, stats = build_report(cache_dir=tmp_path, n_points=300)
+        assert stats['built'] == ['dark_energy']
+
+        # 提供星系表只影响旋转曲线章节；修改文件内容后再次重建
+        catalog = tmp_path / 'catalog.csv'
+        write_table(catalog, {'M_baryon': np.array([1e9, 1e10]), 'R_disk': np.array([2.0, 4.0]),
+                              'v_obs': np.array([30.0, 80.0])})
+        text, stats = build_report(cache_dir=tmp_path, n_points=300, catalog=catalog)
+        assert stats['built'] == ['rotation_curves']
+        assert 'mean_pct_error' in text
+
+        write_table(catalog, {'M_baryon': np.array([1e9, 1e10]), 'R_disk': np.array([2.0, 4.0]),
+                              'v_obs': np.array([31.0, 80.0])})
+        _, stats = build_report(cache_dir=tmp_path, n_points=300, catalog=catalog)
+        assert stats['built'] == ['rotation_curves']
+
+    def test_code_change_invalidates(self, tmp_path, monkeypatch):
+        """依赖模块源码哈希变化使相关章节失效"""
+        build_report(cache_dir=tmp_path, n_points=200)
+        monkeypatch.setitem(report._SOURCE_HASHES, '.core.qst_calculator_v41', 'changed')
+        _, stats = build_report(cache_dir=tmp_path, n_points=200)
+        assert stats['built'] == ['parameters', 'mars_delay', 'beta_eff']
+        # 注册表及计算器间接导入的模块 (后端、计时、单位) 影响全部章节
+        for module in ('.core.registry', '.core.backends', '.core.instrumentation',
+                       '.core.units'):
+            monkeypatch.setitem(report._SOURCE_HASHES, module, 'changed ' + module)
+            _, stats = build_report(cache_dir=tmp_path, n_points=200)
+            assert stats['built'] == ALL_SECTIONS
+        # 报告模块整体不是依赖: 其他章节的改动不影响
+        monkeypatch.setitem(report._SOURCE_HASHES, '.analysis.report', 'changed')
+        _, stats = build_report(cache_dir=tmp_path, n_points=200)
+        assert stats['built'] == []
+
+    def test_section_source_change_invalidates_only_that_section(self, tmp_path, monkeypatch):
+        build_report(cache_dir=tmp_path, n_points=200)
+
+        def section_mars_delay(inputs):
+            return report.section_mars_delay(inputs) + [""]
+
+        sections = tuple((name, section_mars_delay if name == 'mars_delay' else func, depends)
+                         for name, func, depends in SECTIONS)
+        monkeypatch.setattr(report, 'SECTIONS', sections)
+        _, stats = build_report(cache_dir=tmp_path, n_points=200)
+        assert stats['built'] == ['mars_delay']
+
+    def test_dependencies_derived_from_imports(self):
+        """入口模块的包内导入 (含函数体内的延迟导入) 递归展开"""
+        closure = report.module_closure(('.core.qst_calculator',))
+        assert {'.core.backends', '.core.instrumentation', '.core.kernels',
+                '.core.physics_constants'} <= set(closure)
+        sources = report._section_sources(report.section_beta_eff)
+        assert any(src.startswith('def _table') for src in sources)
+
+    def test_force_and_no_cache(self, tmp_path):
+        build_report(cache_dir=tmp_path, n_points=200)
+        _, stats = build_report(cache_dir=tmp_path, n_points=200, force=True)
+        assert stats['built'] == ALL_SECTIONS
+        _, stats = build_report(cache_dir=None, n_points=200)
+        assert stats['built'] == ALL_SECTIONS
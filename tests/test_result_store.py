@@ -0,0 +1,153 @@
+"""
+内容寻址结果存储测试
+"""
+
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pytest
+from src.cli import main
+from src.simulation.cosmic_evolution import CosmicEvolver
+from src.utils.result_store import ResultStore, result_key
+
+
+def _put_same_key(root, key, value):
+    ResultStore(root).put(key, {'x': np.full(1000, value)})
+
+
+class TestResultKey:
+    """测试键对参数、配置与代码的敏感性"""
+
+    def test_key(self):
+        base = result_key('cosmic', 'effective', {'n': 10, 'grid': np.linspace(0, 1, 5)})
+        assert base == result_key('cosmic', 'effective', {'grid': np.linspace(0, 1, 5), 'n': 10})
+        assert base != result_key('cosmic', 'effective', {'n': 10, 'grid': np.linspace(0, 1, 6)})
+        assert base != result_key('cosmic', 'sparc_optimized',
+                                  {'n': 10, 'grid': np.linspace(0, 1, 5)})
+        assert base != result_key('galaxies', 'effective', {'n': 10, 'grid': np.linspace(0, 1, 5)})
+        assert base != result_key('cosmic', 'effective', {'n': 10, 'grid': np.linspace(0, 1, 5)},
+                                  modules=('.core.kernels',))
+        with pytest.raises(TypeError):
+            result_key('cosmic', 'effective', {'f': object()})
+
+
+class TestResultStore:
+    """测试写入、读取、LRU淘汰与并发写入"""
+
+    def test_round_trip(self, tmp_path):
+        store = ResultStore(tmp_path)
+        key = result_key('test', 'p', {'i': 1})
+        assert store.get(key) is None and key not in store
+        arrays = {'a': np.arange(10.0), 'b': np.ones((3, 4), dtype=np.float32),
+                  'empty': np.zeros(0)}
+        stored = store.put(key, arrays, {'note': 'x'})
+        assert not stored.hit and key in store
+        result = store.get(key)
+        assert result.hit and result.metadata == {'note': 'x'}
+        assert isinstance(result.arrays['a'], np.memmap) and not result.arrays['a'].flags.writeable
+        for name, value in arrays.items():
+            np.testing.assert_array_equal(result.arrays[name], value)
+            assert result.arrays[name].dtype == value.dtype
+        # 已存在时保留原条目
+        store.put(key, {'a': np.zeros(10)})
+        np.testing.assert_array_equal(store.get(key).arrays['a'], arrays['a'])
+        with pytest.raises(ValueError):
+            store.put(key, {'../x': np.zeros(1)})
+        with pytest.raises(ValueError):
+            store.get('../../etc')
+
+    def test_cached(self, tmp_path):
+        store = ResultStore(tmp_path)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {'x': np.arange(5.0)}
+
+        key = result_key('test', 'p')
+        assert not store.cached(key, compute).hit
+        assert store.cached(key, compute).hit
+        assert len(calls) == 1
+
+    def test_lru_eviction(self, tmp_path):
+        store = ResultStore(tmp_path, max_bytes=None)
+        keys = [result_key('test', 'p', {'i': i}) for i in range(4)]
+        for i, key in enumerate(keys):
+            store.put(key, {'x': np.zeros(1000)})
+            os.utime(store._path(key) / 'meta.json', (1000.0 + i, 1000.0 + i))
+        store.get(keys[0])  # 最近使用
+        # 各条目大小只差 meta.json 中的几个字节
+        entry = store.stats()['nbytes'] // 4 + 100
+        assert store.evict(2 * entry) == [keys[1], keys[2]]
+        assert keys[0] in store and keys[3] in store
+        assert store.stats()['n_entries'] == 2
+
+        store.max_bytes = entry
+        store.put(result_key('test', 'p', {'i': 9}), {'x': np.ones(1000)})
+        assert store.stats()['n_entries'] == 1
+        # 单条超过上限: 仍返回结果，但不保留
+        big = ResultStore(tmp_path, max_bytes=10).put(result_key('test', 'big'), {'x': np.ones(10)})
+        np.testing.assert_array_equal(big.arrays['x'], np.ones(10))
+        assert ResultStore(tmp_path).stats()['n_entries'] == 0
+
+    def test_concurrent_writers(self, tmp_path):
+        key = result_key('test', 'race')
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=_put_same_key, args=(tmp_path, key, float(i)))
+                   for i in range(3)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        assert all(w.exitcode == 0 for w in workers)
+        x = ResultStore(tmp_path).get(key).arrays['x']
+        assert x[0] in (0.0, 1.0, 2.0) and np.all(x == x[0])
+        assert ResultStore(tmp_path).stats()['n_entries'] == 1
+        assert not any((tmp_path / 'tmp').iterdir())
+
+    def test_stale_staging_removed(self, tmp_path):
+        store = ResultStore(tmp_path)
+        stale = tmp_path / 'tmp' / 'dead.123.abc'
+        stale.mkdir(parents=True)
+        os.utime(stale, (time.time() - 7200, time.time() - 7200))
+        store.evict()
+        assert not stale.exists()
+
+
+class TestStoreIntegration:
+    """测试宇宙演化与命令行的结果复用"""
+
+    def test_cosmic_evolution(self, tmp_path):
+        store = ResultStore(tmp_path)
+        evolver = CosmicEvolver('effective', N_points=200, N_range=(-5.0, 0.0))
+        direct = evolver.evolve()
+        first = evolver.evolve(store=store)
+        second = evolver.evolve(store=store)
+        for name, value in direct.items():
+            np.testing.assert_array_equal(first[name], value)
+            np.testing.assert_array_equal(second[name], value)
+        assert store.stats()['n_entries'] == 1
+        assert evolver.store_key() != CosmicEvolver('effective', N_points=201,
+                                                     N_range=(-5.0, 0.0)).store_key()
+        assert evolver.store_key() != CosmicEvolver('effective', N_points=200, N_range=(-5.0, 0.0),
+                                                     params={'m_phi': 0.2}).store_key()
+
+    def test_cli(self, tmp_path):
+        store = tmp_path / 'store'
+        argv = ['cosmic', '--n-points', '100', '--n-start', '-5', '--store', str(store)]
+        assert main(argv) == 0
+        assert main(argv) == 0
+        assert ResultStore(store).stats()['n_entries'] == 1
+
+        path = tmp_path / 'g.csv'
+        path.write_text("M_baryon,R_disk\n1e10,2.0\n3e9,1.5\n")
+        for out in ('a.csv', 'b.csv'):
+            assert main(['evaluate', str(path), '-o', str(tmp_path / out),
+                         '--store', str(store)]) == 0
+        assert (tmp_path / 'a.csv').read_text() == (tmp_path / 'b.csv').read_text()
+        assert ResultStore(store).stats()['n_entries'] == 2
+        with pytest.raises(SystemExit):
+            main(['evaluate', str(path), '-o', str(tmp_path / 'c.csv'), '--store', str(store),
+                  '--chunk-size', '10'])
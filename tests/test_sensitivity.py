@@ -0,0 +1,97 @@
+"""
+Sobol 全局敏感性分析测试
+"""
+
+import numpy as np
+import pytest
+from src.analysis.sensitivity import saltelli_samples, sobol_indices
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+@pytest.fixture(scope='module')
+def galaxies(calc):
+    M, R = 10**np.linspace(8.0, 11.0, 12), np.linspace(1.0, 8.0, 12)
+    v, _ = calc.galaxy_rotation_velocity_batch(M, R)
+    return M, R, 1.1 * v
+
+
+class TestSaltelliSamples:
+    """测试样本矩阵结构"""
+
+    def test_structure(self):
+        bounds = {'a': (0.0, 1.0), 'b': (10.0, 20.0), 'c': (-1.0, 1.0)}
+        A, B, AB = saltelli_samples(bounds, 64, seed=1)
+        assert A.shape == B.shape == (64, 3) and AB.shape == (3, 64, 3)
+        assert np.all((A[:, 1] >= 10.0) & (A[:, 1] < 20.0))
+        for i in range(3):
+            np.testing.assert_array_equal(AB[i, :, i], B[:, i])
+            np.testing.assert_array_equal(np.delete(AB[i], i, axis=1), np.delete(A, i, axis=1))
+        A2, _, _ = saltelli_samples(bounds, 64, seed=1)
+        np.testing.assert_array_equal(A, A2)
+        with pytest.raises(ValueError):
+            saltelli_samples(bounds, 100)
+
+
+class TestSobolIndices:
+    """测试指数估计、置信区间与并行求值"""
+
+    def test_mars_delay_depends_on_beta0_only(self, calc):
+        result = sobol_indices(calc, 256, quantities=('mars_delay',), seed=1)
+        assert result['params'] == ('beta0', 'M_th', 'A_low', 'sigma_crit',
+                                    'sigma_transition', 'alpha')
+        assert result['n_evaluations'] == 256 * 8
+        entry = result['mars_delay']
+        np.testing.assert_allclose(entry['S1'], [1, 0, 0, 0, 0, 0], atol=0.03)
+        np.testing.assert_allclose(entry['ST'], [1, 0, 0, 0, 0, 0], atol=0.03)
+        low, high = entry['S1_interval'][:, 0]
+        assert low < entry['S1'][0] < high
+
+    def test_residual(self, calc, galaxies):
+        M, R, v_obs = galaxies
+        result = sobol_indices(calc, 512, M_baryon=M, R_disk=R, v_obs=v_obs, v_err=5.0,
+                               n_bootstrap=50, seed=2)
+        assert set(result) >= {'mars_delay', 'v_rot', 'residual'}
+        entry = result['residual']
+        # M_th 远小于星系质量，β_eff 已饱和
+        assert abs(entry['ST'][1]) < 1e-12
+        assert np.all(entry['ST'] >= entry['S1'] - 0.02)
+        assert 0.8 < entry['S1'].sum() <= 1.05
+        assert entry['S1_interval'].shape == (2, 6)
+        assert result['v_rot']['S1'].shape == (6, 12)
+
+    def test_independent_of_workers(self, calc, galaxies):
+        M, R, v_obs = galaxies
+        kwargs = dict(M_baryon=M, R_disk=R, v_obs=v_obs, n_bootstrap=20, seed=5)
+        serial = sobol_indices(calc, 200, **kwargs)
+        parallel = sobol_indices(calc, 256, workers=2, chunk_size=300, **kwargs)
+        assert serial['n_base'] == 256
+        for q in ('mars_delay', 'v_rot', 'residual'):
+            for key in ('S1', 'ST', 'S1_interval', 'ST_interval'):
+                np.testing.assert_array_equal(serial[q][key], parallel[q][key])
+
+    def test_bounds(self, calc):
+        result = sobol_indices(calc, 64, bounds={'beta0': (0.5, 1.0), 'alpha': (0.5, 2.0)},
+                               n_bootstrap=0)
+        assert result['params'] == ('beta0', 'alpha')
+        assert 'S1_interval' not in result['mars_delay']
+        assert result['mars_delay']['S1'][1] == result['mars_delay']['ST'][1] == 0.0
+
+    def test_invalid(self, calc, galaxies):
+        M, R, _ = galaxies
+        with pytest.raises(ValueError):
+            sobol_indices(calc, 64, params=('beta1',))
+        with pytest.raises(ValueError):
+            sobol_indices(calc, 64, bounds={'beta0': (1.0, 0.5)})
+        with pytest.raises(ValueError):
+            sobol_indices(calc, 64, params=('beta0',), bounds={'alpha': (0.5, 2.0)})
+        with pytest.raises(ValueError):
+            sobol_indices(calc, 64, M_baryon=M, R_disk=R, quantities=('residual',))
+        with pytest.raises(ValueError):
+            sobol_indices(QSTCalculator('effective'), 64, params=('mu',))
+        with pytest.raises(ValueError):
+            sobol_indices(calc, 64, confidence=1.5)
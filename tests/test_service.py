@@ -0,0 +1,183 @@
+"""
+微批处理计算服务测试
+"""
+
+import asyncio
+import json
+
+import pytest
+from src.core.qst_calculator import QSTCalculator
+from src.service import MicroBatcher, QSTService, RequestError, _encode_json, parse_request
+
+
+async def _http(port_or_path, method, path, payload=None, close=False):
+    """发送一个HTTP请求，返回 (状态码, JSON)"""
+    if isinstance(port_or_path, int):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port_or_path)
+    else:
+        reader, writer = await asyncio.open_unix_connection(port_or_path)
+    body = b'' if payload is None else (payload if isinstance(payload, bytes)
+                                        else json.dumps(payload).encode())
+    headers = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        headers += "Connection: close\r\n"
+    writer.write((headers + "\r\n").encode() + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        if line.lower().startswith(b'content-length'):
+            length = int(line.split(b':')[1])
+    data = json.loads(await reader.readexactly(length))
+    writer.close()
+    return status, data
+
+
+class TestParseRequest:
+    """测试请求校验"""
+
+    def test_scalar_and_lists(self):
+        columns, n, scalar = parse_request('galaxy', {'M_baryon': 1e10, 'R_disk': 3})
+        assert (columns, n, scalar) == ({'M_baryon': [1e10], 'R_disk': [3.0]}, 1, True)
+        columns, n, scalar = parse_request('galaxy', {'M_baryon': [1e9, 1e10], 'R_disk': 2.0})
+        assert n == 2 and not scalar and columns['R_disk'] == [2.0, 2.0]
+
+    @pytest.mark.parametrize("operation,payload", [
+        ('galaxy', {'M_baryon': 1e10}),
+        ('galaxy', {'M_baryon': 1e10, 'R_disk': 1.0, 'radius': 2.0}),
+        ('galaxy', {'M_baryon': [1.0, 2.0], 'R_disk': [1.0]}),
+        ('a_ratio', {'sigma': 'x'}),
+        ('a_ratio', [1.0]),
+        ('mass', {}),
+    ])
+    def test_invalid(self, operation, payload):
+        with pytest.raises(RequestError):
+            parse_request(operation, payload)
+
+
+class TestMicroBatcher:
+    """测试合批与结果拆分"""
+
+    def test_concurrent_requests_share_batch(self):
+        calc = QSTCalculator('sparc_optimized')
+        batcher = MicroBatcher(calc, max_delay=0.01)
+        masses = [10**(8 + 0.1 * i) for i in range(30)]
+
+        async def run():
+            return await asyncio.gather(*(
+                batcher.submit('galaxy', *parse_request(
+                    'galaxy', {'M_baryon': m, 'R_disk': 2.0})[:2]) for m in masses))
+
+        results = asyncio.run(run())
+        for m, result in zip(masses, results):
+            v_ref, a_ref = calc.galaxy_rotation_velocity(m, 2.0)
+            assert abs(result['v_rot'][0] - v_ref) < 1e-8 * v_ref
+            assert abs(result['a_ratio'][0] - a_ref) < 1e-10
+        batches = batcher.metrics_snapshot()['batches']['galaxy']
+        assert batches['count'] == 1 and batches['batch_max'] == 30
+        assert batcher.metrics_snapshot()['requests']['galaxy']['count'] == 30
+
+    def test_max_batch_flushes_early(self):
+        batcher = MicroBatcher(QSTCalculator('sparc_optimized'), max_delay=10.0, max_batch=10)
+
+        async def run():
+            columns, n, _ = parse_request('a_ratio', {'sigma': [0.5, 1.0]})
+            return await asyncio.gather(*(batcher.submit('a_ratio', columns, n)
+                                          for _ in range(15)))
+
+        results = asyncio.run(asyncio.wait_for(run(), timeout=5.0))
+        assert len(results) == 15 and all(len(r['a_ratio']) == 2 for r in results)
+        assert batcher.metrics_snapshot()['batches']['a_ratio']['batch_max'] == 10
+
+
+class TestHTTP:
+    """测试HTTP接口"""
+
+    def test_endpoints(self):
+        service = QSTService(max_delay=0.001)
+        calc = service.calc
+
+        async def run():
+            server = await service.start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                galaxy = await _http(port, 'POST', '/galaxy', {'M_baryon': 1e10, 'R_disk': 3.0})
+                beta = await _http(port, 'POST', '/beta_eff', {'M_baryon': [1e9, 1e12]})
+                health = await _http(port, 'GET', '/health')
+                metrics = await _http(port, 'GET', '/metrics')
+                errors = [await _http(port, 'POST', '/galaxy', b'{bad'),
+                          await _http(port, 'POST', '/nothing', {}),
+                          await _http(port, 'GET', '/galaxy'),
+                          await _http(port, 'POST', '/a_ratio', {'sigma': 1.0}, close=True)]
+            finally:
+                server.close()
+                await server.wait_closed()
+            return galaxy, beta, health, metrics, errors
+
+        galaxy, beta, health, metrics, errors = asyncio.run(run())
+        assert galaxy[0] == 200
+        v_ref, _ = calc.galaxy_rotation_velocity(1e10, 3.0)
+        assert abs(galaxy[1]['v_rot'] - v_ref) < 1e-8 * v_ref
+        assert beta[1]['beta_eff'] == calc.beta_effective_batch(
+            [1e9, 1e12], mass_unit=calc.constants.M_SUN).tolist()
+        assert health == (200, {'status': 'ok', 'param_set': 'sparc_optimized'})
+        assert metrics[1]['requests']['galaxy']['count'] == 1
+        assert 'p99_s' in metrics[1]['requests']['galaxy']
+        assert [status for status, _ in errors] == [400, 404, 405, 200]
+
+    def test_negative_content_length_rejected(self):
+        service = QSTService(max_delay=0.0)
+
+        async def run():
+            server = await service.start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(b"POST /a_ratio HTTP/1.1\r\nContent-Length: -5\r\n\r\n{}")
+                status = int((await reader.readline()).split()[1])
+                writer.close()
+                return status
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        assert asyncio.run(run()) == 400
+
+    def test_non_finite_results_are_null(self):
+        """NaN/Infinity 不是合法JSON，输出为 null"""
+        assert _encode_json({'a': [1.0, float('nan'), float('-inf')], 'b': float('inf')}) == \
+            '{"a": [1.0, null, null], "b": null}'
+        service = QSTService(max_delay=0.0)
+
+        async def run():
+            server = await service.start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await _http(port, 'POST', '/galaxy',
+                                   b'{"M_baryon": [NaN, 1e10, 1e10], "R_disk": [3.0, 0.0, 3.0]}')
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        status, data = asyncio.run(run())
+        assert status == 200
+        assert data['sigma'][:2] == [None, None] and data['v_rot'][0] is None
+        assert data['v_rot'][2] > 0
+
+    def test_unix_socket(self, tmp_path):
+        service = QSTService(max_delay=0.0)
+        path = str(tmp_path / 'qst.sock')
+
+        async def run():
+            server = await service.start(unix_path=path)
+            try:
+                return await _http(path, 'POST', '/a_ratio', {'sigma': [0.01, 100.0]})
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        status, data = asyncio.run(run())
+        assert status == 200
+        assert data['a_ratio'] == service.calc.effective_a0_ratio_batch([0.01, 100.0]).tolist()
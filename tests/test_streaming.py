@@ -0,0 +1,133 @@
+"""
+分块流式计算测试
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+from src.analysis.streaming import ChunkWriter, iter_chunks, stream_evaluate
+from src.cli import main
+from src.core.qst_calculator import QSTCalculator
+from src.utils.table_io import read_table, write_table
+
+
+def _catalog(path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {'M_baryon': 10**rng.uniform(7, 12, n), 'R_disk': rng.uniform(0.5, 20.0, n)}
+    write_table(path, columns)
+    return columns
+
+
+class TestStreaming:
+    """测试流式读写与流水线"""
+
+    @pytest.mark.parametrize("suffix", ['.csv', '.npy'])
+    def test_chunks_cover_table(self, tmp_path, suffix):
+        path = tmp_path / f"cat{suffix}"
+        columns = _catalog(path, 1050)
+        chunks = list(iter_chunks(path, chunk_size=100))
+        assert [len(c['M_baryon']) for c in chunks] == [100] * 10 + [50]
+        np.testing.assert_allclose(np.concatenate([c['R_disk'] for c in chunks]),
+                                   columns['R_disk'])
+
+    def test_npy_writer_backfills_shape(self, tmp_path):
+        path = tmp_path / "out.npy"
+        with ChunkWriter(path) as writer:
+            for start in range(0, 30, 7):
+                writer.write({'a': np.arange(start, min(start + 7, 30), dtype=float)})
+        np.testing.assert_array_equal(np.load(path)['a'], np.arange(30.0))
+
+    @pytest.mark.parametrize("n_columns", [40, 3000])
+    def test_npy_writer_many_columns(self, tmp_path, n_columns):
+        """头部按 dtype 确定长度；列极多时使用 2.0 版本头部"""
+        path = tmp_path / "wide.npy"
+        with ChunkWriter(path) as writer:
+            for start in (0, 5):
+                writer.write({f'column_{i}': np.full(5, float(i + start))
+                              for i in range(n_columns)})
+        data = np.load(path, max_header_size=1 << 20)
+        assert data.shape == (10,) and len(data.dtype.names) == n_columns
+        assert data['column_7'][6] == 12.0
+        assert path.stat().st_size % 64 == 0
+
+    def test_empty_input(self, tmp_path):
+        """只有表头的CSV: 输出为带列名的空表"""
+        src = tmp_path / "empty.csv"
+        src.write_text("M_baryon,R_disk\n")
+        stats = stream_evaluate(src, tmp_path / "out.npy", keep_input=True)
+        assert stats['n_rows'] == 0
+        data = np.load(tmp_path / "out.npy")
+        assert data.shape == (0,) and 'v_rot' in data.dtype.names
+        stream_evaluate(src, tmp_path / "out.csv")
+        assert (tmp_path / "out.csv").read_text().strip() == 'sigma,a_ratio,beta_eff,v_rot'
+        with ChunkWriter(tmp_path / "none.npy"):
+            pass
+        assert np.load(tmp_path / "none.npy").shape == (0,)
+
+    @pytest.mark.parametrize("src_suffix, out_suffix", [('.csv', '.npy'), ('.npy', '.csv')])
+    def test_matches_in_memory(self, tmp_path, src_suffix, out_suffix):
+        src = tmp_path / f"cat{src_suffix}"
+        out = tmp_path / f"out{out_suffix}"
+        columns = _catalog(src, 2500)
+        stats = stream_evaluate(src, out, chunk_size=300, keep_input=True)
+        assert stats['n_rows'] == 2500 and stats['n_chunks'] == 9
+
+        result = read_table(out)
+        calc = QSTCalculator('sparc_optimized')
+        expected = calc.evaluate_galaxies_batch(columns['M_baryon'], columns['R_disk'])
+        for name in ('v_rot', 'a_ratio', 'beta_eff', 'sigma'):
+            np.testing.assert_allclose(result[name], expected[name], rtol=1e-10)
+
+    def test_peak_memory_independent_of_size(self, tmp_path):
+        """峰值内存由块大小决定"""
+        peaks = []
+        for n in (20000, 80000):
+            src = tmp_path / f"cat{n}.npy"
+            _catalog(src, n)
+            tracemalloc.start()
+            stream_evaluate(src, tmp_path / f"out{n}.npy", chunk_size=2000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[1] < 1.5 * peaks[0]
+        print(f"\n峰值内存: {peaks[0] / 1e6:.2f} MB / {peaks[1] / 1e6:.2f} MB ✓")
+
+    def test_missing_column_raises(self, tmp_path):
+        src = tmp_path / "cat.npy"
+        _catalog(src, 100)
+        with pytest.raises(ValueError):
+            stream_evaluate(src, tmp_path / "out.npy", chunk_size=10, mass_col='M')
+
+    def test_float32_output(self, tmp_path):
+        src = tmp_path / "cat.npy"
+        _catalog(src, 500)
+        out = tmp_path / "out.npy"
+        stream_evaluate(src, out, chunk_size=128, dtype='float32')
+        assert np.load(out).dtype['v_rot'] == np.float32
+
+    def test_cli_chunk_size(self, tmp_path):
+        src = tmp_path / "cat.csv"
+        _catalog(src, 500)
+        out = tmp_path / "out.csv"
+        assert main(['evaluate', str(src), '-o', str(out), '--chunk-size', '64']) == 0
+        assert len(read_table(out)['v_rot']) == 500
+
+    def test_cli_text_column_round_trips(self, tmp_path):
+        """含星系名列的CSV逐行流式计算，--keep-input 保留名称"""
+        src = tmp_path / "cat.csv"
+        columns = _catalog(src, 3)
+        columns['name'] = np.array(['NGC1', 'NGC3198', 'DDO154'])
+        write_table(src, columns)
+        out = tmp_path / "out.csv"
+        assert main(['evaluate', str(src), '-o', str(out), '--chunk-size', '1',
+                     '--keep-input']) == 0
+        result = read_table(out)
+        assert list(result['name']) == ['NGC1', 'NGC3198', 'DDO154']
+        np.testing.assert_allclose(result['M_baryon'], columns['M_baryon'], rtol=1e-11)
+        assert len(result['v_rot']) == 3
+
+    def test_npy_writer_rejects_truncated_text(self, tmp_path):
+        with ChunkWriter(tmp_path / "out.npy") as writer:
+            writer.write({'name': np.array(['a'])})
+            with pytest.raises(ValueError):
+                writer.write({'name': np.array(['abc'])})
@@ -0,0 +1,73 @@
+"""
+蒙特卡罗不确定度传播测试
+"""
+
+import numpy as np
+import pytest
+from src.analysis.uncertainty import propagate
+from src.core.qst_calculator import QSTCalculator
+
+
+@pytest.fixture(scope='module')
+def calc():
+    return QSTCalculator('sparc_optimized')
+
+
+@pytest.fixture(scope='module')
+def galaxies():
+    return 10**np.linspace(8.0, 11.0, 12), np.linspace(1.0, 8.0, 12)
+
+
+class TestPropagate:
+    """测试抽样、求值与分位数"""
+
+    def test_zero_errors_reproduce_point_values(self, calc, galaxies):
+        M, R = galaxies
+        result = propagate(calc, 10, M_baryon=M, R_disk=R)
+        np.testing.assert_allclose(result['Omega_DE']['quantiles'], result['Omega_DE']['mean'],
+                                   rtol=1e-14)
+        assert abs(result['Omega_DE']['mean'] - calc.dark_energy_density()) < 1e-12
+        assert abs(result['mars_delay']['mean'] - calc.mars_time_delay()) < 1e-9
+        v_rot, _ = calc.galaxy_rotation_velocity_batch(M, R)
+        np.testing.assert_allclose(result['v_rot']['quantiles'][2], v_rot, rtol=1e-12)
+        np.testing.assert_allclose(result['beta_eff']['mean'],
+                                   calc.beta_effective_batch(M, mass_unit=calc.constants.M_SUN))
+
+    def test_independent_of_workers(self, calc, galaxies):
+        M, R = galaxies
+        kwargs = dict(param_errors={'beta0': 0.02, 'A_low': ('uniform', 0.1, 0.3)},
+                      M_baryon=M, R_disk=R,
+                      input_errors={'M_baryon': ('lognormal', 0.2), 'R_disk': 0.1},
+                      seed=7, chunk_size=700, return_samples=True)
+        serial = propagate(calc, 3000, **kwargs)
+        parallel = propagate(calc, 3000, workers=2, **kwargs)
+        for q in ('Omega_DE', 'mars_delay', 'beta_eff', 'v_rot'):
+            np.testing.assert_array_equal(serial[q]['samples'], parallel[q]['samples'])
+        other = propagate(calc, 3000, **{**kwargs, 'seed': 8})
+        assert not np.array_equal(other['v_rot']['samples'], serial['v_rot']['samples'])
+
+    def test_linear_propagation(self, calc):
+        """mars_delay 对 β₀ 线性: 标准差按比例传播"""
+        beta0 = calc.params['beta0']
+        result = propagate(calc, 20000, param_errors={'beta0': 0.1 * beta0}, seed=1)
+        assert abs(result['mars_delay']['std'] / (0.1 * calc.mars_time_delay()) - 1.0) < 0.03
+        low, high = result['mars_delay']['quantiles'][[1, 3]]
+        assert low < calc.mars_time_delay() < high
+
+    def test_quantities_by_param_set(self, galaxies):
+        M, R = galaxies
+        assert set(propagate(QSTCalculator('effective'), 5)) == {'levels', 'n_samples',
+                                                                 'Omega_DE'}
+        local = propagate(QSTCalculator('local'), 5, M_baryon=M, R_disk=R)
+        assert 'v_rot' in local and 'Omega_DE' not in local
+
+    def test_invalid(self, calc, galaxies):
+        M, R = galaxies
+        with pytest.raises(ValueError):
+            propagate(calc, 5, param_errors={'beta1': 0.1})
+        with pytest.raises(ValueError):
+            propagate(calc, 5, param_errors={'beta0': ('gamma', 1.0)})
+        with pytest.raises(ValueError):
+            propagate(calc, 5, quantities=('v_rot',))
+        with pytest.raises(ValueError):
+            propagate(calc, 5, M_baryon=M, input_errors={'R_disk': 0.1})
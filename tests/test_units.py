@@ -0,0 +1,91 @@
+"""
+常数集、导出量与单位换算测试
+"""
+
+import math
+
+import numpy as np
+import pytest
+from src.core.physics_constants import (CONSTANT_SETS, DERIVED_CONSTANTS, PhysicalConstants,
+                                        get_constants)
+from src.core.qst_calculator import QSTCalculator
+from src.core.units import conversion_factor, convert, convert_columns
+
+
+class TestConstantSets:
+    """测试常数集与导入时算好的导出量"""
+
+    def test_default_and_legacy(self):
+        assert PhysicalConstants.M_SUN == 1.98847e30
+        assert PhysicalConstants().name == 'iau2015'
+        legacy = PhysicalConstants('legacy')
+        assert (legacy.M_SUN, legacy.KPC) == (1.989e30, 3.086e19)
+        assert legacy.G == PhysicalConstants.G
+        assert legacy.GM_SUN == DERIVED_CONSTANTS['legacy']['GM_SUN'] != PhysicalConstants.GM_SUN
+        assert get_constants(legacy) is legacy and get_constants('legacy').M_SUN == 1.989e30
+        with pytest.raises(ValueError):
+            PhysicalConstants('codata2010')
+
+    @pytest.mark.parametrize('name', sorted(CONSTANT_SETS))
+    def test_derived(self, name):
+        c = PhysicalConstants(name)
+        assert c.SIGMA_UNIT == pytest.approx(1e9 * c.M_SUN / c.KPC**2, rel=1e-15)
+        assert c.SURFACE_DENSITY_SCALE == pytest.approx(1e-9 / math.pi, rel=1e-14)
+        assert c.V4_COEFF == pytest.approx(2.0 * c.G * c.M_SUN / 1e12, rel=1e-15)
+        assert c.DISK_ACCEL_SCALE == pytest.approx(2.0 * math.pi * c.G * c.SIGMA_UNIT, rel=1e-15)
+        assert c.G_OVER_C2 == pytest.approx(c.G / c.C**2, rel=1e-15)
+
+
+class TestConvert:
+    """测试换算系数表与列换算"""
+
+    def test_factors(self):
+        assert conversion_factor('kpc', 'pc') == pytest.approx(1e3, rel=1e-15)
+        assert conversion_factor('M_sun', 'kg') == PhysicalConstants.M_SUN
+        assert conversion_factor('M_sun', 'kg', 'legacy') == 1.989e30
+        assert conversion_factor('M_sun/pc2', '1e9 M_sun/kpc2') == pytest.approx(1e-3, rel=1e-14)
+        assert conversion_factor('km/s', 'm/s') == 1e3
+        assert conversion_factor('yr', 'day') == pytest.approx(365.2422, rel=1e-6)
+        with pytest.raises(ValueError):
+            conversion_factor('kpc', 'km/s')
+        with pytest.raises(ValueError):
+            conversion_factor('parsec', 'kpc')
+        with pytest.raises(ValueError):
+            conversion_factor('kpc', 'pc', 'codata2010')
+
+    def test_convert(self):
+        assert convert(2, 'kpc', 'pc') == pytest.approx(2000.0)
+        values = convert([1.0, 2.0], 'M_sun', 'kg', PhysicalConstants('legacy'))
+        np.testing.assert_array_equal(values, [1.989e30, 3.978e30])
+        table = {'M': np.array([1e40, 2e40]), 'R': np.array([3000.0]), 'name': ['a', 'b']}
+        out = convert_columns(table, {'M': ('kg', 'M_sun'), 'R': ('pc', 'kpc')})
+        np.testing.assert_allclose(out['M'], table['M'] / PhysicalConstants.M_SUN)
+        np.testing.assert_allclose(out['R'], [3.0])
+        assert out['name'] is table['name']
+        with pytest.raises(ValueError):
+            convert_columns(table, {'v': ('m/s', 'km/s')})
+
+
+class TestCalculatorConstants:
+    """测试计算器显式选择常数集"""
+
+    def test_constant_set(self):
+        default = QSTCalculator('sparc_optimized')
+        legacy = QSTCalculator('sparc_optimized', constants='legacy')
+        assert legacy.constants.name == 'legacy'
+        # 旧 v4.5 模块 (M_SUN = 1.989e30) 的结果
+        assert legacy.galaxy_rotation_velocity(1e10, 2.0)[0] == pytest.approx(102.39951671158997,
+                                                                             rel=1e-13)
+        v_default = default.galaxy_rotation_velocity(1e10, 2.0)[0]
+        assert v_default / legacy.galaxy_rotation_velocity(1e10, 2.0)[0] == pytest.approx(
+            (1.98847 / 1.989)**0.25, rel=1e-12)
+
+    def test_scalar_matches_batch(self):
+        for constants in ('iau2015', 'legacy'):
+            calc = QSTCalculator('sparc_optimized', constants=constants)
+            M, R = np.array([1e8, 3e9, 1e11]), np.array([1.0, 2.5, 8.0])
+            v_batch, ratio_batch = calc.galaxy_rotation_velocity_batch(M, R)
+            for i in range(3):
+                v, ratio = calc.galaxy_rotation_velocity(M[i], R[i])
+                assert v == pytest.approx(v_batch[i], rel=1e-13)
+                assert ratio == pytest.approx(ratio_batch[i], rel=1e-13)